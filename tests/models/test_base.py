@@ -0,0 +1,101 @@
+import datetime
+import sqlite3
+import unittest
+
+from polyfactory.factories.pydantic_factory import ModelFactory
+from pydantic import BaseModel
+
+from tests import load_resource
+from tibiawikisql.api import Article
+from tibiawikisql.models import ARTICLE_MODELS, Creature, CreatureDrop, Item, Key, World
+from tibiawikisql.models.base import construct_from_row
+from tibiawikisql.parsers import CreatureParser, ItemParser
+from tibiawikisql.schema import create_tables
+
+TIMESTAMP = datetime.datetime.fromisoformat("2018-08-20T04:33:15+00:00")
+
+
+class TestConstructFromRow(unittest.TestCase):
+    def setUp(self):
+        self.conn = sqlite3.connect(":memory:")
+        self.conn.row_factory = sqlite3.Row
+        create_tables(self.conn)
+
+    def tearDown(self):
+        self.conn.close()
+
+    def assert_same_as_validated(self, model: type[BaseModel], row: sqlite3.Row):
+        validated = model.model_validate(dict(row))
+        constructed = construct_from_row(model, row)
+
+        self.assertEqual(validated, constructed)
+        self.assertEqual(validated.model_dump_json(), constructed.model_dump_json())
+        self.assertEqual(validated.model_fields_set, constructed.model_fields_set)
+
+    def test_parsed_articles(self):
+        item = ItemParser.from_article(
+            Article(article_id=1, title="Fire Sword", timestamp=TIMESTAMP, content=load_resource("content_item.txt")),
+        )
+        creature = CreatureParser.from_article(
+            Article(article_id=2, title="Demon", timestamp=TIMESTAMP, content=load_resource("content_creature.txt")),
+        )
+        item.insert(self.conn)
+        creature.insert(self.conn)
+
+        for model, table in ((Item, "item"), (Creature, "creature")):
+            with self.subTest(model=model.__name__):
+                row = self.conn.execute(f"SELECT * FROM {table}").fetchone()  # noqa: S608
+                self.assert_same_as_validated(model, row)
+                self.assertIsInstance(construct_from_row(model, row).timestamp, datetime.datetime)
+
+    def test_generated_articles(self):
+        item_factory = ModelFactory.create_factory(Item)
+        for model in ARTICLE_MODELS.values():
+            factory = ModelFactory.create_factory(model)
+            for _ in range(10):
+                instance = factory.build()
+                self.conn.execute(f"DELETE FROM {model.table.__tablename__}")  # noqa: S608
+                if model is Key:
+                    # Keys are stored with the ID of the item they are named after.
+                    self.conn.execute("DELETE FROM item")
+                    item_factory.build(title=f"{instance.material} Key").insert(self.conn)
+                instance.insert(self.conn)
+                row = self.conn.execute(f"SELECT * FROM {model.table.__tablename__}").fetchone()  # noqa: S608
+                with self.subTest(model=model.__name__):
+                    self.assert_same_as_validated(model, row)
+
+    def test_stored_values_are_converted(self):
+        row = {
+            "article_id": 1,
+            "title": "Antica",
+            "name": "Antica",
+            "location": "Europe",
+            "pvp_type": "Open PvP",
+            "is_preview": 0,
+            "is_experimental": 1,
+            "online_since": "1997-01-07",
+            "offline_since": None,
+            "battleye_type": None,
+            "timestamp": "2018-08-20T04:33:15+00:00",
+        }
+
+        world = construct_from_row(World, row)
+
+        self.assertIs(False, world.is_preview)
+        self.assertIs(True, world.is_experimental)
+        self.assertEqual(datetime.date(1997, 1, 7), world.online_since)
+        self.assertIsNone(world.offline_since)
+        self.assertEqual(TIMESTAMP, world.timestamp)
+
+    def test_extra_columns_are_ignored_and_defaults_are_not_shared(self):
+        row = {"item_id": 1, "item_title": "Fire Sword", "chance": 5, "min": 1, "max": 1, "unknown": "value"}
+
+        drop = construct_from_row(CreatureDrop, row)
+        first = construct_from_row(Creature, {"name": "Demon"})
+        second = construct_from_row(Creature, {"name": "Dragon"})
+
+        self.assertEqual(5.0, drop.chance)
+        self.assertIsInstance(drop.chance, float)
+        self.assertNotIn("unknown", drop.model_dump())
+        self.assertEqual([], first.loot)
+        self.assertIsNot(first.loot, second.loot)
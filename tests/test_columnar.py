@@ -0,0 +1,127 @@
+import datetime
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from click.testing import CliRunner
+
+from tests.test_export import insert_sample_items
+from tibiawikisql import __main__ as cli_module
+from tibiawikisql.columnar import (
+    DERIVED_TABLES,
+    export_table,
+    export_tables,
+    get_arrow_schema,
+    get_exported_tables,
+    pa,
+    pq,
+)
+from tibiawikisql.schema import BookTable, ImageTable, ItemTable, MapTable, create_tables
+from tibiawikisql.tasks.text_compression import compress_text_columns
+from tibiawikisql.utils import timed
+
+
+@unittest.skipIf(pa is None, "pyarrow is not installed")
+class TestColumnarExport(unittest.TestCase):
+    def setUp(self):
+        self.conn = sqlite3.connect(":memory:")
+        create_tables(self.conn)
+        insert_sample_items(self.conn)
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+    def tearDown(self):
+        self.conn.close()
+
+    def path(self, name: str):
+        return os.path.join(self.tmp_dir.name, name)
+
+    def test_schema_uses_column_types(self):
+        schema = get_arrow_schema(ItemTable)
+
+        self.assertEqual([column.name for column in ItemTable.columns], schema.names)
+        self.assertEqual(pa.int64(), schema.field("article_id").type)
+        self.assertFalse(schema.field("article_id").nullable)
+        self.assertEqual(pa.string(), schema.field("title").type)
+        self.assertEqual(pa.bool_(), schema.field("is_marketable").type)
+        self.assertEqual(pa.float64(), schema.field("weight").type)
+        self.assertEqual(pa.timestamp("us", tz="UTC"), schema.field("timestamp").type)
+        self.assertEqual(pa.binary(), get_arrow_schema(ImageTable).field("content").type)
+
+    def test_export_parquet(self):
+        count = export_table(self.conn, ItemTable, self.path("item.parquet"), batch_size=2)
+
+        table = pq.read_table(self.path("item.parquet"))
+        self.assertEqual(5, count)
+        self.assertEqual(5, table.num_rows)
+        self.assertEqual(3, pq.ParquetFile(self.path("item.parquet")).num_row_groups)
+        fire_sword = table.slice(0, 1).to_pylist()[0]
+        self.assertEqual("Fire Sword", fire_sword["title"])
+        self.assertIs(True, fire_sword["is_marketable"])
+        self.assertEqual(datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc), fire_sword["timestamp"])
+
+    def test_export_arrow(self):
+        export_table(self.conn, ItemTable, self.path("item.arrow"), "arrow")
+
+        with pa.ipc.open_file(self.path("item.arrow")) as reader:
+            table = reader.read_all()
+        self.assertEqual(get_arrow_schema(ItemTable), table.schema)
+        self.assertEqual(5, table.num_rows)
+
+    def test_compressed_text_is_decompressed(self):
+        text = "A very long text. " * 100
+        BookTable.insert(self.conn, article_id=10, title="Long Book", name="Long Book", book_type="Book", text=text,
+                         timestamp=datetime.datetime.now(datetime.timezone.utc))
+        compress_text_columns(self.conn, threshold=0, timed=timed, echo=lambda _: None)
+
+        export_table(self.conn, BookTable, self.path("book.parquet"))
+
+        self.assertEqual([text], pq.read_table(self.path("book.parquet")).column("text").to_pylist())
+
+    def test_image_tables_are_optional(self):
+        self.assertNotIn(ImageTable, get_exported_tables(self.conn))
+        self.assertNotIn(MapTable, get_exported_tables(self.conn))
+        self.assertIn(ImageTable, get_exported_tables(self.conn, include_images=True))
+
+        counts = export_tables(self.conn, self.tmp_dir.name)
+
+        self.assertEqual(5, counts["item"])
+        self.assertNotIn("image", counts)
+        self.assertTrue(os.path.exists(self.path("item_attribute.parquet")))
+
+    def test_derived_tables_are_optional(self):
+        names = {table.__tablename__ for table in get_exported_tables(self.conn)}
+        derived_names = {table.__tablename__ for table in DERIVED_TABLES}
+
+        self.assertFalse(names & derived_names)
+        self.assertFalse(any(name.startswith("search_index") for name in names))
+        self.assertLessEqual(set(DERIVED_TABLES), set(get_exported_tables(self.conn, include_derived=True)))
+
+        counts = export_tables(self.conn, self.tmp_dir.name)
+
+        self.assertNotIn("search_index", counts)
+        self.assertNotIn("document", counts)
+
+    def test_export_invalid_format(self):
+        with self.assertRaises(ValueError):
+            export_tables(self.conn, self.tmp_dir.name, "orc")
+
+    def test_cli_export(self):
+        path = self.path("tibiawiki.db")
+        conn = sqlite3.connect(path)
+        with conn:
+            create_tables(conn)
+            insert_sample_items(conn)
+        conn.close()
+        output = self.path("export")
+
+        result = CliRunner().invoke(
+            cli_module.cli,
+            ["export", "--db-name", path, "--format", "arrow", "--type", "items", "--output", output],
+        )
+        invalid = CliRunner().invoke(cli_module.cli, ["export", "--db-name", path, "-f", "parquet", "-z"])
+
+        self.assertEqual(0, result.exit_code, result.output)
+        self.assertEqual(["item.arrow"], os.listdir(output))
+        self.assertEqual(2, invalid.exit_code)
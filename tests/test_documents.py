@@ -0,0 +1,75 @@
+import datetime
+import json
+import sqlite3
+import unittest
+from collections.abc import Iterable
+from unittest.mock import MagicMock, Mock
+
+from tibiawikisql import generation as generation_module
+from tibiawikisql.models import Document, Item
+from tibiawikisql.schema import ItemAttributeTable, ItemTable, create_tables
+from tibiawikisql.tasks.documents import generate_documents
+
+TIMESTAMP = datetime.datetime.fromisoformat("2024-01-01T00:00:00+00:00")
+
+
+def passthrough_progress_bar(iterable: Iterable, *_args: object, **_kwargs: object) -> MagicMock:
+    bar = MagicMock()
+    bar.__enter__.return_value = iterable
+    return bar
+
+
+class TestDocuments(unittest.TestCase):
+    def setUp(self):
+        self.conn = sqlite3.connect(":memory:")
+        create_tables(self.conn)
+        ItemTable.insert(self.conn, article_id=1, title="Fire Sword", name="fire sword", timestamp=TIMESTAMP)
+        ItemTable.insert(self.conn, article_id=2, title="Fire Axe", name="fire axe", timestamp=TIMESTAMP)
+        ItemAttributeTable.insert(self.conn, item_id=1, name="attack", value="24")
+        self.generate()
+
+    def tearDown(self):
+        self.conn.close()
+
+    def generate(self):
+        generate_documents(
+            self.conn,
+            categories=generation_module.CATEGORIES,
+            enabled_categories={"items"},
+            progress_bar=passthrough_progress_bar,
+            timed=generation_module.timed,
+            echo=Mock(),
+        )
+
+    def test_documents_match_serialized_models(self):
+        document = Document.get_by_type_and_title(self.conn, "items", "fire sword")
+
+        self.assertEqual(1, document.article_id)
+        expected = json.loads(Item.get_by_title(self.conn, "Fire Sword").model_dump_json())
+        self.assertEqual(expected, json.loads(document.get_json()))
+        self.assertEqual("24", json.loads(document.get_json())["attributes"][0]["value"])
+
+    def test_documents_are_filtered_by_type(self):
+        self.assertIsNone(Document.get_by_type_and_title(self.conn, "creatures", "Fire Sword"))
+
+    def test_articles_are_read_in_batches(self):
+        for article_id in range(3, 53):
+            ItemTable.insert(self.conn, article_id=article_id, title=f"Item {article_id}", timestamp=TIMESTAMP)
+            ItemAttributeTable.insert(self.conn, item_id=article_id, name="attack", value="10")
+        statements = []
+        self.conn.set_trace_callback(statements.append)
+
+        self.generate()
+
+        self.conn.set_trace_callback(None)
+        self.assertEqual(52, self.conn.execute("SELECT COUNT(*) FROM document").fetchone()[0])
+        self.assertLess(len([statement for statement in statements if statement.startswith("SELECT")]), 20)
+
+    def test_big_documents_are_compressed(self):
+        item = Item.get_by_title(self.conn, "Fire Axe")
+
+        document = Document.from_model("items", item, compression_threshold=0)
+
+        self.assertTrue(document.compressed)
+        self.assertEqual(item.model_dump_json().encode(), document.get_json())
+        self.assertFalse(Document.from_model("items", item).compressed)
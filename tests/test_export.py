@@ -0,0 +1,140 @@
+import csv
+import datetime
+import gzip
+import io
+import json
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from click.testing import CliRunner
+
+from tests import load_resource
+from tibiawikisql import __main__ as cli_module
+from tibiawikisql.api import Article
+from tibiawikisql.explain import explain_query_plan
+from tibiawikisql.export import export_articles, get_export_columns
+from tibiawikisql.models import Item
+from tibiawikisql.parsers import ItemParser
+from tibiawikisql.query_log import query_log
+from tibiawikisql.schema import create_tables
+
+TIMESTAMP = datetime.datetime.fromisoformat("2024-01-01T00:00:00+00:00")
+
+ITEM_ARTICLES = [
+    (1, "Fire Sword", "content_item.txt"),
+    (2, "Dream Shroud", "content_item_resist.txt"),
+    (3, "Mini NabBot", "content_item_sounds.txt"),
+    (4, "Sword", "content_item_no_attrib.txt"),
+    (5, "Tibiapedia", "content_item_store.txt"),
+]
+
+
+def insert_sample_items(conn: sqlite3.Connection):
+    for article_id, title, resource in ITEM_ARTICLES:
+        article = Article(article_id=article_id, title=title, timestamp=TIMESTAMP, content=load_resource(resource))
+        ItemParser.from_article(article).insert(conn)
+
+
+class TestExport(unittest.TestCase):
+    def setUp(self):
+        self.conn = sqlite3.connect(":memory:")
+        create_tables(self.conn)
+        insert_sample_items(self.conn)
+
+    def tearDown(self):
+        query_log.enabled = False
+        query_log.clear()
+        self.conn.close()
+
+    def export(self, export_format: str, **kwargs: object):
+        file = io.StringIO()
+        count = export_articles(self.conn, Item, file, export_format, **kwargs)
+        return count, file.getvalue()
+
+    def test_iter_all_loads_children_in_batches(self):
+        query_log.enabled = True
+
+        items = list(Item.iter_all(self.conn, 2))
+
+        # Three batches, with one query for each of the eight child tables.
+        self.assertEqual(3 * 8, len(query_log.get_records()))
+        self.assertEqual(
+            [Item.get_by_id(self.conn, article_id) for article_id, _, _ in ITEM_ARTICLES],
+            items,
+        )
+
+    def test_batched_lookups_use_an_index(self):
+        query_log.enabled = True
+
+        list(Item.iter_all(self.conn))
+
+        for record in query_log.get_records():
+            with self.subTest(sql=record.sql):
+                steps = explain_query_plan(self.conn, record.sql, record.parameters)
+                self.assertFalse(any(step.is_full_scan for step in steps))
+
+    def test_export_ndjson(self):
+        count, content = self.export("ndjson")
+
+        lines = content.splitlines()
+        self.assertEqual(len(ITEM_ARTICLES), count)
+        self.assertEqual(count, len(lines))
+        fire_sword = json.loads(lines[0])
+        self.assertEqual("Fire Sword", fire_sword["title"])
+        self.assertEqual(Item.get_by_id(self.conn, 1).model_dump(mode="json"), fire_sword)
+        self.assertEqual(5, len(json.loads(lines[2])["sounds"]))
+
+    def test_export_csv(self):
+        count, content = self.export("csv")
+
+        rows = list(csv.DictReader(io.StringIO(content)))
+        self.assertEqual(len(ITEM_ARTICLES), count)
+        self.assertEqual(get_export_columns(Item), list(rows[0]))
+        self.assertNotIn("image", rows[0])
+        attributes = json.loads(rows[0]["attributes"])
+        self.assertEqual(len(Item.get_by_id(self.conn, 1).attributes), len(attributes))
+
+    def test_export_projection(self):
+        query_log.enabled = True
+
+        _, content = self.export("ndjson", columns=["title", "value_sell"])
+
+        self.assertEqual({"title": "Fire Sword", "value_sell": 4000}, json.loads(content.splitlines()[0]))
+        self.assertEqual([], query_log.get_records())
+
+        _, content = self.export("csv", columns=["title", "sounds"])
+
+        rows = list(csv.DictReader(io.StringIO(content)))
+        self.assertEqual(["title", "sounds"], list(rows[0]))
+        self.assertEqual(5, len(json.loads(rows[2]["sounds"])))
+
+    def test_export_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            self.export("ndjson", columns=["title", "unknown"])
+        with self.assertRaises(ValueError):
+            self.export("xml")
+
+    def test_cli_export_gzip(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "tibiawiki.db")
+            output = os.path.join(tmp_dir, "items.ndjson.gz")
+            conn = sqlite3.connect(path)
+            with conn:
+                create_tables(conn)
+                insert_sample_items(conn)
+            conn.close()
+
+            result = CliRunner().invoke(
+                cli_module.cli,
+                ["export", "--db-name", path, "--type", "items", "--output", output, "--gzip", "-c", "title"],
+            )
+            with gzip.open(output, "rt", encoding="utf-8") as file:
+                lines = file.read().splitlines()
+            invalid = CliRunner().invoke(cli_module.cli, ["export", "--db-name", path, "-t", "items", "-c", "foo"])
+
+        self.assertEqual(0, result.exit_code, result.output)
+        self.assertEqual({"title": "Fire Sword"}, json.loads(lines[0]))
+        self.assertEqual(len(ITEM_ARTICLES), len(lines))
+        self.assertEqual(2, invalid.exit_code)
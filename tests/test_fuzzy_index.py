@@ -0,0 +1,97 @@
+import datetime
+import sqlite3
+import unittest
+from unittest.mock import Mock
+
+from tibiawikisql import generation as generation_module
+from tibiawikisql.explain import explain_query_plan
+from tibiawikisql.models import Creature, FuzzyMatch, Item
+from tibiawikisql.models.fuzzy import get_trigrams
+from tibiawikisql.query_log import query_log
+from tibiawikisql.schema import CreatureTable, FuzzyNameTable, FuzzyTrigramTable, ItemTable
+from tibiawikisql.tasks.fuzzy_index import generate_fuzzy_index
+
+TIMESTAMP = datetime.datetime.fromisoformat("2024-01-01T00:00:00+00:00")
+
+
+class TestFuzzyIndex(unittest.TestCase):
+    def setUp(self):
+        self.conn = sqlite3.connect(":memory:")
+        for table in (CreatureTable, ItemTable, FuzzyNameTable, FuzzyTrigramTable):
+            self.conn.executescript(table.get_create_table_statement())
+        CreatureTable.insert(
+            self.conn, article_id=1, title="Demon", name="Demon", is_boss=0, timestamp=TIMESTAMP,
+        )
+        CreatureTable.insert(
+            self.conn, article_id=2, title="Demon Skeleton", name="Demon Skeleton", is_boss=0, timestamp=TIMESTAMP,
+        )
+        CreatureTable.insert(
+            self.conn, article_id=3, title="Dragon Lord", name="Dragon Lord", is_boss=0, timestamp=TIMESTAMP,
+        )
+        ItemTable.insert(self.conn, article_id=4, title="Demon Shield", name="demon shield", timestamp=TIMESTAMP)
+        ItemTable.insert(self.conn, article_id=5, title="Dragon Shield", name="dragon shield", timestamp=TIMESTAMP)
+        generate_fuzzy_index(
+            self.conn,
+            categories=generation_module.CATEGORIES,
+            enabled_categories={"creatures", "items"},
+            timed=generation_module.timed,
+            echo=Mock(),
+        )
+
+    def tearDown(self):
+        query_log.enabled = False
+        query_log.clear()
+        self.conn.close()
+
+    def test_get_trigrams(self):
+        self.assertEqual({"  d", " de", "dem", "emo", "mon", "on "}, get_trigrams("Demon"))
+        self.assertEqual(get_trigrams("demon"), get_trigrams("DEMON!"))
+        self.assertEqual(set(), get_trigrams("!?"))
+
+    def test_index_is_optional(self):
+        self.assertIn("fuzzy_index", generation_module.get_optional_task_names())
+
+    def test_index_deduplicates_same_title_and_name(self):
+        count = self.conn.execute("SELECT COUNT(*) FROM fuzzy_name WHERE article_id = 1").fetchone()[0]
+
+        self.assertEqual(1, count)
+
+    def test_find_misspelled_name(self):
+        results = FuzzyMatch.find(self.conn, "dragn lrod", limit=2)
+
+        self.assertEqual("Dragon Lord", results[0].title)
+        self.assertEqual("creatures", results[0].type)
+
+    def test_find_filters_by_type(self):
+        results = FuzzyMatch.find(self.conn, "demon sheild", types=["creatures"])
+
+        self.assertTrue(results)
+        self.assertTrue(all(r.type == "creatures" for r in results))
+
+    def test_candidates_use_covering_index(self):
+        statements = []
+        self.conn.set_trace_callback(statements.append)
+        FuzzyMatch.find(self.conn, "demon")
+        self.conn.set_trace_callback(None)
+
+        steps = explain_query_plan(self.conn, statements[-1])
+
+        self.assertIn("SEARCH t USING COVERING INDEX fuzzy_trigram_trigram_covering_idx", steps[0].detail)
+
+    def test_model_find_closest(self):
+        creatures = Creature.find_closest(self.conn, "deamon", limit=2)
+        items = Item.find_closest(self.conn, "dragon shild", limit=1)
+
+        self.assertEqual(["Demon", "Demon Skeleton"], [c.title for c in creatures])
+        self.assertEqual(["Dragon Shield"], [i.title for i in items])
+
+    def test_find_closest_loads_candidates_at_once(self):
+        query_log.enabled = True
+
+        creatures = Creature.find_closest(self.conn, "demn", limit=3)
+
+        self.assertEqual(3, len(creatures))
+        self.assertEqual(1, len(query_log.get_records()))
+
+    def test_find_closest_without_trigrams(self):
+        self.assertEqual([], Creature.find_closest(self.conn, "??"))
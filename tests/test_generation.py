@@ -1,8 +1,15 @@
 import datetime
+import json
+import os
 import sqlite3
+import tempfile
+import threading
+import time
 import unittest
+from collections.abc import Iterator
 from unittest.mock import Mock, patch
 
+import requests
 from click.testing import CliRunner
 
 from tests import load_resource
@@ -10,7 +17,8 @@ from tibiawikisql import __main__ as cli_module
 from tibiawikisql import generation as generation_module
 from tibiawikisql.api import Article, WikiEntry
 from tibiawikisql.generation import WEAPON_PROFICIENCY_NAME_ARTICLE, WEAPON_PROFICIENCY_TABLES_ARTICLE
-from tibiawikisql.schema import ItemProficiencyPerkTable, ItemTable
+from tibiawikisql.image_cache import ImageCache
+from tibiawikisql.schema import CreatureDropTable, CreatureTable, ImageTable, ItemProficiencyPerkTable, ItemTable
 from tibiawikisql.tasks import images as image_tasks
 from tibiawikisql.tasks.item_proficiency_perks import generate_item_proficiency_perks
 from tibiawikisql.tasks.loot_statistics import generate_loot_statistics
@@ -200,25 +208,57 @@ class TestGeneration(unittest.TestCase):
 
     def test_save_images_includes_additional_titles(self):
         wiki_client = Mock()
-        wiki_client.get_images_info.return_value = []
+        wiki_client.resolve_images.return_value = []
+        with tempfile.TemporaryDirectory() as folder, ImageCache(folder) as cache:
+            image_tasks.save_images(
+                self.conn,
+                "items",
+                generation_module.CATEGORIES["items"],
+                additional_titles=["Old Axe"],
+                wiki_client=wiki_client,
+                progress_bar=generation_module.progress_bar,
+                img_label=generation_module.img_label,
+                timed=generation_module.timed,
+                echo=Mock(),
+                cache=cache,
+            )
+
+        wiki_client.resolve_images.assert_called_once_with(["Amber Axe.gif", "Amber Cudgel.gif", "Old Axe.gif"])
+
+    def test_save_images_stores_identical_images_once(self):
+        self.conn.executescript(ImageTable.get_create_table_statement())
+        wiki_client = Mock()
+        wiki_client.resolve_images.return_value = [
+            ("Amber Axe.gif", Mock(file_name="Amber Axe.gif", clean_name="Amber Axe", timestamp=None)),
+            ("Amber Cudgel.gif", Mock(file_name="Amber Cudgel.gif", clean_name="Amber Cudgel", timestamp=None)),
+        ]
         with (
-            patch("tibiawikisql.tasks.images.os.makedirs"),
-            patch("tibiawikisql.tasks.images.get_cache_info", return_value={}),
-            patch("tibiawikisql.tasks.images.save_cache_info"),
+            tempfile.TemporaryDirectory() as folder,
+            ImageCache(folder) as cache,
+            patch(
+                "tibiawikisql.tasks.images.fetch_image",
+                side_effect=lambda _session, _path, image, *_args: image_tasks.ImageLoad(
+                    image,
+                    image_tasks.IMAGE_FETCHED,
+                    b"GIF89a",
+                ),
+            ),
         ):
             image_tasks.save_images(
                 self.conn,
                 "items",
                 generation_module.CATEGORIES["items"],
-                additional_titles=["Old Axe"],
                 wiki_client=wiki_client,
                 progress_bar=generation_module.progress_bar,
                 img_label=generation_module.img_label,
                 timed=generation_module.timed,
                 echo=Mock(),
+                cache=cache,
             )
 
-        wiki_client.get_images_info.assert_called_once_with(["Amber Axe.gif", "Amber Cudgel.gif", "Old Axe.gif"])
+        self.assertEqual(1, self.conn.execute("SELECT COUNT(*) FROM image").fetchone()[0])
+        hashes = {row[0] for row in self.conn.execute("SELECT image_hash FROM item")}
+        self.assertEqual({image_tasks.get_image_hash(b"GIF89a")}, hashes)
 
     def test_additional_outfit_titles_have_no_database_id(self):
         rows = image_tasks.add_additional_outfit_names([(1, "Barbarian")], ["Demon Outfits"])
@@ -282,6 +322,265 @@ class TestGenerationOrchestration(unittest.TestCase):
         messages = " ".join(call.args[0] for call in mock_echo.call_args_list if call.args)
         self.assertIn("Skipping task 'needs_items'", messages)
 
+    def test_optional_post_tasks_only_run_when_requested(self):
+        optional_task = Mock()
+        post_tasks = (
+            generation_module.PostTask("optional", lambda *_: optional_task(), optional=True),
+        )
+        with (
+            patch("tibiawikisql.generation.fetch_category_entries", return_value=[]),
+            patch.object(generation_module.wiki_client, "get_articles", return_value=[]),
+            patch("tibiawikisql.generation.POST_TASKS", post_tasks),
+        ):
+            generation_module.generate(self.conn)
+            optional_task.assert_not_called()
+            generation_module.generate(self.conn, optional_tasks=("optional",))
+            optional_task.assert_called_once_with()
+
+    def test_post_tasks_read_parsed_categories_concurrently(self):
+        timestamp = datetime.datetime.fromisoformat("2024-01-01T00:00:00+00:00")
+        article = TestGeneration.build_article("Fire Sword", load_resource("content_item.txt"))
+        captured = {}
+
+        def capture(conn: sqlite3.Connection, data_store: dict, _enabled_categories: set[str]) -> None:
+            captured["titles"] = [row[0] for row in conn.execute("SELECT title FROM item")]
+            captured["map"] = data_store["items_map"]
+
+        post_tasks = (generation_module.PostTask("capture", capture, dependencies=("items",)),)
+        with (
+            patch.dict(generation_module.CATEGORIES, {"items": generation_module.CATEGORIES["items"]}, clear=True),
+            patch(
+                "tibiawikisql.generation.fetch_category_entries",
+                return_value=[WikiEntry(article_id=article.article_id, title=article.title, timestamp=timestamp)],
+            ),
+            patch.object(generation_module.wiki_client, "get_articles", return_value=[article]),
+            patch("tibiawikisql.generation.POST_TASKS", post_tasks),
+        ):
+            generation_module.generate(self.conn, jobs=2)
+
+        self.assertEqual(["Fire Sword"], captured["titles"])
+        self.assertEqual({"fire sword": article.article_id}, captured["map"])
+
+    def test_independent_categories_are_parsed_concurrently(self):
+        barrier = threading.Barrier(2, timeout=5)
+
+        def get_articles(_titles: list[str]) -> list[Article]:
+            barrier.wait()
+            return []
+
+        with (
+            patch.dict(
+                generation_module.CATEGORIES,
+                {key: generation_module.CATEGORIES[key] for key in ("achievements", "spells")},
+                clear=True,
+            ),
+            patch("tibiawikisql.generation.fetch_category_entries", return_value=[]),
+            patch.object(generation_module.wiki_client, "get_articles", side_effect=get_articles),
+            patch("tibiawikisql.generation.POST_TASKS", ()),
+        ):
+            generation_module.generate(self.conn, jobs=2)
+
+        self.assertFalse(barrier.broken)
+
+    def test_categories_are_parsed_after_referenced_categories(self):
+        timestamp = datetime.datetime.fromisoformat("2024-01-01T00:00:00+00:00")
+        events = []
+
+        def get_articles(titles: list[str]) -> list[Article]:
+            events.append(f"{titles[0]} started")
+            time.sleep(0.05)
+            events.append(f"{titles[0]} finished")
+            return []
+
+        with (
+            patch.dict(
+                generation_module.CATEGORIES,
+                {key: generation_module.CATEGORIES[key] for key in ("items", "creatures")},
+                clear=True,
+            ),
+            patch(
+                "tibiawikisql.generation.fetch_category_entries",
+                side_effect=lambda name, *_: [WikiEntry(article_id=1, title=name, timestamp=timestamp)],
+            ),
+            patch.object(generation_module.wiki_client, "get_articles", side_effect=get_articles),
+            patch("tibiawikisql.generation.POST_TASKS", ()),
+        ):
+            generation_module.generate(self.conn, jobs=2)
+
+        self.assertEqual(["Objects started", "Objects finished", "Creatures started", "Creatures finished"], events)
+
+    def test_resume_continues_interrupted_generation(self):
+        timestamp = datetime.datetime.fromisoformat("2024-01-01T00:00:00+00:00")
+        content = load_resource("content_item.txt")
+        articles = [
+            TestGeneration.build_article(title, content).model_copy(update={"article_id": article_id})
+            for article_id, title in enumerate(("Fire Sword", "Ice Sword"), 1)
+        ]
+        requested = []
+        task = Mock()
+
+        def get_articles_interrupted(titles: list[str]) -> Iterator[Article]:
+            requested.append(list(titles))
+            yield articles[0]
+            raise requests.ConnectionError
+
+        def get_articles(titles: list[str]) -> Iterator[Article]:
+            requested.append(list(titles))
+            yield from (article for article in articles if article.title in titles)
+
+        post_tasks = (generation_module.PostTask("task", lambda *_: task(), dependencies=("items",)),)
+        with (
+            patch.dict(generation_module.CATEGORIES, {"items": generation_module.CATEGORIES["items"]}, clear=True),
+            patch(
+                "tibiawikisql.generation.fetch_category_entries",
+                return_value=[WikiEntry(article_id=a.article_id, title=a.title, timestamp=timestamp) for a in articles],
+            ),
+            patch("tibiawikisql.generation.POST_TASKS", post_tasks),
+            patch("tibiawikisql.generation.CHECKPOINT_BATCH_SIZE", 1),
+        ):
+            with (
+                patch.object(generation_module.wiki_client, "get_articles", side_effect=get_articles_interrupted),
+                self.assertRaises(requests.ConnectionError),
+            ):
+                generation_module.generate(self.conn, jobs=2)
+            self.assertEqual({"items": (1, False)}, generation_module.get_checkpoints(self.conn))
+
+            with patch.object(generation_module.wiki_client, "get_articles", side_effect=get_articles):
+                generation_module.generate(self.conn, jobs=2, resume=True)
+                generation_module.generate(self.conn, jobs=2, resume=True)
+
+        self.assertEqual([["Fire Sword", "Ice Sword"], ["Ice Sword"]], requested)
+        self.assertEqual(["Fire Sword", "Ice Sword"], [row[0] for row in self.conn.execute("SELECT title FROM item")])
+        self.assertEqual({"items": (2, True), "task": (0, True)}, generation_module.get_checkpoints(self.conn))
+        task.assert_called_once_with()
+
+    def test_resume_after_another_job_fails_during_a_category(self):
+        timestamp = datetime.datetime.fromisoformat("2024-01-01T00:00:00+00:00")
+        content = load_resource("content_item.txt")
+        articles = [
+            TestGeneration.build_article(title, content).model_copy(update={"article_id": article_id})
+            for article_id, title in enumerate(("Fire Sword", "Ice Sword"), 1)
+        ]
+        item_parsed = threading.Event()
+        task_failed = threading.Event()
+
+        def get_articles(titles: list[str]) -> Iterator[Article]:
+            if not titles:
+                return
+            yield articles[0]
+            item_parsed.set()
+            task_failed.wait(5)
+            yield articles[1]
+
+        def fail_during_items(conn: sqlite3.Connection, _data_store: dict, _enabled_categories: set[str]) -> None:
+            item_parsed.wait(5)
+            try:
+                with conn:
+                    conn.execute("DELETE FROM rashid_position")
+                    raise RuntimeError
+            finally:
+                task_failed.set()
+
+        post_tasks = (generation_module.PostTask("fail", fail_during_items, dependencies=("achievements",)),)
+        with (
+            patch.dict(
+                generation_module.CATEGORIES,
+                {key: generation_module.CATEGORIES[key] for key in ("items", "achievements")},
+                clear=True,
+            ),
+            patch(
+                "tibiawikisql.generation.fetch_category_entries",
+                side_effect=lambda name, *_: [
+                    WikiEntry(article_id=a.article_id, title=a.title, timestamp=timestamp)
+                    for a in (articles if name == "Objects" else [])
+                ],
+            ),
+            patch.object(generation_module.wiki_client, "get_articles", side_effect=get_articles),
+            patch("tibiawikisql.generation.CHECKPOINT_BATCH_SIZE", 2),
+        ):
+            with (
+                patch("tibiawikisql.generation.POST_TASKS", post_tasks),
+                self.assertRaises(RuntimeError),
+            ):
+                generation_module.generate(self.conn, jobs=3)
+            with patch("tibiawikisql.generation.POST_TASKS", ()):
+                generation_module.generate(self.conn, jobs=3, resume=True)
+
+        self.assertEqual(["Fire Sword", "Ice Sword"], [row[0] for row in self.conn.execute("SELECT title FROM item")])
+        self.assertEqual(2, generation_module.get_checkpoints(self.conn)["items"][0])
+
+    def test_resume_without_checkpoints_starts_from_scratch(self):
+        task = Mock()
+        post_tasks = (generation_module.PostTask("task", lambda *_: task()),)
+        with (
+            patch.dict(generation_module.CATEGORIES, {}, clear=True),
+            patch("tibiawikisql.generation.POST_TASKS", post_tasks),
+        ):
+            generation_module.generate(self.conn, resume=True)
+
+        task.assert_called_once_with()
+        self.assertEqual({"task": (0, True)}, generation_module.get_checkpoints(self.conn))
+
+    def test_report_measures_categories_and_tasks(self):
+        timestamp = datetime.datetime.fromisoformat("2024-01-01T00:00:00+00:00")
+        article = TestGeneration.build_article("Fire Sword", load_resource("content_item.txt"))
+        post_tasks = (generation_module.PostTask("task", lambda *_: None, dependencies=("items",)),)
+        with (
+            tempfile.TemporaryDirectory() as directory,
+            patch.dict(generation_module.CATEGORIES, {"items": generation_module.CATEGORIES["items"]}, clear=True),
+            patch(
+                "tibiawikisql.generation.fetch_category_entries",
+                return_value=[WikiEntry(article_id=article.article_id, title=article.title, timestamp=timestamp)],
+            ),
+            patch.object(generation_module.wiki_client, "get_articles", return_value=[article]),
+            patch("tibiawikisql.generation.POST_TASKS", post_tasks),
+        ):
+            report_file = os.path.join(directory, "report.json")
+            generation_module.generate(self.conn, report_file=report_file)
+            with open(report_file, encoding="utf-8") as f:
+                report = json.load(f)
+
+        stages = {stage["name"]: stage for stage in report["stages"]}
+        self.assertEqual({"category_members", "items", "task"}, set(stages))
+        self.assertEqual("category", stages["items"]["kind"])
+        self.assertEqual(1, stages["items"]["articles"])
+        self.assertEqual(0, stages["items"]["parse_errors"])
+        self.assertEqual("task", stages["task"]["kind"])
+        self.assertGreater(report["db_size"], 0)
+        stored = self.conn.execute("SELECT value FROM database_info WHERE key = 'report'").fetchone()[0]
+        self.assertEqual(report, json.loads(stored))
+
+    def test_profile_writes_profiles_of_every_stage(self):
+        post_tasks = (generation_module.PostTask("task", lambda *_: None),)
+        with (
+            tempfile.TemporaryDirectory() as directory,
+            patch.dict(
+                generation_module.CATEGORIES,
+                {key: generation_module.CATEGORIES[key] for key in ("achievements", "spells")},
+                clear=True,
+            ),
+            patch("tibiawikisql.generation.fetch_category_entries", return_value=[]),
+            patch.object(generation_module.wiki_client, "get_articles", return_value=[]),
+            patch("tibiawikisql.generation.POST_TASKS", post_tasks),
+            patch("tibiawikisql.generation.run_jobs", wraps=generation_module.run_jobs) as run_jobs,
+        ):
+            generation_module.generate(self.conn, jobs=4, profile_dir=directory)
+            files = set(os.listdir(directory))
+
+        self.assertEqual(1, run_jobs.call_args.kwargs["workers"])
+        self.assertEqual(
+            {
+                f"{name}.{extension}"
+                for name in ("achievements", "spells", "task")
+                for extension in ("pstats", "collapsed")
+            },
+            files,
+        )
+
+    def test_unknown_optional_task_is_rejected(self):
+        with self.assertRaises(ValueError):
+            generation_module.generate(self.conn, optional_tasks=("unknown",))
+
     def test_deprecated_titles_are_retained_for_images_only(self):
         timestamp = datetime.datetime.fromisoformat("2024-01-01T00:00:00+00:00")
         active = WikiEntry(article_id=1, title="Amber Axe", timestamp=timestamp)
@@ -340,13 +639,69 @@ class TestGenerationOrchestration(unittest.TestCase):
         )
         wiki_client.get_articles.assert_not_called()
 
+    def test_generate_loot_statistics_replaces_matching_drops(self):
+        self.conn.executescript(CreatureTable.get_create_table_statement())
+        self.conn.executescript(CreatureDropTable.get_create_table_statement())
+        self.conn.execute("INSERT INTO creature(article_id, title, timestamp) VALUES(10, 'Demon', '')")
+        self.conn.executemany(
+            "INSERT INTO creature_drop(creature_id, item_id, chance, min, max) VALUES(?, ?, ?, ?, ?)",
+            [(10, 1, 5.0, 1, 1), (10, 2, 50.0, 1, 1)],
+        )
+        wiki_client = Mock()
+        wiki_client.get_articles.return_value = [
+            TestGeneration.build_article("Loot Statistics:Demon", load_resource("content_loot_statistics.txt")),
+        ]
+
+        generate_loot_statistics(
+            self.conn,
+            {"creatures_map": {"demon": 10}, "items_map": {"gold coin": 1, "fire axe": 3}},
+            wiki_client=wiki_client,
+            progress_bar=generation_module.progress_bar,
+            article_label=generation_module.article_label,
+            timed=generation_module.timed,
+            echo=Mock(),
+        )
+
+        rows = self.conn.execute(
+            "SELECT item_id, round(chance, 2), min, max FROM creature_drop ORDER BY item_id",
+        ).fetchall()
+        self.assertEqual([(1, 99.49, 1, 200), (2, 50.0, 1, 1), (3, 4.02, 0, 1)], rows)
+
+    def test_generate_loot_statistics_does_not_commit_on_error(self):
+        self.conn.executescript(CreatureTable.get_create_table_statement())
+        self.conn.executescript(CreatureDropTable.get_create_table_statement())
+        self.conn.execute("INSERT INTO creature(article_id, title, timestamp) VALUES(10, 'Demon', '')")
+        self.conn.commit()
+        self.conn.execute("INSERT INTO creature_drop(creature_id, item_id, chance, min, max) VALUES(10, 1, 5.0, 1, 1)")
+
+        def get_articles(_titles: list[str]) -> Iterator[Article]:
+            yield TestGeneration.build_article("Loot Statistics:Demon", load_resource("content_loot_statistics.txt"))
+            raise requests.ConnectionError
+
+        wiki_client = Mock()
+        wiki_client.get_articles.side_effect = get_articles
+
+        with self.assertRaises(requests.ConnectionError):
+            generate_loot_statistics(
+                self.conn,
+                {"creatures_map": {"demon": 10}, "items_map": {"gold coin": 1}},
+                wiki_client=wiki_client,
+                progress_bar=generation_module.progress_bar,
+                article_label=generation_module.article_label,
+                timed=generation_module.timed,
+                echo=Mock(),
+            )
+        self.conn.rollback()
+
+        self.assertEqual([], self.conn.execute("SELECT * FROM creature_drop").fetchall())
+
 
 class TestGenerateCommand(unittest.TestCase):
     def setUp(self):
         self.runner = CliRunner()
 
     def test_skip_category_option_is_passed_to_generate(self):
-        with patch("tibiawikisql.__main__.generation.generate") as mock_generate:
+        with patch("tibiawikisql.generation.generate") as mock_generate:
             result = self.runner.invoke(
                 cli_module.cli,
                 [
@@ -376,7 +731,7 @@ class TestGenerateCommand(unittest.TestCase):
         self.assertIn("--skip-category", result.output)
 
     def test_include_deprecated_images_option_is_passed_to_generate(self):
-        with patch("tibiawikisql.__main__.generation.generate") as mock_generate:
+        with patch("tibiawikisql.generation.generate") as mock_generate:
             result = self.runner.invoke(
                 cli_module.cli,
                 [
@@ -393,7 +748,7 @@ class TestGenerateCommand(unittest.TestCase):
         self.assertTrue(mock_generate.call_args.kwargs["include_deprecated_images"])
 
     def test_include_deprecated_images_short_option_is_passed_to_generate(self):
-        with patch("tibiawikisql.__main__.generation.generate") as mock_generate:
+        with patch("tibiawikisql.generation.generate") as mock_generate:
             result = self.runner.invoke(
                 cli_module.cli,
                 ["generate", "--db-name", ":memory:", "-d", "-I"],
@@ -401,3 +756,54 @@ class TestGenerateCommand(unittest.TestCase):
 
         self.assertEqual(0, result.exit_code, result.output)
         self.assertTrue(mock_generate.call_args.kwargs["include_deprecated_images"])
+
+    def test_optional_task_option_is_passed_to_generate(self):
+        with patch("tibiawikisql.generation.generate") as mock_generate:
+            result = self.runner.invoke(
+                cli_module.cli,
+                ["generate", "--db-name", ":memory:", "--task", "search_index"],
+            )
+
+        self.assertEqual(0, result.exit_code, result.output)
+        self.assertEqual(("search_index",), mock_generate.call_args.kwargs["optional_tasks"])
+
+    def test_image_cache_size_option_is_passed_to_generate(self):
+        with patch("tibiawikisql.generation.generate") as mock_generate:
+            result = self.runner.invoke(
+                cli_module.cli,
+                ["generate", "--db-name", ":memory:", "--image-cache-size", "512"],
+            )
+
+        self.assertEqual(0, result.exit_code, result.output)
+        self.assertEqual(512, mock_generate.call_args.kwargs["image_cache_size"])
+
+    def test_jobs_option_is_passed_to_generate(self):
+        with patch("tibiawikisql.generation.generate") as mock_generate:
+            result = self.runner.invoke(cli_module.cli, ["generate", "--db-name", ":memory:", "-j", "2"])
+
+        self.assertEqual(0, result.exit_code, result.output)
+        self.assertEqual(2, mock_generate.call_args.kwargs["jobs"])
+
+    def test_resume_option_is_passed_to_generate(self):
+        with patch("tibiawikisql.generation.generate") as mock_generate:
+            result = self.runner.invoke(cli_module.cli, ["generate", "--db-name", ":memory:", "--resume"])
+
+        self.assertEqual(0, result.exit_code, result.output)
+        self.assertTrue(mock_generate.call_args.kwargs["resume"])
+
+    def test_report_option_is_passed_to_generate(self):
+        with patch("tibiawikisql.generation.generate") as mock_generate:
+            result = self.runner.invoke(
+                cli_module.cli,
+                ["generate", "--db-name", ":memory:", "--report", "report.json"],
+            )
+
+        self.assertEqual(0, result.exit_code, result.output)
+        self.assertEqual("report.json", mock_generate.call_args.kwargs["report_file"])
+
+    def test_profile_option_is_passed_to_generate(self):
+        with patch("tibiawikisql.generation.generate") as mock_generate:
+            result = self.runner.invoke(cli_module.cli, ["generate", "--db-name", ":memory:", "--profile", "profiles"])
+
+        self.assertEqual(0, result.exit_code, result.output)
+        self.assertEqual("profiles", mock_generate.call_args.kwargs["profile_dir"])
@@ -0,0 +1,226 @@
+import datetime
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock, patch
+
+import requests
+
+from tibiawikisql import generation as generation_module
+from tibiawikisql.image_cache import ImageCache
+from tibiawikisql.schema import ImageTable, ItemTable
+from tibiawikisql.tasks import images as image_tasks
+
+TIMESTAMP = datetime.datetime.fromisoformat("2024-01-01T00:00:00+00:00")
+
+
+class TestImageLoading(unittest.TestCase):
+    def test_host_limiter_caps_concurrent_requests(self):
+        limiter = image_tasks.HostLimiter(2)
+        lock = threading.Lock()
+        active = 0
+        peak = 0
+
+        def request(url: str) -> None:
+            nonlocal active, peak
+            with limiter.limit(url):
+                with lock:
+                    active += 1
+                    peak = max(peak, active)
+                time.sleep(0.01)
+                with lock:
+                    active -= 1
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(request, ["https://tibia.fandom.com/a.gif"] * 16))
+
+        self.assertEqual(2, peak)
+
+    def test_load_images_reports_failures(self):
+        images = [
+            Mock(file_name="Fire Sword.gif", file_url="https://host/1", timestamp=TIMESTAMP),
+            Mock(file_name="Fire Axe.gif", file_url="https://host/2", timestamp=TIMESTAMP),
+        ]
+
+        def fetch(_session: requests.Session, _path: str, image: Mock, *_args: object) -> image_tasks.ImageLoad:
+            if image.file_name == "Fire Axe.gif":
+                raise requests.HTTPError
+            return image_tasks.ImageLoad(image, image_tasks.IMAGE_FETCHED, b"GIF89a")
+
+        with (
+            tempfile.TemporaryDirectory() as folder,
+            ImageCache(folder) as cache,
+            patch("tibiawikisql.tasks.images.fetch_image", side_effect=fetch),
+        ):
+            results = {
+                load.image.file_name: (load.status, load.content)
+                for load in image_tasks.load_images(Mock(), cache, "item", images, workers=2)
+            }
+
+        self.assertEqual(
+            {"Fire Sword.gif": ("fetched", b"GIF89a"), "Fire Axe.gif": ("failed", None)},
+            results,
+        )
+
+
+class TestImageCache(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache = ImageCache(self.temp_dir.name)
+        self.session = Mock()
+        self.image = Mock(file_name="Fire Sword.gif", file_url="https://host/Fire_Sword.gif", timestamp=TIMESTAMP)
+
+    def tearDown(self):
+        self.cache.close()
+        self.temp_dir.cleanup()
+
+    def load(self, image: Mock):
+        return next(image_tasks.load_images(self.session, self.cache, "item", [image], workers=1))
+
+    def cache_image(self, content: bytes, **kwargs: object):
+        with open(self.cache.get_path(self.cache.get_folder("item"), "Fire Sword.gif"), "wb") as f:
+            f.write(content)
+        self.cache.record("item", "Fire Sword.gif", content, wiki_timestamp=TIMESTAMP, **kwargs)
+
+    def test_fetched_images_are_indexed(self):
+        self.session.get.return_value = Mock(status_code=200, content=b"GIF89a", headers={"ETag": '"abc"'})
+
+        results = image_tasks.write_images(
+            Mock(),
+            self.session,
+            self.cache,
+            "item",
+            [self.image],
+            get_params=lambda _image: None,
+            label="Fetching item images",
+            workers=1,
+            limiter=None,
+            progress_bar=generation_module.progress_bar,
+            img_label=generation_module.img_label,
+        )
+
+        self.assertEqual(1, results.fetched)
+        entry = self.cache.get("item", "Fire Sword.gif")
+        self.assertEqual((6, '"abc"', TIMESTAMP), (entry.size, entry.etag, entry.wiki_timestamp))
+        with open(self.cache.get_path("item", "Fire Sword.gif"), "rb") as f:
+            self.assertEqual(b"GIF89a", f.read())
+
+    def test_up_to_date_images_are_not_requested(self):
+        self.cache_image(b"GIF89a")
+
+        load = self.load(self.image)
+
+        self.assertEqual(("cached", b"GIF89a"), (load.status, load.content))
+        self.session.get.assert_not_called()
+
+    def test_outdated_images_are_revalidated(self):
+        self.cache_image(b"GIF89a", etag='"abc"', last_modified="Mon, 01 Jan 2024 00:00:00 GMT")
+        self.session.get.return_value = Mock(status_code=304)
+        image = Mock(
+            file_name="Fire Sword.gif",
+            file_url="https://host/Fire_Sword.gif",
+            timestamp=TIMESTAMP + datetime.timedelta(days=1),
+        )
+
+        load = self.load(image)
+
+        self.assertEqual(("revalidated", b"GIF89a"), (load.status, load.content))
+        headers = self.session.get.call_args.kwargs["headers"]
+        self.assertEqual('"abc"', headers["If-None-Match"])
+        self.assertEqual("Mon, 01 Jan 2024 00:00:00 GMT", headers["If-Modified-Since"])
+
+    def test_evicts_least_recently_used(self):
+        self.cache.max_bytes = 10
+        for i, name in enumerate(("a.gif", "b.gif", "c.gif")):
+            with open(self.cache.get_path(self.cache.get_folder("item"), name), "wb") as f:
+                f.write(b"12345")
+            self.cache.record("item", name, b"12345", wiki_timestamp=TIMESTAMP)
+            self.cache.conn.execute("UPDATE image_cache SET last_used = ? WHERE file_name = ?", (i, name))
+        self.cache.touch("item", "a.gif")
+
+        self.assertEqual(1, self.cache.evict())
+
+        self.assertIsNone(self.cache.get("item", "b.gif"))
+        self.assertFalse(os.path.exists(self.cache.get_path("item", "b.gif")))
+        self.assertEqual(10, self.cache.get_total_size())
+
+    def test_imports_legacy_cache_info(self):
+        folder = self.cache.get_folder("item")
+        with open(os.path.join(folder, "Fire Sword.gif"), "wb") as f:
+            f.write(b"GIF89a")
+        with open(os.path.join(folder, "cache_info.json"), "w") as f:
+            json.dump({"Fire Sword.gif": TIMESTAMP.isoformat(), "Missing.gif": TIMESTAMP.isoformat()}, f)
+
+        self.assertEqual(1, self.cache.import_legacy_info("item"))
+
+        self.assertEqual(TIMESTAMP, self.cache.get("item", "Fire Sword.gif").wiki_timestamp)
+        self.assertFalse(os.path.exists(os.path.join(folder, "cache_info.json")))
+
+
+class TestImageResolution(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.cache = ImageCache(self.folder.name)
+        self.wiki_client = Mock()
+        self.image = Mock(file_name="Fire Sword.gif")
+        self.wiki_client.resolve_images.side_effect = lambda titles: [
+            (title, self.image if title == "Fire Sword.gif" else None) for title in titles
+        ]
+
+    def tearDown(self):
+        self.cache.close()
+        self.folder.cleanup()
+
+    def test_titles_are_looked_up_once(self):
+        resolved = image_tasks.resolve_images(
+            self.wiki_client,
+            self.cache,
+            ["Fire Sword.gif", "Outfit Citizen Male Addon 3.gif", "Fire Sword.gif"],
+        )
+
+        self.assertEqual({"Fire Sword.gif": self.image}, resolved)
+        self.wiki_client.resolve_images.assert_called_once_with(["Fire Sword.gif", "Outfit Citizen Male Addon 3.gif"])
+
+    def test_missing_titles_are_skipped_until_expired(self):
+        titles = ["Fire Sword.gif", "Outfit Citizen Male Addon 3.gif"]
+        image_tasks.resolve_images(self.wiki_client, self.cache, titles)
+
+        image_tasks.resolve_images(self.wiki_client, self.cache, titles)
+        self.assertEqual(["Fire Sword.gif"], self.wiki_client.resolve_images.call_args.args[0])
+
+        image_tasks.resolve_images(self.wiki_client, self.cache, titles, missing_ttl=-1)
+        self.assertEqual(titles, self.wiki_client.resolve_images.call_args.args[0])
+
+    def test_found_titles_are_no_longer_missing(self):
+        self.cache.record_missing(["Fire Sword.gif"])
+
+        image_tasks.resolve_images(self.wiki_client, self.cache, ["Fire Sword.gif"], missing_ttl=-1)
+
+        self.assertEqual(set(), self.cache.get_missing(60))
+
+
+class TestImageWriter(unittest.TestCase):
+    def setUp(self):
+        self.conn = sqlite3.connect(":memory:")
+        self.conn.executescript(ImageTable.get_create_table_statement())
+        self.conn.executescript(ItemTable.get_create_table_statement())
+        self.conn.executemany("INSERT INTO item(article_id, title, timestamp) VALUES(?, ?, '')", [(1, "A"), (2, "B")])
+
+    def tearDown(self):
+        self.conn.close()
+
+    def test_writes_in_batches(self):
+        writer = image_tasks.ImageWriter(self.conn, "UPDATE item SET image_hash = ? WHERE title = ?", batch_size=2)
+
+        writer.add(b"GIF89a", "A")
+        self.assertEqual(0, self.conn.execute("SELECT COUNT(*) FROM image").fetchone()[0])
+        writer.add(b"GIF89a", "B")
+
+        self.assertEqual(1, self.conn.execute("SELECT COUNT(*) FROM image").fetchone()[0])
+        hashes = [row[0] for row in self.conn.execute("SELECT image_hash FROM item ORDER BY article_id")]
+        self.assertEqual([image_tasks.get_image_hash(b"GIF89a")] * 2, hashes)
@@ -0,0 +1,76 @@
+import os
+import subprocess
+import sys
+import unittest
+from unittest.mock import Mock
+
+from tibiawikisql import parsers
+from tibiawikisql.__main__ import LazyChoice
+from tibiawikisql.parsers.item import ItemParser
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CLI_HEAVY_MODULES = (
+    "tibiawikisql.generation",
+    "tibiawikisql.models",
+    "tibiawikisql.parsers.base",
+    "lupa",
+    "mwparserfromhell",
+    "pyarrow",
+    "pydantic",
+    "pypika",
+    "requests",
+)
+"""Modules that must not be imported by the command line interface until a command needs them."""
+
+
+def get_import_times(statement: str) -> dict[str, int]:
+    """Run a statement in a new interpreter, returning the cumulative import time of every module, in microseconds."""
+    result = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=ROOT_DIR,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+class TestImportTime(unittest.TestCase):
+    def test_cli_only_imports_modules_when_needed(self):
+        times = get_import_times("import tibiawikisql.__main__")
+
+        for module in CLI_HEAVY_MODULES:
+            with self.subTest(module=module):
+                self.assertNotIn(module, times)
+
+    def test_generation_only_imports_parsers_and_tasks_when_needed(self):
+        times = get_import_times("import tibiawikisql.generation")
+
+        self.assertIn("tibiawikisql.generation", times)
+        for module in ("tibiawikisql.models", "tibiawikisql.parsers.item", "tibiawikisql.tasks.item_offers", "lupa"):
+            with self.subTest(module=module):
+                self.assertNotIn(module, times)
+
+    def test_parsers_are_imported_when_accessed(self):
+        self.assertIs(ItemParser, parsers.ItemParser)
+        self.assertIn("CreatureParser", dir(parsers))
+        with self.assertRaises(AttributeError):
+            parsers.UnknownParser  # noqa: B018
+
+    def test_lazy_choice_loads_choices_when_needed(self):
+        get_choices = Mock(return_value=["items", "creatures"])
+
+        choice = LazyChoice(get_choices, case_sensitive=False)
+
+        get_choices.assert_not_called()
+        self.assertFalse(choice.case_sensitive)
+        self.assertEqual("items", choice.convert("ITEMS", None, None))
+        self.assertEqual(("items", "creatures"), choice.to_info_dict()["choices"])
+        get_choices.assert_called_once()
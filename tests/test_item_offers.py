@@ -1,7 +1,11 @@
+import datetime
+import os
+import tempfile
 import unittest
 from collections import defaultdict
 
-from tibiawikisql.tasks.item_offers import process_offer_list
+from tibiawikisql.api import Article
+from tibiawikisql.tasks.item_offers import evaluate_item_prices, load_item_prices, process_offer_list
 
 
 class TestItemOffers(unittest.TestCase):
@@ -25,3 +29,27 @@ class TestItemOffers(unittest.TestCase):
 
         self.assertEqual([(1, 8000, 10, 20), (1, 2500, 11, 21)], rows)
         self.assertEqual({}, not_found)
+
+    def test_evaluate_item_prices_falls_back_to_lua(self):
+        content = 'local coin = "gold coin" return {Bob = {sells = {{item = "Axe", price = 20, currency = coin}}}}'
+
+        data = evaluate_item_prices(content)
+
+        self.assertEqual({"Bob": {"sells": [{"item": "Axe", "price": 20, "currency": "gold coin"}]}}, data)
+
+    def test_load_item_prices_reuses_cached_revision(self):
+        article = Article(
+            article_id=1,
+            title="Module:ItemPrices/data",
+            timestamp=datetime.datetime.fromisoformat("2024-01-01T00:00:00+00:00"),
+            content='return {Bob = {sells = {{item = "Axe", price = 20}}}}',
+        )
+        with tempfile.TemporaryDirectory() as folder:
+            cache_file = os.path.join(folder, "item_prices.json")
+            load_item_prices(article, cache_file)
+
+            changed = article.model_copy(update={"content": "return {}"})
+            self.assertEqual({"Bob": {"sells": [{"item": "Axe", "price": 20}]}}, load_item_prices(changed, cache_file))
+
+            updated = changed.model_copy(update={"timestamp": datetime.datetime.now(tz=datetime.timezone.utc)})
+            self.assertEqual({}, load_item_prices(updated, cache_file))
@@ -0,0 +1,56 @@
+import unittest
+
+from tibiawikisql.errors import LuaDataError
+from tibiawikisql.lua_data import parse_lua_data
+
+MODULE_CONTENT = """-- Prices of items bought and sold by NPCs.
+--[[ Generated
+automatically ]]
+return {
+    ["A Sweaty Cyclops"] = {
+        sells = {
+            {item = "Giant Sword", price = 17000},
+            {item = 'Bow', price = "8,000 [[Dark Chocolate Coin]]s"};
+        },
+        buys = {},
+    },
+}
+"""
+
+
+class TestLuaData(unittest.TestCase):
+    def test_parse_module(self):
+        data = parse_lua_data(MODULE_CONTENT)
+
+        self.assertEqual(
+            {
+                "A Sweaty Cyclops": {
+                    "sells": [
+                        {"item": "Giant Sword", "price": 17000},
+                        {"item": "Bow", "price": "8,000 [[Dark Chocolate Coin]]s"},
+                    ],
+                    "buys": {},
+                },
+            },
+            data,
+        )
+
+    def test_parse_literals(self):
+        data = parse_lua_data(r"return {1, -2.5, 0x10, 1e2, true, false, 'a\'b\n', [==[long ]] string]==]}")
+
+        self.assertEqual([1, -2.5, 16, 100.0, True, False, "a'b\n", "long ]] string"], data)
+
+    def test_parse_mixed_keys(self):
+        data = parse_lua_data("return {[2] = 'b', [1] = 'a', name = 'c', skipped = nil}")
+
+        self.assertEqual({2: "b", 1: "a", "name": "c"}, data)
+
+    def test_code_is_rejected(self):
+        for source in (
+            "local price = 1 return {price = price}",
+            "return {price = 1 + 1}",
+            "return {item = ('a'):upper()}",
+            "return {} extra",
+        ):
+            with self.subTest(source=source), self.assertRaises(LuaDataError):
+                parse_lua_data(source)
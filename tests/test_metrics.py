@@ -0,0 +1,82 @@
+import unittest
+
+from tibiawikisql.metrics import Counter, Gauge, Histogram, MetricsRegistry, escape_label_value
+
+
+class TestMetrics(unittest.TestCase):
+    def test_counter(self):
+        counter = Counter("requests_total", "Number of requests.", ("route",))
+
+        counter.inc(route="/a")
+        counter.inc(2, route="/a")
+        counter.inc(route="/b")
+
+        self.assertEqual(3, counter.get(route="/a"))
+        self.assertEqual(
+            '# HELP requests_total Number of requests.\n'
+            '# TYPE requests_total counter\n'
+            'requests_total{route="/a"} 3\n'
+            'requests_total{route="/b"} 1',
+            counter.render(),
+        )
+
+    def test_labels_must_match(self):
+        counter = Counter("requests_total", "Number of requests.", ("route",))
+
+        with self.assertRaises(ValueError):
+            counter.inc(status="200")
+
+    def test_gauge(self):
+        gauge = Gauge("connections", "Open connections.")
+
+        gauge.inc()
+        gauge.inc()
+        gauge.dec()
+
+        self.assertEqual(1, gauge.get())
+        gauge.set(5)
+        self.assertIn("connections 5", gauge.render())
+
+    def test_gauge_function(self):
+        gauge = Gauge("ratio", "A ratio.", function=lambda: 0.25)
+        labeled = Gauge("info", "Info.", ("version",), function=lambda: {("1.0.0",): 1})
+
+        self.assertIn("ratio 0.25", gauge.render())
+        self.assertIn('info{version="1.0.0"} 1', labeled.render())
+
+    def test_histogram(self):
+        histogram = Histogram("duration_seconds", "Duration.", buckets=(0.1, 1))
+
+        histogram.observe(0.05)
+        histogram.observe(0.1)
+        histogram.observe(0.5)
+        histogram.observe(3)
+
+        lines = histogram.render().splitlines()[2:]
+        self.assertEqual(
+            [
+                'duration_seconds_bucket{le="0.1"} 2',
+                'duration_seconds_bucket{le="1"} 3',
+                'duration_seconds_bucket{le="+Inf"} 4',
+                "duration_seconds_sum 3.65",
+                "duration_seconds_count 4",
+            ],
+            lines,
+        )
+
+    def test_escape_label_value(self):
+        self.assertEqual(r'a\"b\\c\nd', escape_label_value('a"b\\c\nd'))
+
+    def test_registry(self):
+        registry = MetricsRegistry()
+        counter = registry.counter("requests_total", "Number of requests.")
+        registry.gauge("connections", "Open connections.", function=lambda: 2)
+        counter.inc()
+
+        rendered = registry.render()
+
+        self.assertTrue(rendered.endswith("\n"))
+        self.assertIn("requests_total 1\n", rendered)
+        self.assertIn("connections 2\n", rendered)
+        with self.assertRaises(ValueError):
+            registry.counter("requests_total", "Duplicated.")
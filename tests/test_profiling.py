@@ -0,0 +1,85 @@
+import os
+import pstats
+import sys
+import tempfile
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from tibiawikisql.profiling import StageProfiler, collapse_stack
+
+
+def busy_stage(duration: float) -> str:
+    end = time.perf_counter() + duration
+    while time.perf_counter() < end:
+        pass
+    return "done"
+
+
+class TestProfiling(unittest.TestCase):
+    def test_collapse_stack_starts_below_root(self):
+        def inner() -> str | None:
+            return collapse_stack(sys._getframe(), root)
+
+        def middle() -> str | None:
+            return inner()
+
+        root = self.test_collapse_stack_starts_below_root.__code__
+
+        labels = middle().split(";")
+
+        self.assertEqual(2, len(labels))
+        self.assertTrue(labels[0].endswith("middle"))
+        self.assertTrue(labels[1].endswith("inner"))
+
+    def test_collapse_stack_without_root_running(self):
+        self.assertIsNone(collapse_stack(sys._getframe(), busy_stage.__code__))
+
+    def test_run_writes_profiles(self):
+        with tempfile.TemporaryDirectory() as directory:
+            profiler = StageProfiler(os.path.join(directory, "profiles"), sample_interval=0.001)
+
+            result = profiler.run("items", busy_stage, 0.05)
+
+            pstats_path, collapsed_path = profiler.get_paths("items")
+            stats = pstats.Stats(pstats_path)
+            with open(collapsed_path, encoding="utf-8") as f:
+                lines = f.read().splitlines()
+
+        self.assertEqual("done", result)
+        self.assertIn("busy_stage", {function for _, _, function in stats.stats})
+        self.assertTrue(lines)
+        for line in lines:
+            stack, count = line.rsplit(" ", 1)
+            self.assertEqual("tests.test_profiling:busy_stage", stack.split(";")[0])
+            self.assertGreater(int(count), 0)
+
+    def test_run_samples_threads_started_by_the_stage(self):
+        def threaded_stage() -> str:
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                return executor.submit(busy_stage, 0.05).result()
+
+        with tempfile.TemporaryDirectory() as directory:
+            profiler = StageProfiler(directory, sample_interval=0.001)
+
+            result = profiler.run("images", threaded_stage)
+
+            with open(profiler.get_paths("images")[1], encoding="utf-8") as f:
+                stacks = [line.rsplit(" ", 1)[0] for line in f.read().splitlines()]
+
+        self.assertEqual("done", result)
+        worker_stacks = [stack for stack in stacks if stack.endswith("tests.test_profiling:busy_stage")]
+        self.assertTrue(worker_stacks)
+        self.assertTrue(all(stack.startswith("threading:") for stack in worker_stacks))
+
+    def test_run_writes_profiles_if_stage_fails(self):
+        def failing_stage() -> None:
+            raise ValueError
+
+        with tempfile.TemporaryDirectory() as directory:
+            profiler = StageProfiler(directory)
+
+            with self.assertRaises(ValueError):
+                profiler.run("items", failing_stage)
+
+            self.assertTrue(all(os.path.exists(path) for path in profiler.get_paths("items")))
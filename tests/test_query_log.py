@@ -0,0 +1,121 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from click.testing import CliRunner
+
+from tibiawikisql import __main__ as cli_module
+from tibiawikisql.explain import PlanStep, collect_query_shapes, explain_query_plan
+from tibiawikisql.query_log import QueryLog, query_log
+from tibiawikisql.schema import CreatureDropTable, ItemTable, create_tables
+
+
+def insert_sample_articles(conn: sqlite3.Connection):
+    conn.execute(
+        "INSERT INTO item(article_id, title, name, status, timestamp) "
+        "VALUES(1, 'Fire Sword', 'fire sword', 'active', '2024-01-01T00:00:00+00:00')",
+    )
+    conn.execute(
+        "INSERT INTO creature(article_id, title, name, is_boss, status, timestamp) "
+        "VALUES(2, 'Dragon', 'Dragon', 0, 'active', '2024-01-01T00:00:00+00:00')",
+    )
+    conn.execute("INSERT INTO creature_drop(creature_id, item_id, min, max) VALUES(2, 1, 0, 1)")
+    conn.commit()
+
+
+class TestQueryLog(unittest.TestCase):
+    def test_oldest_records_are_discarded(self):
+        log = QueryLog(2, enabled=True)
+
+        log.record("item", "SELECT 1", (), 0.1, 1)
+        log.record("item", "SELECT 2", (), 0.1, 1)
+        log.record("item", "SELECT 3", (), 0.1, 1)
+
+        self.assertEqual(["SELECT 2", "SELECT 3"], [record.sql for record in log.get_records()])
+
+    def test_shapes_are_sorted_by_total_time(self):
+        log = QueryLog()
+
+        log.record("item", "SELECT a", (1,), 0.1, 1)
+        log.record("npc", "SELECT b", (1,), 0.3, 0)
+        log.record("item", "SELECT a", (2,), 0.3, 2)
+
+        shapes = log.get_shapes()
+
+        self.assertEqual(["SELECT a", "SELECT b"], [shape.sql for shape in shapes])
+        self.assertEqual(2, shapes[0].count)
+        self.assertEqual(3, shapes[0].rows)
+        self.assertAlmostEqual(0.2, shapes[0].mean_time)
+        self.assertAlmostEqual(0.3, shapes[0].max_time)
+        self.assertEqual((2,), shapes[0].parameters)
+
+
+class TestTableInstrumentation(unittest.TestCase):
+    def setUp(self):
+        self.conn = sqlite3.connect(":memory:")
+        create_tables(self.conn)
+        insert_sample_articles(self.conn)
+        query_log.clear()
+
+    def tearDown(self):
+        query_log.enabled = False
+        query_log.clear()
+
+    def test_lookups_are_not_recorded_by_default(self):
+        ItemTable.get_one_by_field(self.conn, "title", "Fire Sword")
+
+        self.assertEqual(0, len(query_log))
+
+    def test_lookups_are_recorded_with_placeholders(self):
+        query_log.enabled = True
+
+        row = ItemTable.get_one_by_field(self.conn, "title", "Fire Sword")
+        rows = CreatureDropTable.get_by_item_id(self.conn, 1)
+
+        self.assertEqual("Fire Sword", row["title"])
+        self.assertEqual("Dragon", rows[0]["creature_title"])
+        item_record, drop_record = query_log.get_records()
+        self.assertEqual("item", item_record.table)
+        self.assertIn('"title"=?', item_record.sql)
+        self.assertEqual(("Fire Sword",), item_record.parameters)
+        self.assertEqual(1, item_record.rows)
+        self.assertEqual("creature_drop", drop_record.table)
+        self.assertIn("JOIN", drop_record.sql)
+        self.assertEqual(1, drop_record.rows)
+
+
+class TestExplain(unittest.TestCase):
+    def setUp(self):
+        self.conn = sqlite3.connect(":memory:")
+        create_tables(self.conn)
+        insert_sample_articles(self.conn)
+
+    def test_full_scans_are_detected(self):
+        steps = explain_query_plan(self.conn, "SELECT * FROM item WHERE lower(title) = ?", ("Fire Sword",))
+
+        self.assertTrue(any(step.is_full_scan for step in steps))
+        self.assertFalse(PlanStep(2, 0, "SEARCH item USING INDEX item_title_idx (title=?)").is_full_scan)
+
+    def test_collect_query_shapes_runs_model_lookups(self):
+        shapes = collect_query_shapes(self.conn)
+
+        tables = {shape.table for shape in shapes}
+        self.assertIn("item", tables)
+        self.assertIn("creature_drop", tables)
+        self.assertFalse(query_log.enabled)
+        self.assertEqual(0, len(query_log))
+
+    def test_explain_command(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "tibiawiki.db")
+            with sqlite3.connect(path) as conn:
+                create_tables(conn)
+                insert_sample_articles(conn)
+            conn.close()
+
+            result = CliRunner().invoke(cli_module.cli, ["explain", "--db-name", path])
+
+        self.assertEqual(0, result.exit_code, result.output)
+        self.assertIn("creature_drop", result.output)
+        self.assertIn("query shapes", result.output)
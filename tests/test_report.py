@@ -0,0 +1,76 @@
+import sqlite3
+import threading
+import unittest
+from unittest.mock import Mock
+
+from tibiawikisql.report import GenerationReport, StageReport, get_current_stage, get_database_size, record_response
+
+
+class TestReport(unittest.TestCase):
+    def test_stage_is_current_while_running(self):
+        report = GenerationReport("1.0.0")
+
+        with report.stage("items", "category") as stage:
+            self.assertIs(stage, get_current_stage())
+        self.assertIsNone(get_current_stage())
+        self.assertEqual([stage], report.stages)
+        self.assertGreater(stage.wall_time, 0)
+
+    def test_responses_are_counted_towards_current_stage(self):
+        report = GenerationReport("1.0.0")
+
+        record_response(Mock(content=b"ignored"))
+        with report.stage("items", "category") as stage:
+            record_response(Mock(content=b"abc"))
+            record_response(Mock(content=b"defgh"))
+
+        self.assertEqual(2, stage.http_requests)
+        self.assertEqual(8, stage.http_bytes)
+
+    def test_stage_is_not_current_in_other_threads(self):
+        report = GenerationReport("1.0.0")
+        seen = []
+
+        with report.stage("items", "category"):
+            thread = threading.Thread(target=lambda: seen.append(get_current_stage()))
+            thread.start()
+            thread.join()
+
+        self.assertEqual([None], seen)
+
+    def test_stage_measures_database_size(self):
+        conn = sqlite3.connect(":memory:")
+        conn.execute("CREATE TABLE test (value TEXT)")
+        report = GenerationReport("1.0.0")
+
+        with report.stage("items", "category", conn) as stage:
+            pass
+
+        self.assertEqual(get_database_size(conn), stage.db_size)
+        self.assertGreater(stage.db_size, 0)
+
+    def test_failed_stage_is_reported(self):
+        report = GenerationReport("1.0.0")
+
+        with self.assertRaises(ValueError), report.stage("items", "category"):
+            raise ValueError
+
+        self.assertEqual(["items"], [stage.name for stage in report.stages])
+
+    def test_articles_per_second(self):
+        stage = StageReport("items", "category", wall_time=2.0, articles=10)
+
+        self.assertEqual(5.0, stage.articles_per_second)
+        self.assertIsNone(StageReport("images", "task", wall_time=2.0).articles_per_second)
+
+    def test_to_dict(self):
+        report = GenerationReport("1.0.0", jobs=2, wall_time=1.23456)
+        report.stages.append(StageReport("items", "category", wall_time=0.5, articles=1, parse_errors=1))
+
+        data = report.to_dict()
+
+        self.assertEqual("1.0.0", data["version"])
+        self.assertEqual(2, data["jobs"])
+        self.assertEqual(1.235, data["wall_time"])
+        self.assertEqual(2.0, data["stages"][0]["articles_per_second"])
+        self.assertEqual(1, data["stages"][0]["parse_errors"])
@@ -0,0 +1,187 @@
+import sqlite3
+import threading
+import unittest
+
+from tibiawikisql.schema import ImageTable, ItemTable
+from tibiawikisql.scheduling import Job, JobTiming, get_critical_path, run_atomically, run_jobs
+from tibiawikisql.tasks.images import ImageWriter
+
+
+class TestRunJobs(unittest.TestCase):
+    def setUp(self):
+        self.conn = sqlite3.connect(":memory:")
+        self.conn.execute("CREATE TABLE log(name TEXT)")
+
+    def tearDown(self):
+        self.conn.close()
+
+    def log(self, name: str) -> Job:
+        return Job(name, lambda conn: conn.execute("INSERT INTO log(name) VALUES(?)", (name,)))
+
+    def test_dependencies_run_first(self):
+        jobs = [
+            Job("c", self.log("c").callback, dependencies=("a", "b")),
+            Job("b", self.log("b").callback, dependencies=("a",)),
+            self.log("a"),
+        ]
+        for workers in (1, 4):
+            with self.subTest(workers=workers):
+                self.conn.execute("DELETE FROM log")
+
+                timings = run_jobs(self.conn, jobs, workers=workers)
+
+                self.assertEqual(["a", "b", "c"], [row[0] for row in self.conn.execute("SELECT name FROM log")])
+                self.assertEqual(["a", "b", "c"], [timing.name for timing in timings])
+
+    def test_unscheduled_dependencies_are_ignored(self):
+        run_jobs(self.conn, [Job("b", self.log("b").callback, dependencies=("a",))], workers=2)
+
+        self.assertEqual([("b",)], self.conn.execute("SELECT name FROM log").fetchall())
+
+    def test_independent_jobs_run_concurrently(self):
+        barrier = threading.Barrier(2, timeout=5)
+        jobs = [Job("a", lambda _conn: barrier.wait()), Job("b", lambda _conn: barrier.wait())]
+
+        run_jobs(self.conn, jobs, workers=2)
+
+        self.assertFalse(barrier.broken)
+
+    def test_statements_are_run_by_the_calling_thread(self):
+        self.conn.executescript(ItemTable.get_create_table_statement())
+
+        def insert_and_read(conn: sqlite3.Connection) -> None:
+            with conn:
+                conn.execute("INSERT INTO item(article_id, title, timestamp) VALUES(1, 'Fire Sword', '')")
+            row = ItemTable.get_one_by_field(conn, "title", "Fire Sword")
+            conn.execute("INSERT INTO log(name) VALUES(?)", (row["title"],))
+            self.assertEqual(1, conn.execute("SELECT COUNT(*) FROM log").fetchone()[0])
+
+        run_jobs(self.conn, [Job("a", insert_and_read)], workers=2)
+
+        self.assertEqual([("Fire Sword",)], self.conn.execute("SELECT name FROM log").fetchall())
+
+    def test_failed_job_stops_dependents(self):
+        def fail(_conn: sqlite3.Connection) -> None:
+            msg = "failed"
+            raise RuntimeError(msg)
+
+        jobs = [Job("a", fail), Job("b", self.log("b").callback, dependencies=("a",))]
+        for workers in (1, 2):
+            with self.subTest(workers=workers), self.assertRaises(RuntimeError):
+                run_jobs(self.conn, jobs, workers=workers)
+
+        self.assertEqual([], self.conn.execute("SELECT name FROM log").fetchall())
+
+    def test_failed_job_keeps_changes_of_other_jobs(self):
+        inserted = threading.Event()
+        rolled_back = threading.Event()
+
+        def insert_twice(conn: sqlite3.Connection) -> None:
+            conn.execute("INSERT INTO log(name) VALUES('1')")
+            inserted.set()
+            rolled_back.wait(5)
+            conn.execute("INSERT INTO log(name) VALUES('2')")
+            conn.commit()
+
+        def insert_and_fail(conn: sqlite3.Connection) -> None:
+            inserted.wait(5)
+            try:
+                with conn:
+                    conn.execute("INSERT INTO log(name) VALUES('99')")
+                    msg = "failed"
+                    raise RuntimeError(msg)
+            finally:
+                rolled_back.set()
+
+        with self.assertRaises(RuntimeError):
+            run_jobs(self.conn, [Job("a", insert_twice), Job("b", insert_and_fail)], workers=2)
+
+        self.assertEqual(["1", "2"], [row[0] for row in self.conn.execute("SELECT name FROM log ORDER BY name")])
+
+    def test_transaction_blocks_only_contain_the_jobs_statements(self):
+        entered = threading.Event()
+
+        def insert_and_fail(conn: sqlite3.Connection) -> None:
+            with conn:
+                conn.execute("INSERT INTO log(name) VALUES('a')")
+                entered.set()
+                msg = "failed"
+                raise RuntimeError(msg)
+
+        def insert(conn: sqlite3.Connection) -> None:
+            entered.wait(5)
+            conn.execute("INSERT INTO log(name) VALUES('b')")
+
+        with self.assertRaises(RuntimeError):
+            run_jobs(self.conn, [Job("a", insert_and_fail), Job("b", insert)], workers=2)
+
+        self.assertEqual([("b",)], self.conn.execute("SELECT name FROM log").fetchall())
+        self.assertFalse(self.conn.in_transaction)
+
+    def test_other_jobs_keep_writing_while_images_are_fetched(self):
+        self.conn.executescript(ImageTable.get_create_table_statement())
+        self.conn.executescript(ItemTable.get_create_table_statement())
+        self.conn.execute("INSERT INTO item(article_id, title, timestamp) VALUES(1, 'Fire Sword', '')")
+        image_written = threading.Event()
+        loot_written = threading.Event()
+        events = []
+
+        def fetch_images(conn: sqlite3.Connection) -> None:
+            writer = ImageWriter(conn, "UPDATE item SET image_hash = ? WHERE title = ?", batch_size=1)
+            writer.add(b"GIF89a", "Fire Sword")
+            image_written.set()
+            # The rest of the images are still being fetched.
+            loot_written.wait(5)
+            events.append("images done")
+
+        def write_loot(conn: sqlite3.Connection) -> None:
+            image_written.wait(5)
+            with conn:
+                conn.execute("INSERT INTO log(name) VALUES('loot')")
+            events.append("loot written")
+            loot_written.set()
+
+        run_jobs(self.conn, [Job("images", fetch_images), Job("loot", write_loot)], workers=2)
+
+        self.assertEqual(["loot written", "images done"], events)
+        self.assertEqual(1, self.conn.execute("SELECT COUNT(*) FROM image").fetchone()[0])
+
+    def test_run_atomically_uses_its_own_transaction(self):
+        def insert_and_fail(conn: sqlite3.Connection) -> None:
+            conn.execute("INSERT INTO log(name) VALUES('b')")
+            msg = "failed"
+            raise RuntimeError(msg)
+
+        def job(conn: sqlite3.Connection) -> None:
+            run_atomically(conn, lambda c: c.execute("INSERT INTO log(name) VALUES('a')"))
+            with self.assertRaises(RuntimeError):
+                run_atomically(conn, insert_and_fail)
+
+        for workers in (1, 2):
+            with self.subTest(workers=workers):
+                self.conn.execute("DELETE FROM log")
+
+                run_jobs(self.conn, [Job("a", job)], workers=workers)
+
+                self.assertEqual([("a",)], self.conn.execute("SELECT name FROM log").fetchall())
+
+    def test_circular_dependencies_are_rejected(self):
+        jobs = [Job("a", self.log("a").callback, dependencies=("b",)), Job("b", self.log("b").callback, ("a",))]
+
+        with self.assertRaises(ValueError):
+            run_jobs(self.conn, jobs, workers=2)
+
+
+class TestCriticalPath(unittest.TestCase):
+    def test_follows_last_finished_dependency(self):
+        timings = [
+            JobTiming("items", 0, 10),
+            JobTiming("spells", 0, 2),
+            JobTiming("creatures", 10, 20, ("items",)),
+            JobTiming("item_offers", 10, 15, ("items",)),
+            JobTiming("images", 20, 50, ("spells", "creatures")),
+        ]
+
+        path = get_critical_path(timings)
+
+        self.assertEqual(["items", "creatures", "images"], [timing.name for timing in path])
@@ -0,0 +1,75 @@
+import datetime
+import sqlite3
+import unittest
+from unittest.mock import Mock
+
+from tibiawikisql import generation as generation_module
+from tibiawikisql.models import SearchResult
+from tibiawikisql.models.search import build_match_query
+from tibiawikisql.schema import AchievementTable, CreatureTable, ItemTable, SearchIndexTable
+from tibiawikisql.tasks.search_index import generate_search_index
+
+TIMESTAMP = datetime.datetime.fromisoformat("2024-01-01T00:00:00+00:00")
+
+
+class TestSearchIndex(unittest.TestCase):
+    def setUp(self):
+        self.conn = sqlite3.connect(":memory:")
+        for table in (AchievementTable, CreatureTable, ItemTable, SearchIndexTable):
+            self.conn.executescript(table.get_create_table_statement())
+        ItemTable.insert(self.conn, article_id=1, title="Fire Sword", name="fire sword", timestamp=TIMESTAMP)
+        ItemTable.insert(self.conn, article_id=2, title="Fire Axe", name="fire axe", timestamp=TIMESTAMP)
+        CreatureTable.insert(self.conn, article_id=3, title="Fire Devil", name="fire devil", timestamp=TIMESTAMP)
+        AchievementTable.insert(
+            self.conn,
+            article_id=4,
+            title="Firefighter",
+            name="Firefighter",
+            description="You have extinguished a sword of flames.",
+            timestamp=TIMESTAMP,
+        )
+        generate_search_index(
+            self.conn,
+            categories=generation_module.CATEGORIES,
+            enabled_categories={"achievements", "creatures", "items"},
+            timed=generation_module.timed,
+            echo=Mock(),
+        )
+
+    def tearDown(self):
+        self.conn.close()
+
+    def test_create_statement_is_virtual(self):
+        statement = SearchIndexTable.get_create_table_statement()
+
+        self.assertTrue(statement.startswith("CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5("))
+        self.assertIn("type UNINDEXED", statement)
+        self.assertIn("prefix='2 3'", statement)
+
+    def test_build_match_query(self):
+        self.assertEqual('"fire"* "sw"*', build_match_query("fire sw"))
+        self.assertEqual('"demon"* "OR"*', build_match_query('demon" OR'))
+        self.assertIsNone(build_match_query("  -- "))
+
+    def test_search_returns_typed_results(self):
+        results = SearchResult.search(self.conn, "fire")
+
+        self.assertEqual({"Fire Sword", "Fire Axe", "Fire Devil", "Firefighter"}, {r.title for r in results})
+        types = {r.title: r.type for r in results}
+        self.assertEqual("items", types["Fire Sword"])
+        self.assertEqual("creatures", types["Fire Devil"])
+
+    def test_search_ranks_title_matches_first(self):
+        results = SearchResult.search(self.conn, "sword")
+
+        self.assertEqual(["Fire Sword", "Firefighter"], [r.title for r in results])
+
+    def test_search_filters_by_type(self):
+        results = SearchResult.search(self.conn, "fire", types=["creatures"])
+
+        self.assertEqual([3], [r.article_id for r in results])
+
+    def test_search_prefix(self):
+        results = SearchResult.search(self.conn, "dev")
+
+        self.assertEqual(["Fire Devil"], [r.title for r in results])
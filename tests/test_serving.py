@@ -0,0 +1,223 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest.mock import Mock
+
+from tibiawikisql.schema import DatabaseInfoTable
+from tibiawikisql.serving import DatabaseGeneration, InstrumentedConnection, RangeNotSatisfiableError, \
+    ResponseCache, compute_etag, etag_matches, guess_image_type, iter_blob, parse_range, read_blob
+
+
+class TestResponseCache(unittest.TestCase):
+    def test_get_and_put(self):
+        cache = ResponseCache(100)
+
+        self.assertIsNone(cache.get("a"))
+        cache.put("a", b"123")
+
+        self.assertEqual(b"123", cache.get("a"))
+        self.assertEqual(1, cache.hits)
+        self.assertEqual(1, cache.misses)
+        self.assertEqual(3, cache.size)
+
+    def test_evicts_least_recently_used_by_size(self):
+        cache = ResponseCache(10)
+        cache.put("a", b"1234")
+        cache.put("b", b"1234")
+        cache.get("a")
+        cache.put("c", b"1234")
+
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(b"1234", cache.get("a"))
+        self.assertEqual(b"1234", cache.get("c"))
+        self.assertEqual(8, cache.size)
+
+    def test_evicts_by_entries(self):
+        cache = ResponseCache(100, max_entries=1)
+        cache.put("a", b"1")
+        cache.put("b", b"2")
+
+        self.assertEqual(1, len(cache))
+        self.assertIsNone(cache.get("a"))
+
+    def test_no_entries_allowed(self):
+        cache = ResponseCache(100, max_entries=0)
+        cache.put("a", b"1")
+
+        self.assertEqual(0, len(cache))
+        self.assertEqual(0, cache.size)
+
+    def test_replacing_value_updates_size(self):
+        cache = ResponseCache(100)
+        cache.put("a", b"1234")
+        cache.put("a", b"12")
+
+        self.assertEqual(2, cache.size)
+
+    def test_values_bigger_than_limit_are_not_cached(self):
+        cache = ResponseCache(2)
+        cache.put("a", b"123")
+
+        self.assertEqual(0, len(cache))
+
+    def test_clear(self):
+        cache = ResponseCache(100)
+        cache.put("a", b"1")
+        cache.clear()
+
+        self.assertEqual(0, len(cache))
+        self.assertEqual(0, cache.size)
+
+
+class TestEtag(unittest.TestCase):
+    def test_compute_etag_depends_on_generation_and_path(self):
+        etag = compute_etag("1", "/db/items/Fire Sword")
+
+        self.assertTrue(etag.startswith('"') and etag.endswith('"'))
+        self.assertEqual(etag, compute_etag("1", "/db/items/Fire Sword"))
+        self.assertNotEqual(etag, compute_etag("2", "/db/items/Fire Sword"))
+        self.assertNotEqual(etag, compute_etag("1", "/db/items/Fire Axe"))
+
+    def test_etag_matches(self):
+        self.assertTrue(etag_matches('"a"', '"a"'))
+        self.assertTrue(etag_matches('"b", W/"a"', '"a"'))
+        self.assertTrue(etag_matches("*", '"a"'))
+        self.assertFalse(etag_matches('"b"', '"a"'))
+        self.assertFalse(etag_matches(None, '"a"'))
+
+
+class TestDatabaseGeneration(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        self.write_timestamp("100")
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def write_timestamp(self, timestamp: str, version: str = "1.0.0"):
+        conn = sqlite3.connect(self.path)
+        conn.execute(DatabaseInfoTable.get_drop_statement())
+        conn.executescript(DatabaseInfoTable.get_create_table_statement())
+        DatabaseInfoTable.insert(conn, key="timestamp", value=timestamp)
+        DatabaseInfoTable.insert(conn, key="version", value=version)
+        conn.commit()
+        conn.close()
+
+    def test_detects_replaced_database(self):
+        on_change = Mock()
+        generation = DatabaseGeneration(self.path, on_change=on_change)
+
+        self.assertEqual("100", generation.check())
+        self.assertEqual("100", generation.check())
+        on_change.assert_called_once_with()
+
+        self.write_timestamp("200")
+        os.utime(self.path, ns=(0, 1))
+
+        self.assertEqual("200", generation.check())
+        self.assertEqual(2, on_change.call_count)
+
+    def test_missing_database(self):
+        generation = DatabaseGeneration(self.path + ".missing")
+
+        self.assertEqual("", generation.check())
+
+    def test_version_is_updated(self):
+        generation = DatabaseGeneration(self.path)
+        generation.check()
+        self.assertEqual("1.0.0", generation.version)
+
+        self.write_timestamp("200", "2.0.0")
+        os.utime(self.path, ns=(0, 1))
+        generation.check()
+
+        self.assertEqual("2.0.0", generation.version)
+
+
+class TestInstrumentedConnection(unittest.TestCase):
+    def setUp(self):
+        self.conn = sqlite3.connect(":memory:", factory=InstrumentedConnection)
+
+    def tearDown(self):
+        self.conn.close()
+
+    def test_counts_statements(self):
+        self.conn.execute("CREATE TABLE test (value INTEGER)")
+        self.conn.executemany("INSERT INTO test VALUES(?)", [(1,), (2,)])
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT value FROM test")
+
+        self.assertEqual([(1,), (2,)], cursor.fetchall())
+        self.assertEqual(3, self.conn.query_count)
+        self.assertGreater(self.conn.query_time, 0)
+
+    def test_counts_failed_statements(self):
+        with self.assertRaises(sqlite3.OperationalError):
+            self.conn.execute("SELECT * FROM missing")
+
+        self.assertEqual(1, self.conn.query_count)
+
+    def test_row_factory(self):
+        self.conn.row_factory = sqlite3.Row
+
+        row = self.conn.execute("SELECT 1 AS value").fetchone()
+
+        self.assertEqual(1, row["value"])
+
+
+class TestRanges(unittest.TestCase):
+    def test_parse_range(self):
+        self.assertEqual((0, 9), parse_range("bytes=0-9", 100))
+        self.assertEqual((10, 99), parse_range("bytes=10-", 100))
+        self.assertEqual((90, 99), parse_range("bytes=-10", 100))
+        self.assertEqual((0, 99), parse_range("bytes=-500", 100))
+        self.assertEqual((50, 99), parse_range("bytes=50-500", 100))
+
+    def test_parse_range_ignored(self):
+        self.assertIsNone(parse_range(None, 100))
+        self.assertIsNone(parse_range("items=0-9", 100))
+        self.assertIsNone(parse_range("bytes=0-9,20-29", 100))
+        self.assertIsNone(parse_range("bytes=9-0", 100))
+        self.assertIsNone(parse_range("bytes=a-b", 100))
+
+    def test_parse_range_not_satisfiable(self):
+        with self.assertRaises(RangeNotSatisfiableError):
+            parse_range("bytes=100-", 100)
+        with self.assertRaises(RangeNotSatisfiableError):
+            parse_range("bytes=-0", 100)
+
+    def test_guess_image_type(self):
+        self.assertEqual("image/gif", guess_image_type(b"GIF89a..."))
+        self.assertEqual("image/png", guess_image_type(b"\x89PNG\r\n\x1a\n..."))
+        self.assertEqual("image/webp", guess_image_type(b"RIFF\x00\x00\x00\x00WEBPVP8"))
+        self.assertEqual("application/octet-stream", guess_image_type(b"hello"))
+
+
+class TestBlobs(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        self.data = bytes(range(256)) * 10
+        conn = sqlite3.connect(self.path)
+        conn.execute("CREATE TABLE map (z INTEGER PRIMARY KEY, image BLOB)")
+        conn.execute("INSERT INTO map(z, image) VALUES(7, ?)", (self.data,))
+        conn.commit()
+        conn.close()
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_read_blob(self):
+        conn = sqlite3.connect(self.path)
+        try:
+            self.assertEqual(self.data[100:110], read_blob(conn, "map", "image", 7, offset=100, length=10))
+        finally:
+            conn.close()
+
+    def test_iter_blob(self):
+        chunks = list(iter_blob(self.path, "map", "image", 7, start=10, end=1009, chunk_size=300))
+
+        self.assertEqual([300, 300, 300, 100], [len(c) for c in chunks])
+        self.assertEqual(self.data[10:1010], b"".join(chunks))
@@ -0,0 +1,137 @@
+import datetime
+import sqlite3
+import unittest
+from unittest.mock import Mock
+
+from tibiawikisql import generation as generation_module
+from tibiawikisql.explain import explain_query_plan
+from tibiawikisql.models import CreatureLootValue, ItemDropSource, ItemPrice
+from tibiawikisql.query_log import query_log
+from tibiawikisql.schema import (
+    CreatureDropTable,
+    CreatureTable,
+    ItemTable,
+    NpcBuyingTable,
+    NpcSellingTable,
+    NpcTable,
+    create_tables,
+)
+from tibiawikisql.tasks.summaries import generate_summaries
+
+TIMESTAMP = datetime.datetime.fromisoformat("2024-01-01T00:00:00+00:00")
+
+GOLD_COIN, PLATINUM_COIN, FIRE_SWORD, DRAGON_SCALE, RUSTY_ARMOR = 1, 2, 3, 4, 5
+DRAGON, DRAGON_LORD, RAT = 10, 11, 12
+BAMBI, ULRIK, NAJI = 20, 21, 22
+
+
+class TestSummaries(unittest.TestCase):
+    def setUp(self):
+        self.conn = sqlite3.connect(":memory:")
+        create_tables(self.conn)
+        items = [
+            (GOLD_COIN, "Gold Coin", None),
+            (PLATINUM_COIN, "Platinum Coin", None),
+            (FIRE_SWORD, "Fire Sword", 4000),
+            (DRAGON_SCALE, "Dragon Scale", None),
+            (RUSTY_ARMOR, "Rusty Armor", None),
+        ]
+        for article_id, title, value_sell in items:
+            ItemTable.insert(
+                self.conn,
+                article_id=article_id,
+                title=title,
+                name=title.lower(),
+                value_sell=value_sell,
+                timestamp=TIMESTAMP,
+            )
+        for article_id, title in ((DRAGON, "Dragon"), (DRAGON_LORD, "Dragon Lord"), (RAT, "Rat")):
+            CreatureTable.insert(self.conn, article_id=article_id, title=title, name=title, timestamp=TIMESTAMP)
+        for article_id, title in ((BAMBI, "Bambi Bonecrusher"), (ULRIK, "Ulrik"), (NAJI, "Naji")):
+            NpcTable.insert(self.conn, article_id=article_id, title=title, name=title, timestamp=TIMESTAMP)
+        offers = [
+            (NpcBuyingTable, BAMBI, FIRE_SWORD, 1000, GOLD_COIN),
+            (NpcBuyingTable, ULRIK, FIRE_SWORD, 1000, GOLD_COIN),
+            (NpcBuyingTable, NAJI, FIRE_SWORD, 500, GOLD_COIN),
+            (NpcBuyingTable, NAJI, DRAGON_SCALE, 40, GOLD_COIN),
+            (NpcSellingTable, NAJI, FIRE_SWORD, 8000, GOLD_COIN),
+            (NpcSellingTable, ULRIK, FIRE_SWORD, 90, PLATINUM_COIN),
+        ]
+        for table, npc_id, item_id, value, currency_id in offers:
+            table.insert(self.conn, npc_id=npc_id, item_id=item_id, value=value, currency_id=currency_id)
+        drops = [
+            (DRAGON, GOLD_COIN, 100.0, 0, 100),
+            (DRAGON, DRAGON_SCALE, 1.0, 1, 1),
+            (DRAGON, FIRE_SWORD, 0.5, 1, 1),
+            (DRAGON, RUSTY_ARMOR, 2.0, 1, 1),
+            (DRAGON_LORD, DRAGON_SCALE, 10.0, 1, 1),
+            (DRAGON_LORD, FIRE_SWORD, None, 1, 1),
+            (RAT, FIRE_SWORD, 0.5, 1, 1),
+        ]
+        for creature_id, item_id, chance, min_, max_ in drops:
+            CreatureDropTable.insert(
+                self.conn,
+                creature_id=creature_id,
+                item_id=item_id,
+                chance=chance,
+                min=min_,
+                max=max_,
+            )
+        generate_summaries(self.conn, timed=generation_module.timed, echo=Mock())
+
+    def tearDown(self):
+        query_log.enabled = False
+        query_log.clear()
+        self.conn.close()
+
+    def test_item_prices_have_the_best_offer_of_every_currency(self):
+        gold, platinum = ItemPrice.get_by_item_title(self.conn, "fire sword")
+
+        self.assertEqual(GOLD_COIN, gold.currency_id)
+        self.assertEqual(1000, gold.sell_price)
+        self.assertEqual("Bambi Bonecrusher", gold.sell_npc_title)
+        self.assertEqual(8000, gold.buy_price)
+        self.assertEqual(NAJI, gold.buy_npc_id)
+        self.assertEqual("Platinum Coin", platinum.currency_title)
+        self.assertIsNone(platinum.sell_price)
+        self.assertEqual(90, platinum.buy_price)
+        self.assertEqual([], ItemPrice.get_by_item_id(self.conn, RUSTY_ARMOR))
+
+    def test_drop_sources_are_ranked_by_chance(self):
+        sources = ItemDropSource.get_by_item_title(self.conn, "Fire Sword")
+
+        self.assertEqual(["Dragon", "Rat", "Dragon Lord"], [source.creature_title for source in sources])
+        self.assertEqual([1, 2, 3], [source.rank for source in sources])
+        self.assertIsNone(sources[-1].chance)
+        self.assertEqual(["Dragon Lord"], [s.creature_title for s in ItemDropSource.get_by_item_id(self.conn, 4, 1)])
+
+    def test_loot_values_count_priced_drops(self):
+        dragon = CreatureLootValue.get_by_creature_title(self.conn, "dragon")
+        dragon_lord = CreatureLootValue.get_by_creature_id(self.conn, DRAGON_LORD)
+
+        self.assertAlmostEqual(50 + 0.4 + 5, dragon.loot_value)
+        self.assertEqual(4, dragon.drop_count)
+        self.assertEqual(3, dragon.priced_drop_count)
+        self.assertAlmostEqual(4, dragon_lord.loot_value)
+        self.assertEqual(1, dragon_lord.priced_drop_count)
+        self.assertEqual(
+            ["Dragon", "Rat", "Dragon Lord"],
+            [creature.creature_title for creature in CreatureLootValue.get_most_valuable(self.conn)],
+        )
+
+    def test_lookups_use_an_index(self):
+        query_log.enabled = True
+
+        ItemPrice.get_by_item_title(self.conn, "Fire Sword")
+        ItemDropSource.get_by_item_title(self.conn, "Fire Sword")
+        ItemDropSource.get_by_item_id(self.conn, FIRE_SWORD)
+        CreatureLootValue.get_by_creature_title(self.conn, "Dragon")
+
+        for record in query_log.get_records():
+            with self.subTest(sql=record.sql):
+                steps = explain_query_plan(self.conn, record.sql, record.parameters)
+                self.assertFalse(any(step.is_full_scan for step in steps))
+                self.assertFalse(any("TEMP B-TREE" in step.detail for step in steps))
+
+    def test_task_is_optional(self):
+        self.assertIn("summaries", generation_module.get_optional_task_names())
@@ -0,0 +1,82 @@
+import datetime
+import sqlite3
+import unittest
+from unittest.mock import Mock
+
+from tests import load_resource
+from tibiawikisql import generation as generation_module
+from tibiawikisql.api import Article
+from tibiawikisql.database import CompressedText
+from tibiawikisql.models import Book, Update
+from tibiawikisql.parsers import BookParser, UpdateParser
+from tibiawikisql.schema import BookTable, CreatureTable, QuestTable, UpdateTable, create_tables
+from tibiawikisql.tasks.text_compression import compress_text_columns, get_compressed_text_columns
+
+TIMESTAMP = datetime.datetime.fromisoformat("2024-01-01T00:00:00+00:00")
+
+
+class TestTextCompression(unittest.TestCase):
+    def setUp(self):
+        self.conn = sqlite3.connect(":memory:")
+        create_tables(self.conn)
+        book_content = load_resource("content_book.txt")
+        update_content = load_resource("content_update.txt")
+        self.book = BookParser.from_article(
+            Article(article_id=1, title="Imperial Scroll", timestamp=TIMESTAMP, content=book_content),
+        )
+        self.update = UpdateParser.from_article(
+            Article(article_id=2, title="Updates/8.00", timestamp=TIMESTAMP, content=update_content),
+        )
+        self.book.insert(self.conn)
+        self.update.insert(self.conn)
+
+    def tearDown(self):
+        self.conn.close()
+
+    def compress(self, threshold: int):
+        compress_text_columns(self.conn, threshold=threshold, timed=generation_module.timed, echo=Mock())
+
+    def get_type(self, table: str, column: str):
+        return self.conn.execute(f"SELECT typeof({column}) FROM {table}").fetchone()[0]  # noqa: S608
+
+    def test_compressed_columns(self):
+        columns = {(table, column.name) for table, column in get_compressed_text_columns()}
+
+        self.assertEqual(
+            {
+                (BookTable, "text"),
+                (CreatureTable, "location"),
+                (QuestTable, "location"),
+                (UpdateTable, "summary"),
+                (UpdateTable, "changes"),
+            },
+            columns,
+        )
+
+    def test_long_values_are_compressed_and_read_back(self):
+        text_size = len(self.book.text.encode())
+
+        self.compress(text_size - 1)
+
+        self.assertEqual("blob", self.get_type("book", "text"))
+        self.assertEqual("text", self.get_type("game_update", "summary"))
+        self.assertEqual(self.book, Book.get_by_title(self.conn, "Imperial Scroll"))
+        self.assertEqual(self.update, Update.get_by_title(self.conn, "Updates/8.00"))
+
+    def test_short_values_are_kept_as_text(self):
+        self.compress(len(self.book.text.encode()))
+
+        self.assertEqual("text", self.get_type("book", "text"))
+
+    def test_compressing_again_leaves_compressed_values(self):
+        self.compress(0)
+        stored = self.conn.execute("SELECT text FROM book").fetchone()[0]
+
+        self.compress(0)
+
+        self.assertEqual(stored, self.conn.execute("SELECT text FROM book").fetchone()[0])
+        self.assertEqual(self.book.text, CompressedText.decompress(stored))
+        self.assertEqual(self.update, Update.get_by_title(self.conn, "Updates/8.00"))
+
+    def test_task_is_optional(self):
+        self.assertIn("compress_text", generation_module.get_optional_task_names())
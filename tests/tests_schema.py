@@ -2,8 +2,11 @@ import sqlite3
 import unittest
 import datetime
 
-from tibiawikisql.errors import InvalidColumnValueError
-from tibiawikisql.schema import AchievementTable
+from tibiawikisql.database import Column, Index, Integer, Table
+from tibiawikisql.errors import InvalidColumnValueError, SchemaError
+from tibiawikisql.explain import explain_query_plan
+from tibiawikisql.query_log import query_log
+from tibiawikisql.schema import AchievementTable, CreatureDropTable, NpcBuyingTable, QuestRewardTable, create_tables
 
 SAMPLE_ACHIEVEMENT_ROW = {
     "article_id": 2744,
@@ -68,3 +71,88 @@ class TestSchema(unittest.TestCase):
 
         self.assertIsNotNone(result)
         self.assertEqual(5, result["points"])
+
+
+class TestIndex(unittest.TestCase):
+    def test_composite_index_is_created(self):
+        statement = CreatureDropTable.get_create_table_statement()
+
+        self.assertIn(
+            "CREATE INDEX IF NOT EXISTS creature_drop_item_id_covering_idx ON creature_drop "
+            "(item_id, chance, creature_id, min, max);",
+            statement,
+        )
+
+    def test_unique_index_statement(self):
+        index = Index("first", "second", unique=True)
+        index.name = "sample_pair_idx"
+
+        statement = index.get_create_statement("sample")
+
+        self.assertEqual("CREATE UNIQUE INDEX IF NOT EXISTS sample_pair_idx ON sample (first, second);", statement)
+
+    def test_index_with_unknown_column(self):
+        with self.assertRaises(SchemaError):
+            class SampleTable(Table, table_name="sample"):
+                first = Column(Integer)
+
+                pair_idx = Index("first", "second")
+
+    def test_index_without_columns(self):
+        with self.assertRaises(SchemaError):
+            Index()
+
+
+class TestJoinedLookups(unittest.TestCase):
+    def setUp(self):
+        self.conn = sqlite3.connect(":memory:")
+        create_tables(self.conn)
+        self.conn.executemany(
+            "INSERT INTO item(article_id, title, status, timestamp) VALUES(?, ?, 'active', 0)",
+            [(1, "Fire Sword"), (2, "Gold Coin")],
+        )
+        self.conn.executemany(
+            "INSERT INTO creature(article_id, title, status, timestamp) VALUES(?, ?, 'active', 0)",
+            [(10, "Dragon"), (11, "Dragon Lord")],
+        )
+        self.conn.execute("INSERT INTO npc(article_id, title, status, timestamp) VALUES(20, 'Rashid', 'active', 0)")
+        self.conn.execute(
+            "INSERT INTO quest(article_id, title, status, timestamp) VALUES(30, 'Annihilator', 'active', 0)",
+        )
+        self.conn.executemany(
+            "INSERT INTO creature_drop(creature_id, item_id, chance, min, max) VALUES(?, ?, ?, 1, 1)",
+            [(10, 1, 0.5), (11, 1, 2.5), (10, 2, 90.0)],
+        )
+        self.conn.execute("INSERT INTO npc_offer_buy(npc_id, item_id, value, currency_id) VALUES(20, 1, 1000, 2)")
+        self.conn.execute("INSERT INTO quest_reward(quest_id, item_id) VALUES(30, 1)")
+
+    def tearDown(self):
+        query_log.enabled = False
+        query_log.clear()
+
+    def test_drops_are_sorted_by_chance(self):
+        by_item = CreatureDropTable.get_by_item_id(self.conn, 1)
+        by_creature = CreatureDropTable.get_by_creature_id(self.conn, 10)
+
+        self.assertEqual(["Dragon Lord", "Dragon"], [row["creature_title"] for row in by_item])
+        self.assertEqual(["Gold Coin", "Fire Sword"], [row["item_title"] for row in by_creature])
+
+    def test_lookups_use_covering_indexes(self):
+        lookups = [
+            (CreatureDropTable.get_by_item_id, 1, "creature_drop_item_id_covering_idx"),
+            (CreatureDropTable.get_by_creature_id, 10, "creature_drop_creature_id_covering_idx"),
+            (NpcBuyingTable.get_by_item_id, 1, "npc_offer_buy_item_id_covering_idx"),
+            (NpcBuyingTable.get_by_npc_id, 20, "npc_offer_buy_npc_id_covering_idx"),
+            (QuestRewardTable.get_list_by_item_id, 1, "quest_reward_item_id_covering_idx"),
+            (QuestRewardTable.get_list_by_quest_id, 30, "quest_reward_quest_id_covering_idx"),
+        ]
+        query_log.enabled = True
+
+        for lookup, value, index_name in lookups:
+            query_log.clear()
+            lookup(self.conn, value)
+            record = query_log.get_records()[-1]
+            with self.subTest(lookup=lookup.__qualname__):
+                steps = explain_query_plan(self.conn, record.sql, record.parameters)
+                self.assertIn(f"SEARCH {record.table} USING COVERING INDEX {index_name} ", steps[0].detail)
+                self.assertFalse(any("TEMP B-TREE" in step.detail for step in steps))
@@ -1,3 +1,4 @@
+import json
 import unittest
 from unittest.mock import MagicMock
 
@@ -59,3 +60,15 @@ class TestWikiApi(unittest.TestCase):
         self.assertEqual(image.file_name, titles[0])
         self.assertEqual(image.extension, ".gif")
         self.assertEqual(image.clean_name, "Golden Armor")
+
+    def test_resolve_images(self):
+        data = json.loads(load_resource("response_image_info.json"))
+        data["query"]["normalized"] = [{"from": "File:Golden_Shield.gif", "to": "File:Golden Shield.gif"}]
+        self.wiki_client.session.get = MagicMock()
+        self.wiki_client.session.get.return_value.text = json.dumps(data)
+        self.wiki_client.session.get.return_value.status_code = 200
+
+        resolved = dict(self.wiki_client.resolve_images(["Golden Armor.gif", "Golden_Shield.gif"]))
+
+        self.assertIsInstance(resolved["Golden Armor.gif"], Image)
+        self.assertIsNone(resolved["Golden_Shield.gif"])
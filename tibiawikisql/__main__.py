@@ -1,19 +1,64 @@
-"""Command line interface for tibiawiki-sql."""
+"""Command line interface for tibiawiki-sql.
+
+Modules are imported by the commands using them, so the CLI starts quickly, e.g. when showing the help or version.
+"""
 
 import sqlite3
+from collections.abc import Callable, Iterable
 
 import click
 import colorama
+from colorama import Fore, Style
 
-from tibiawikisql import __version__, generation
-from tibiawikisql.utils import timed
+from tibiawikisql import __version__
+from tibiawikisql.export import COLUMNAR_FORMATS, EXPORT_FORMATS
 
 DATABASE_FILE = "tibiawiki.db"
 PARSING_ERRORS_FILE = "parsing-errors.log"
+COLUMNAR_EXPORT_DIR = "export"
 
 colorama.init()
 
 
+class LazyChoice(click.Choice):
+    """A choice whose values are only loaded when needed, e.g. when validating a value or showing the help."""
+
+    def __init__(self, get_choices: Callable[[], Iterable[str]], case_sensitive: bool = True) -> None:
+        super().__init__((), case_sensitive=case_sensitive)
+        self.get_choices = get_choices
+        self._choices: tuple[str, ...] | None = None
+
+    @property
+    def choices(self) -> tuple[str, ...]:
+        if self._choices is None:
+            self._choices = tuple(self.get_choices())
+        return self._choices
+
+    @choices.setter
+    def choices(self, choices: Iterable[str]) -> None:
+        self._choices = tuple(choices)
+
+
+def get_category_names() -> list[str]:
+    from tibiawikisql.generation import CATEGORIES
+    return sorted(CATEGORIES)
+
+
+def get_optional_task_names() -> list[str]:
+    from tibiawikisql.generation import get_optional_task_names
+    return get_optional_task_names()
+
+
+def get_generation_jobs() -> int:
+    from tibiawikisql.generation import GENERATION_JOBS
+    return GENERATION_JOBS
+
+
+def get_article_types() -> list[str]:
+    from tibiawikisql.models import ARTICLE_MODELS
+    return sorted(ARTICLE_MODELS)
+
+
 @click.group(context_settings={"help_option_names": ["-h", "--help"]})
 @click.version_option(__version__, "-V", "--version")
 def cli() -> None:
@@ -40,11 +85,48 @@ def cli() -> None:
     "--skip-category",
     "skip_categories",
     multiple=True,
-    type=click.Choice(sorted(generation.CATEGORIES), case_sensitive=False),
+    type=LazyChoice(get_category_names, case_sensitive=False),
     help=(
         "Skip specific categories. Can be repeated."
     ),
 )
+@click.option(
+    "-t",
+    "--task",
+    "optional_tasks",
+    multiple=True,
+    type=LazyChoice(get_optional_task_names, case_sensitive=False),
+    help="Run an optional post-processing task. Can be repeated.",
+)
+@click.option(
+    "--image-cache-size",
+    type=click.IntRange(min=1),
+    help="Maximum size of the image cache in MiB. The least recently used images are deleted when exceeded.",
+)
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=get_generation_jobs,
+    help="Number of categories and tasks processed concurrently.",
+)
+@click.option(
+    "--resume",
+    help="Continue an interrupted generation of the database file, skipping the completed steps.",
+    is_flag=True,
+)
+@click.option(
+    "--report",
+    "report_file",
+    type=click.Path(dir_okay=False),
+    help="Write a JSON report with the duration and resource usage of every category and task to this file.",
+)
+@click.option(
+    "--profile",
+    "profile_dir",
+    type=click.Path(file_okay=False),
+    help="Profile every category and task, writing pstats and collapsed stack files to this folder.",
+)
 def generate(
     skip_images: bool,
     db_name: str,
@@ -52,8 +134,17 @@ def generate(
     include_deprecated_images: bool,
     log_parsing_errors: bool,
     skip_categories: tuple[str, ...],
+    optional_tasks: tuple[str, ...],
+    image_cache_size: int | None,
+    jobs: int,
+    resume: bool,
+    report_file: str | None,
+    profile_dir: str | None,
 ) -> None:
     """Generates a database file."""
+    from tibiawikisql import generation
+    from tibiawikisql.utils import timed
+
     with timed() as t, sqlite3.connect(db_name) as conn:
         generation.generate(
             conn,
@@ -62,9 +153,101 @@ def generate(
             include_deprecated_images=include_deprecated_images,
             skip_categories=skip_categories,
             parsing_errors_file=PARSING_ERRORS_FILE if log_parsing_errors else None,
+            optional_tasks=optional_tasks,
+            image_cache_size=image_cache_size,
+            jobs=jobs,
+            resume=resume,
+            report_file=report_file,
+            profile_dir=profile_dir,
         )
     click.echo(f"Command finished in {t.elapsed:.2f} seconds.")
 
 
+@cli.command(name="explain")
+@click.option("-o", "--db-name", help="Name of the database file.", default=DATABASE_FILE, type=click.Path(exists=True))
+def explain(db_name: str) -> None:
+    """Shows the query plans of the most common lookups, highlighting full table scans."""
+    from tibiawikisql.explain import collect_query_shapes, explain_query_plan
+
+    with sqlite3.connect(f"file:{db_name}?mode=ro", uri=True) as conn:
+        shapes = collect_query_shapes(conn)
+        scans = 0
+        for shape in shapes:
+            steps = explain_query_plan(conn, shape.sql, shape.parameters)
+            click.echo(f"{Fore.BLUE}{shape.table}{Style.RESET_ALL} ({shape.count:,} queries, "
+                       f"{shape.mean_time * 1000:.3f} ms on average)")
+            click.echo(f"\t{shape.sql}")
+            for step in steps:
+                if step.is_full_scan:
+                    scans += 1
+                    click.echo(f"\t\t{Fore.RED}{step.detail}{Style.RESET_ALL}")
+                else:
+                    click.echo(f"\t\t{step.detail}")
+    color = Fore.RED if scans else Fore.GREEN
+    click.echo(f"{color}Explained {len(shapes):,} query shapes, found {scans:,} full table scans.{Style.RESET_ALL}")
+
+
+@cli.command(name="export")
+@click.option("-o", "--db-name", help="Name of the database file.", default=DATABASE_FILE, type=click.Path(exists=True))
+@click.option(
+    "-t",
+    "--type",
+    "article_type",
+    type=LazyChoice(get_article_types, case_sensitive=False),
+    help="The type of articles to export. Required for NDJSON and CSV, columnar formats only export its table.",
+)
+@click.option("-f", "--format", "export_format", type=click.Choice(EXPORT_FORMATS + COLUMNAR_FORMATS),
+              default="ndjson", show_default=True, help="The format of the exported file.")
+@click.option("-O", "--output", type=click.Path(allow_dash=True),
+              help="The file to write to, by default the standard output. For columnar formats, the folder to write "
+                   f"a file per table to, by default {COLUMNAR_EXPORT_DIR!r}.")
+@click.option("-c", "--column", "columns", multiple=True,
+              help="Only export this value of the articles. Can be repeated.")
+@click.option("-z", "--gzip", "compress", is_flag=True, help="Compress the exported file with gzip.")
+@click.option("-i", "--include-images", is_flag=True,
+              help="Also export the tables containing images, in columnar formats.")
+@click.option("-d", "--include-derived", is_flag=True,
+              help="Also export the search and fuzzy indexes, documents and generation progress, in columnar formats.")
+def export(db_name: str, article_type: str | None, export_format: str, output: str | None, columns: tuple[str, ...],
+           compress: bool, include_images: bool, include_derived: bool) -> None:
+    """Exports the articles of a type to a NDJSON or CSV file, or the tables to Parquet or Arrow files."""
+    from tibiawikisql.export import export_articles, get_export_columns, open_export_file
+    from tibiawikisql.models import ARTICLE_MODELS
+    from tibiawikisql.utils import timed
+
+    model = ARTICLE_MODELS[article_type.lower()] if article_type else None
+    if export_format in COLUMNAR_FORMATS:
+        if columns or compress:
+            msg = "--column and --gzip can't be used with columnar formats."
+            raise click.UsageError(msg)
+        from tibiawikisql.columnar import export_tables
+
+        with timed() as t, sqlite3.connect(f"file:{db_name}?mode=ro", uri=True) as conn:
+            try:
+                counts = export_tables(
+                    conn,
+                    output or COLUMNAR_EXPORT_DIR,
+                    export_format,
+                    tables=[model.table] if model else None,
+                    include_images=include_images,
+                    include_derived=include_derived,
+                )
+            except ImportError as e:
+                raise click.ClickException(str(e)) from e
+        click.echo(f"{Fore.GREEN}Exported {sum(counts.values()):,} rows of {len(counts):,} tables "
+                   f"in {t.elapsed:.2f} seconds.{Style.RESET_ALL}", err=True)
+        return
+    if model is None:
+        msg = f"Required to export to {export_format}."
+        raise click.BadParameter(msg, param_hint="'-t' / '--type'")
+    if unknown := [column for column in columns if column not in get_export_columns(model)]:
+        msg = f"Unknown columns for {article_type}: {', '.join(unknown)}"
+        raise click.BadParameter(msg, param_hint="'-c' / '--column'")
+    with timed() as t, sqlite3.connect(f"file:{db_name}?mode=ro", uri=True) as conn, \
+            open_export_file(output or "-", compress=compress) as file:
+        count = export_articles(conn, model, file, export_format, columns=columns)
+    click.echo(f"{Fore.GREEN}Exported {count:,} {article_type} in {t.elapsed:.2f} seconds.{Style.RESET_ALL}",
+               err=True)
+
 if __name__ == "__main__":
     cli()
@@ -14,6 +14,9 @@ from tibiawikisql.utils import parse_templatates_data
 
 BASE_URL = "https://tibia.fandom.com"
 
+QUERY_TITLES_LIMIT = 50
+"""The maximum number of titles that can be queried in a single request."""
+
 
 class WikiEntry(BaseModel):
     """Represents a Wiki entry, such as an article or file."""
@@ -208,6 +211,50 @@ class WikiClient:
                 except KeyError:
                     continue
 
+    def resolve_images(self, names: list[str]) -> Generator[tuple[str, Image | None]]:
+        """Get the information of a list of image names, paired with the name each image was requested as.
+
+        It is not required to prefix the names with ``File:``, but the extension is required.
+        Unlike [get_images_info][tibiawikisql.api.WikiClient.get_images_info], missing images are yielded with
+        their name, and titles normalized by the API are mapped back to the requested name.
+        Names in batches whose request failed are not yielded.
+
+        Args:
+            names: A list of names of images to get the info of.
+
+        Yields:
+            The requested name and the image's information, or [None][] if the image does not exist.
+
+        """
+        params = {
+            "action": "query",
+            "prop": "imageinfo",
+            "iiprop": "url|timestamp",
+            "format": "json",
+        }
+        for i in range(0, len(names), QUERY_TITLES_LIMIT):
+            requested = {f"File:{n}": n for n in names[i:i + QUERY_TITLES_LIMIT]}
+            params["titles"] = "|".join(requested)
+            r = self.session.get(self.ENDPOINT, params=params)
+            if r.status_code >= 400:
+                continue
+            data = json.loads(r.text)
+            for normalized in data["query"].get("normalized", []):
+                if normalized["from"] in requested:
+                    requested[normalized["to"]] = requested.pop(normalized["from"])
+            for image_data in data["query"]["pages"].values():
+                name = requested.get(image_data["title"], image_data["title"].removeprefix("File:"))
+                try:
+                    image = Image(
+                        article_id=image_data["pageid"],
+                        title=image_data["title"],
+                        timestamp=image_data["imageinfo"][0]["timestamp"],
+                        file_url=image_data["imageinfo"][0]["url"],
+                    )
+                except KeyError:
+                    image = None
+                yield name, image
+
     def get_articles(self, names: list[str]) -> Generator[Article | None]:
         """Create a generator that obtains a list of articles given their titles.
 
@@ -0,0 +1,266 @@
+"""Functions to export the tables of the database to columnar files, for analytical queries.
+
+Requires [pyarrow](https://arrow.apache.org/docs/python/), installed with the `columnar` extra:
+``pip install tibiawikisql[columnar]``.
+"""
+from __future__ import annotations
+
+import datetime
+import pathlib
+from typing import Any, TYPE_CHECKING
+
+from tibiawikisql.database import Boolean, CompressedText, Date, Table, Timestamp
+from tibiawikisql.export import COLUMNAR_FORMATS
+from tibiawikisql.schema import (
+    DocumentTable,
+    FuzzyNameTable,
+    FuzzyTrigramTable,
+    GenerationCheckpointTable,
+    ImageTable,
+    MapTable,
+    SearchIndexTable,
+)
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Only available with the `columnar` extra.
+    pa = pq = None
+
+if TYPE_CHECKING:
+    import sqlite3
+    from collections.abc import Callable, Iterable
+
+    from tibiawikisql.database import Column, SQLType
+
+COLUMNAR_BATCH_SIZE = 65_536
+"""The number of rows read from the database and written at once, e.g. the size of every Parquet row group."""
+
+IMAGE_TABLES: tuple[type[Table], ...] = (ImageTable, MapTable)
+"""Tables containing image BLOBs, only exported when requested."""
+
+DERIVED_TABLES: tuple[type[Table], ...] = (
+    SearchIndexTable,
+    FuzzyNameTable,
+    FuzzyTrigramTable,
+    DocumentTable,
+    GenerationCheckpointTable,
+)
+"""Indexes, precomputed documents and generation progress, built from the other tables. Only exported when requested."""
+
+
+def _check_pyarrow() -> None:
+    if pa is None:
+        msg = "pyarrow is required for columnar exports, install it with `pip install tibiawikisql[columnar]`."
+        raise ImportError(msg)
+
+
+def _parse_datetime(value: str) -> datetime.datetime:
+    return datetime.datetime.fromisoformat(value)
+
+
+def _parse_date(value: str) -> datetime.date:
+    return datetime.date.fromisoformat(value)
+
+
+def get_arrow_type(column_type: SQLType) -> pa.DataType:
+    """Get the Arrow type of the values of a column.
+
+    Args:
+        column_type: The SQL type of the column.
+
+    Returns:
+        The Arrow type matching the python type of the column.
+
+    Raises:
+        ImportError: pyarrow is not installed.
+        TypeError: The column's type has no matching Arrow type.
+
+    """
+    _check_pyarrow()
+    arrow_types = {
+        int: pa.int64(),
+        float: pa.float64(),
+        str: pa.string(),
+        bytes: pa.binary(),
+        bool: pa.bool_(),
+        datetime.datetime: pa.timestamp("us", tz="UTC"),
+        datetime.date: pa.date32(),
+    }
+    try:
+        return arrow_types[column_type.python]
+    except KeyError:
+        msg = f"No Arrow type for {column_type!r}"
+        raise TypeError(msg) from None
+
+
+def _get_converter(column_type: SQLType) -> Callable[[Any], Any] | None:
+    """Get the function converting the values stored in SQLite to the values of the Arrow column, if needed."""
+    if isinstance(column_type, CompressedText):
+        return CompressedText.decompress
+    if isinstance(column_type, Timestamp):
+        return _parse_datetime
+    if isinstance(column_type, Date):
+        return _parse_date
+    if isinstance(column_type, Boolean):
+        return bool
+    return None
+
+
+def get_arrow_schema(table: type[Table]) -> pa.Schema:
+    """Get the Arrow schema of a table.
+
+    Args:
+        table: The table.
+
+    Returns:
+        A schema with a field for every column of the table, in the same order.
+
+    Raises:
+        ImportError: pyarrow is not installed.
+
+    """
+    return pa.schema([
+        pa.field(column.name, get_arrow_type(column.column_type), nullable=column.nullable and not column.primary_key)
+        for column in table.columns
+    ])
+
+
+def get_exported_tables(
+    conn: sqlite3.Connection,
+    *,
+    include_images: bool = False,
+    include_derived: bool = False,
+) -> list[type[Table]]:
+    """Get the tables of the schema that exist in a database.
+
+    Args:
+        conn: A connection to the database.
+        include_images: Whether to include the tables containing images.
+        include_derived: Whether to include the tables built from the other tables, e.g. the search index.
+
+    Returns:
+        The tables found in the database.
+
+    """
+    existing = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    return [
+        table for table in Table.all_tables()
+        if table.__tablename__ in existing
+        and (include_images or table not in IMAGE_TABLES)
+        and (include_derived or table not in DERIVED_TABLES)
+    ]
+
+
+def _iter_record_batches(
+    conn: sqlite3.Connection,
+    table: type[Table],
+    schema: pa.Schema,
+    batch_size: int,
+) -> Iterable[pa.RecordBatch]:
+    columns: list[Column] = table.columns
+    converters = [(i, converter) for i, c in enumerate(columns) if (converter := _get_converter(c.column_type))]
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    cursor.execute(f"SELECT {', '.join(c.name for c in columns)} FROM {table.__tablename__}")  # noqa: S608
+    try:
+        while rows := cursor.fetchmany(batch_size):
+            values = [list(column_values) for column_values in zip(*rows, strict=True)]
+            for i, converter in converters:
+                values[i] = [converter(value) if value is not None else None for value in values[i]]
+            yield pa.record_batch(values, schema=schema)
+    finally:
+        cursor.close()
+
+
+def export_table(
+    conn: sqlite3.Connection,
+    table: type[Table],
+    path: str | pathlib.Path,
+    export_format: str = "parquet",
+    *,
+    batch_size: int = COLUMNAR_BATCH_SIZE,
+) -> int:
+    """Write every row of a table to a columnar file.
+
+    Rows are read and written in batches, so memory usage doesn't grow with the table's size.
+    The types of the columns are taken from the table's definition, e.g. timestamps are exported as timestamps
+    instead of the ISO 8601 strings stored in SQLite, and compressed text is decompressed.
+
+    Args:
+        conn: A connection to the database.
+        table: The table to export.
+        path: The path of the file to write.
+        export_format: The format of the file, one of [COLUMNAR_FORMATS][tibiawikisql.export.COLUMNAR_FORMATS].
+        batch_size: The number of rows read from the database at once.
+
+    Returns:
+        The number of rows exported.
+
+    Raises:
+        ImportError: pyarrow is not installed.
+        ValueError: The format is not supported.
+
+    """
+    if export_format not in COLUMNAR_FORMATS:
+        msg = f"Unsupported columnar format {export_format!r}"
+        raise ValueError(msg)
+    schema = get_arrow_schema(table)
+    count = 0
+    if export_format == "parquet":
+        with pq.ParquetWriter(path, schema) as writer:
+            for batch in _iter_record_batches(conn, table, schema, batch_size):
+                writer.write_batch(batch)
+                count += batch.num_rows
+        return count
+    with pa.OSFile(str(path), "wb") as sink, pa.ipc.new_file(sink, schema) as writer:
+        for batch in _iter_record_batches(conn, table, schema, batch_size):
+            writer.write_batch(batch)
+            count += batch.num_rows
+    return count
+
+
+def export_tables(
+    conn: sqlite3.Connection,
+    output_dir: str | pathlib.Path,
+    export_format: str = "parquet",
+    *,
+    tables: Iterable[type[Table]] | None = None,
+    include_images: bool = False,
+    include_derived: bool = False,
+) -> dict[str, int]:
+    """Write every table of the database to a columnar file, named after the table, in a directory.
+
+    Args:
+        conn: A connection to the database.
+        output_dir: The directory to write the files to. It is created if it doesn't exist.
+        export_format: The format of the files, one of [COLUMNAR_FORMATS][tibiawikisql.export.COLUMNAR_FORMATS].
+        tables: The tables to export. By default, every table found in the database.
+        include_images: Whether to export the tables containing images, when exporting every table.
+        include_derived: Whether to export the tables built from the other tables, when exporting every table.
+
+    Returns:
+        The number of rows exported of every table, by the table's name.
+
+    Raises:
+        ImportError: pyarrow is not installed.
+        ValueError: The format is not supported.
+
+    """
+    _check_pyarrow()
+    if export_format not in COLUMNAR_FORMATS:
+        msg = f"Unsupported columnar format {export_format!r}"
+        raise ValueError(msg)
+    output_dir = pathlib.Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    if tables is None:
+        tables = get_exported_tables(conn, include_images=include_images, include_derived=include_derived)
+    return {
+        table.__tablename__: export_table(
+            conn,
+            table,
+            output_dir / f"{table.__tablename__}.{export_format}",
+            export_format,
+        )
+        for table in tables
+    }
@@ -4,12 +4,18 @@ from __future__ import annotations
 import datetime
 import inspect
 import sqlite3
+import time
+import zlib
 from sqlite3 import Connection, Cursor, Row
-from typing import Any, ClassVar, TypeVar
+from typing import Any, ClassVar, TYPE_CHECKING, TypeVar
 
-from pypika import Order, SQLLiteQuery as Query, Table as PTable
+from pypika import Order, Parameter, SQLLiteQuery as Query, Table as PTable
 
 from tibiawikisql.errors import InvalidColumnValueError, SchemaError
+from tibiawikisql.query_log import query_log
+
+if TYPE_CHECKING:
+    from collections.abc import Collection, Iterator
 
 
 T = TypeVar("T", bound="TableMeta")
@@ -125,12 +131,59 @@ class Column:
         return " ".join(builder)
 
 
+class Index:
+    """Represents an index on one or more columns of a SQL table.
+
+    Single column indexes can be declared with [Column][tibiawikisql.database.Column]'s `index` parameter instead.
+    An index containing every column a query reads is a covering index, letting SQLite answer the query without reading
+    the table's rows.
+    """
+
+    __slots__ = (
+        "columns",
+        "name",
+        "unique",
+    )
+
+    def __init__(self, *columns: str, unique: bool = False) -> None:
+        """Create an instance of the class.
+
+        Args:
+            *columns: The names of the indexed columns, in order.
+            unique: Whether to create a unique index or not.
+
+        """
+        if not columns:
+            msg = "An index must have at least one column."
+            raise SchemaError(msg)
+        self.columns = columns
+        self.unique = unique
+        self.name: str | None = None
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} name={self.name!r} columns={self.columns!r} unique={self.unique}>"
+
+    def get_create_statement(self, table_name: str) -> str:
+        """Get the `CREATE INDEX` statement of this index.
+
+        Args:
+            table_name: The name of the table containing the index.
+
+        Returns:
+            The statement that creates the index.
+
+        """
+        unique = "UNIQUE " if self.unique else ""
+        return f"CREATE {unique}INDEX IF NOT EXISTS {self.name} ON {table_name} ({', '.join(self.columns)});"
+
+
 class TableMeta(type):
     """Metaclass for table classes."""
 
     def __new__(mcs: type[T], name: str, bases: tuple[type, ...], dct: dict[str, Any], **kwargs: Any) -> T:
         columns: list[Column] = []
         column_map: dict[str, Column] = {}
+        indexes: list[Index] = []
 
         try:
             table_name = kwargs["table_name"]
@@ -139,6 +192,8 @@ class TableMeta(type):
 
         dct["__tablename__"] = table_name
         dct["__table__"] = PTable(table_name)
+        dct["__virtual__"] = kwargs.get("virtual")
+        dct["__virtual_options__"] = tuple(kwargs.get("virtual_options", ()))
 
         for elem, value in dct.items():
             if isinstance(value, Column):
@@ -148,9 +203,18 @@ class TableMeta(type):
                     value.index_name = f"{table_name}_{value.name}_idx"
                 columns.append(value)
                 column_map[value.name] = value
+            elif isinstance(value, Index):
+                value.name = f"{table_name}_{elem}"
+                indexes.append(value)
+
+        for index in indexes:
+            if missing := [column for column in index.columns if column not in column_map]:
+                msg = f"Index {index.name!r} references unknown columns: {', '.join(missing)}"
+                raise SchemaError(msg)
 
         dct["columns"] = columns
         dct["column_map"] = column_map
+        dct["indexes"] = indexes
         return super().__new__(mcs, name, bases, dct)
 
     def __init__(cls, name: str, parents: tuple[type, ...], dct: dict[str, Any], **kwargs: Any) -> None:
@@ -162,6 +226,8 @@ class Table(metaclass=TableMeta):
 
     __tablename__: ClassVar[str]
     __table__: ClassVar[PTable]
+    __virtual__: ClassVar[str | None]
+    __virtual_options__: ClassVar[tuple[str, ...]]
 
     @classmethod
     def get_create_table_statement(cls, *, exists_ok: bool = True) -> str:
@@ -171,6 +237,8 @@ class Table(metaclass=TableMeta):
             A SQL statement to create the table.
 
         """
+        if cls.__virtual__ == "fts5":
+            return cls.get_create_fts_table_statement(exists_ok=exists_ok)
         statements = []
         builder = ["CREATE TABLE"]
 
@@ -194,9 +262,30 @@ class Table(metaclass=TableMeta):
             if column.index:
                 fmt = f"CREATE INDEX IF NOT EXISTS {column.index_name} ON {cls.__tablename__} ({column.name});"
                 statements.append(fmt)
+        statements.extend(index.get_create_statement(cls.__tablename__) for index in cls.indexes)
 
         return "\n".join(statements)
 
+    @classmethod
+    def get_create_fts_table_statement(cls, *, exists_ok: bool = True) -> str:
+        """Generate the `CREATE VIRTUAL TABLE` statement for a FTS5 table.
+
+        In full-text tables, only columns marked with `index` are tokenized and searchable,
+        the rest are stored as `UNINDEXED` columns.
+
+        Returns:
+            A SQL statement to create the virtual table.
+
+        """
+        builder = ["CREATE VIRTUAL TABLE"]
+        if exists_ok:
+            builder.append("IF NOT EXISTS")
+        builder.append(cls.__tablename__)
+        arguments = [col.name if col.index else f"{col.name} UNINDEXED" for col in cls.columns]
+        arguments.extend(cls.__virtual_options__)
+        builder.append(f'USING fts5({", ".join(arguments)})')
+        return " ".join(builder) + ";"
+
     @classmethod
     def all_tables(cls) -> list[type[Table]]:
         """Get a list of all defined tables.
@@ -282,12 +371,10 @@ class Table(metaclass=TableMeta):
         q = (
             Query.from_(cls.__table__)
             .select("*")
-            .where(cls.__table__[column].like(value) if use_like else cls.__table__[column].eq(value))
+            .where(cls.__table__[column].like(Parameter("?")) if use_like else cls.__table__[column].eq(Parameter("?")))
         )
-        cursor = conn.cursor() if isinstance(conn, sqlite3.Connection) else conn
-        cursor.row_factory = Row
-        cursor.execute(q.get_sql())
-        return cursor.fetchone()
+        rows = cls._execute_lookup(conn, q.get_sql(), (value,), one=True)
+        return rows[0] if rows else None
 
     @classmethod
     def get_list_by_field(
@@ -329,14 +416,102 @@ class Table(metaclass=TableMeta):
             raise ValueError(msg)
         base_query = base_query or cls.get_base_select_query()
         table = PTable(cls.__tablename__)
-        q = base_query.where(table[column].like(value) if use_like else table[column].eq(value))
+        q = base_query.where(table[column].like(Parameter("?")) if use_like else table[column].eq(Parameter("?")))
         if sort_by is not None:
             q = q.orderby(sort_by, order=Order.asc if ascending else Order.desc)
         if limit is not None:
             q = q.limit(limit)
+        return cls._execute_lookup(conn, q.get_sql(), (value,))
+
+    @classmethod
+    def get_list_by_values(
+            cls,
+            conn: Connection | Cursor,
+            column: str,
+            values: Collection[Any],
+            sort_by: str | None = None,
+            ascending: bool = True,
+            *,
+            base_query: Query | None = None,
+    ) -> dict[Any, list[Row]]:
+        """Get the rows matching any of several values of a column, grouped by value.
+
+        This gets the rows of many parents with a single query, e.g. the attributes of a batch of items.
+        The value each row matched is selected as an additional `parent_id` column.
+
+        Args:
+            conn: A SQL connection.
+            column: The name of the column.
+            values: The values to match it against.
+            sort_by: The name of the field to sort by.
+            ascending: Whether to sort ascending or descending.
+            base_query: The query to filter, if only some columns or joined tables are needed.
+
+        Returns:
+            A mapping of the values to their matching rows. Values without rows are not included.
+
+        Raises:
+            ValueError: The specified columns don't exist in the table.
+        """
+        if column not in cls.column_map:
+            msg = f"Column {column!r} doesn't exist"
+            raise ValueError(msg)
+        if sort_by and sort_by not in cls.column_map:
+            msg = f"Column {sort_by!r} doesn't exist"
+            raise ValueError(msg)
+        if not values:
+            return {}
+        table = PTable(cls.__tablename__)
+        base_query = base_query or Query.from_(table).select(*cls.column_map)
+        q = base_query.select(table[column].as_("parent_id")).where(table[column].isin([Parameter("?")] * len(values)))
+        if sort_by is not None:
+            q = q.orderby(sort_by, order=Order.asc if ascending else Order.desc)
+        groups: dict[Any, list[Row]] = {}
+        for row in cls._execute_lookup(conn, q.get_sql(), tuple(values)):
+            groups.setdefault(row["parent_id"], []).append(row)
+        return groups
+
+    @classmethod
+    def iter_batches(cls, conn: Connection, batch_size: int) -> Iterator[list[Row]]:
+        """Iterate over every row of the table in batches, without loading the whole table into memory.
+
+        Args:
+            conn: A connection to the database.
+            batch_size: The maximum number of rows of every batch.
+
+        Yields:
+            Lists of rows, in the order they are stored.
+        """
+        cursor = conn.cursor()
+        cursor.row_factory = Row
+        cursor.execute(cls.get_select_query())
+        try:
+            while rows := cursor.fetchmany(batch_size):
+                yield rows
+        finally:
+            cursor.close()
+
+    @classmethod
+    def _execute_lookup(
+            cls,
+            conn: Connection | Cursor,
+            sql: str,
+            parameters: tuple[Any, ...],
+            *,
+            one: bool = False,
+    ) -> list[Row]:
         cursor = conn.cursor() if isinstance(conn, sqlite3.Connection) else conn
-        cursor.row_factory = sqlite3.Row
-        return list(cursor.execute(q.get_sql()))
+        cursor.row_factory = Row
+        start = time.perf_counter() if query_log.enabled else None
+        cursor.execute(sql, parameters)
+        if one:
+            row = cursor.fetchone()
+            rows = [row] if row is not None else []
+        else:
+            rows = cursor.fetchall()
+        if start is not None:
+            query_log.record(cls.__tablename__, sql, parameters, time.perf_counter() - start, len(rows))
+        return rows
 
 
 class SQLType:
@@ -427,6 +602,40 @@ class Text(SQLType):
         return "TEXT"
 
 
+class CompressedText(Text):
+    """Text that may be stored compressed with zlib.
+
+    Values are inserted as plain text. Long values can be compressed afterwards, being stored as a `BLOB` in the same
+    column, so plain and compressed values are told apart by their type.
+    """
+
+    @staticmethod
+    def compress(value: str) -> bytes:
+        """Compress a text value.
+
+        Args:
+            value: The text to compress.
+
+        Returns:
+            The text encoded as UTF-8 and compressed with zlib.
+
+        """
+        return zlib.compress(value.encode(), zlib.Z_BEST_COMPRESSION)
+
+    @staticmethod
+    def decompress(value: str | bytes) -> str:
+        """Get the text of a stored value, decompressing it if needed.
+
+        Args:
+            value: The stored value, either plain text or compressed text.
+
+        Returns:
+            The text value.
+
+        """
+        return zlib.decompress(value).decode() if isinstance(value, bytes) else value
+
+
 class Blob(SQLType):
     """Blob type."""
 
@@ -85,3 +85,6 @@ class SchemaError(DatabaseError):
         so it is not an error that should be seen when using the library.
     """
 
+
+class LuaDataError(TibiaWikiSqlError):
+    """Error raised when a Lua chunk is not a plain data table that can be parsed without a Lua runtime."""
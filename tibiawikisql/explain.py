@@ -0,0 +1,114 @@
+"""Query plans of the most common lookups, to find the ones that are not using an index."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, TYPE_CHECKING
+
+from tibiawikisql.models import (
+    Achievement,
+    Book,
+    Charm,
+    Creature,
+    House,
+    Imbuement,
+    Item,
+    Key,
+    Mount,
+    Npc,
+    Outfit,
+    Quest,
+    Spell,
+    Update,
+    World,
+)
+from tibiawikisql.query_log import query_log
+
+if TYPE_CHECKING:
+    import sqlite3
+
+    from tibiawikisql.models.base import RowModel
+    from tibiawikisql.query_log import QueryShape
+
+SAMPLE_MODELS: tuple[type[RowModel], ...] = (
+    Achievement,
+    Book,
+    Charm,
+    Creature,
+    House,
+    Imbuement,
+    Item,
+    Key,
+    Mount,
+    Npc,
+    Outfit,
+    Quest,
+    Spell,
+    Update,
+    World,
+)
+"""The models whose lookups are sampled to find the hot query shapes."""
+
+
+@dataclass(frozen=True)
+class PlanStep:
+    """A step of a query plan, as returned by ``EXPLAIN QUERY PLAN``."""
+
+    id: int
+    """The identifier of the step."""
+    parent: int
+    """The identifier of the step containing this one, or 0 for top level steps."""
+    detail: str
+    """The description of the step."""
+
+    @property
+    def is_full_scan(self) -> bool:
+        """Whether the step reads every row of a table, instead of searching an index."""
+        return self.detail.startswith("SCAN ") and self.detail != "SCAN CONSTANT ROW"
+
+
+def explain_query_plan(conn: sqlite3.Connection, sql: str, parameters: tuple[Any, ...] = ()) -> list[PlanStep]:
+    """Get the plan SQLite would use to execute a query.
+
+    Args:
+        conn: A connection to the database.
+        sql: The statement to explain.
+        parameters: The values bound to the statement.
+
+    Returns:
+        The steps of the plan, in order.
+
+    """
+    return [PlanStep(row[0], row[1], row[3]) for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", parameters)]
+
+
+def collect_query_shapes(conn: sqlite3.Connection) -> list[QueryShape]:
+    """Collect the shapes of the queries made by the most common lookups.
+
+    Every sampled model is looked up by the title and ID of one of its articles, which also runs the queries
+    of its child tables. The queries are recorded in the [query log][tibiawikisql.query_log.query_log], which is enabled
+    meanwhile and cleared afterwards.
+
+    Args:
+        conn: A connection to a generated database.
+
+    Returns:
+        The shapes of the queries made, from the one with the most time spent to the one with the least.
+
+    """
+    enabled = query_log.enabled
+    query_log.enabled = True
+    query_log.clear()
+    try:
+        for model in SAMPLE_MODELS:
+            table = model.table
+            if "title" not in table.column_map:
+                continue
+            row = conn.execute(f"SELECT article_id, title FROM {table.__tablename__} LIMIT 1").fetchone()  # noqa: S608
+            if row is None:
+                continue
+            model.get_by_title(conn, row[1])
+            model.get_by_id(conn, row[0])
+        return query_log.get_shapes()
+    finally:
+        query_log.enabled = enabled
+        query_log.clear()
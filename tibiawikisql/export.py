@@ -0,0 +1,137 @@
+"""Functions to export the articles stored in the database to other file formats."""
+from __future__ import annotations
+
+import contextlib
+import csv
+import gzip
+import io
+import json
+import sys
+from typing import IO, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import sqlite3
+    from collections.abc import Generator, Sequence
+
+    from tibiawikisql.models.base import RowModel
+
+EXPORT_FORMATS = ("ndjson", "csv")
+"""The file formats articles can be exported to."""
+
+COLUMNAR_FORMATS = ("parquet", "arrow")
+"""The columnar file formats tables can be exported to, using [tibiawikisql.columnar][]. Arrow files use the IPC file
+format."""
+
+EXPORT_BATCH_SIZE = 500
+"""The number of articles read from the database, and whose child values are loaded, at once."""
+
+
+def get_export_columns(model: type[RowModel]) -> list[str]:
+    """Get the names of the values exported for every article of a model.
+
+    Args:
+        model: The model of the articles.
+
+    Returns:
+        The names of the model's fields, excluding the ones that are never serialized, like images.
+
+    """
+    columns = [name for name, field in model.model_fields.items() if not field.exclude]
+    columns.extend(model.model_computed_fields)
+    return columns
+
+
+@contextlib.contextmanager
+def open_export_file(path: str, *, compress: bool = False) -> Generator[IO[str]]:
+    """Open a file to write an export to.
+
+    Args:
+        path: The path of the file, or ``-`` to write to the standard output.
+        compress: Whether to compress the file with gzip.
+
+    Yields:
+        A text file to write the export to.
+
+    """
+    if path == "-":
+        if not compress:
+            yield sys.stdout
+            sys.stdout.flush()
+            return
+        with gzip.GzipFile(fileobj=sys.stdout.buffer, mode="wb") as binary_file, \
+                io.TextIOWrapper(binary_file, encoding="utf-8", newline="") as file:
+            yield file
+        sys.stdout.buffer.flush()
+        return
+    if compress:
+        with gzip.open(path, "wt", encoding="utf-8", newline="") as file:
+            yield file
+        return
+    with open(path, "w", encoding="utf-8", newline="") as file:
+        yield file
+
+
+def export_articles(
+    conn: sqlite3.Connection,
+    model: type[RowModel],
+    file: IO[str],
+    export_format: str = "ndjson",
+    *,
+    columns: Sequence[str] | None = None,
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> int:
+    """Write every article of a model to a file, including the values found in child tables.
+
+    Articles are read and written in batches, so memory usage doesn't grow with the number of articles.
+
+    In NDJSON files, every article is written as a JSON object in its own line.
+    In CSV files, every article is a row, and values that are lists or objects, like the item's attributes,
+    are written as JSON.
+
+    Args:
+        conn: A connection to the database.
+        model: The model of the articles to export.
+        file: The text file to write the articles to.
+        export_format: The format of the file, one of [EXPORT_FORMATS][tibiawikisql.export.EXPORT_FORMATS].
+        columns: The names of the values to export. By default, all of them are exported.
+            Child tables are only queried if any of the columns requires them.
+        batch_size: The number of articles read from the database at once.
+
+    Returns:
+        The number of articles exported.
+
+    Raises:
+        ValueError: The format is not supported, or any of the columns is not a value of the model.
+
+    """
+    if export_format not in EXPORT_FORMATS:
+        msg = f"Unsupported export format {export_format!r}"
+        raise ValueError(msg)
+    available_columns = get_export_columns(model)
+    if columns:
+        if unknown := [column for column in columns if column not in available_columns]:
+            msg = f"Unknown columns for {model.__name__}: {', '.join(unknown)}"
+            raise ValueError(msg)
+        columns = list(dict.fromkeys(columns))
+    else:
+        columns = available_columns
+    include = set(columns)
+    with_children = any(column not in model.table.column_map for column in columns)
+    entries = model.iter_all(conn, batch_size, with_children=with_children)
+    count = 0
+    if export_format == "ndjson":
+        for entry in entries:
+            file.write(entry.model_dump_json(include=include))
+            file.write("\n")
+            count += 1
+        return count
+    writer = csv.DictWriter(file, fieldnames=columns)
+    writer.writeheader()
+    for entry in entries:
+        row = entry.model_dump(mode="json", include=include)
+        for name, value in row.items():
+            if isinstance(value, list | dict):
+                row[name] = json.dumps(value, ensure_ascii=False)
+        writer.writerow(row)
+        count += 1
+    return count
@@ -1,12 +1,17 @@
 """Functions related to generating a database dump from TibiaWiki."""
 from __future__ import annotations
 
+import contextlib
 import datetime
+import functools
 import platform
+import sqlite3
+import threading
+import time
 import traceback
 from dataclasses import dataclass
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, TypeVar
+from typing import TYPE_CHECKING, Any, Generic, TypeVar
 
 import click
 from colorama import Fore, Style
@@ -14,28 +19,34 @@ from colorama import Fore, Style
 from tibiawikisql import __version__, parsers, schema
 from tibiawikisql.api import Article, Image, WikiClient, WikiEntry
 from tibiawikisql.errors import ArticleParsingError
-from tibiawikisql.models.npc import rashid_positions
-from tibiawikisql.parsers import BaseParser
-from tibiawikisql.schema import RashidPositionTable
-from tibiawikisql.tasks import images as image_tasks
-from tibiawikisql.tasks import item_offers as item_offer_tasks
-from tibiawikisql.tasks import item_proficiency_perks as proficiency_tasks
-from tibiawikisql.tasks import loot_statistics as loot_tasks
+from tibiawikisql.profiling import StageProfiler
+from tibiawikisql.report import GenerationReport, get_current_stage, get_database_size, record_response
+from tibiawikisql.scheduling import Job, JobTiming, get_critical_path, run_atomically, run_jobs
+from tibiawikisql.schema import GenerationCheckpointTable, RashidPositionTable
 from tibiawikisql.utils import timed
 
 if TYPE_CHECKING:
-    import sqlite3
-    from collections.abc import Callable, Iterable
+    from collections.abc import Callable, Iterable, Iterator
     from click._termui_impl import ProgressBar
+
+    from tibiawikisql.models.base import RowModel
+    from tibiawikisql.parsers import BaseParser
     from typing import TextIO
 
 V = TypeVar("V")
 
 wiki_client = WikiClient()
+wiki_client.session.hooks["response"].append(record_response)
 
 WEAPON_PROFICIENCY_NAME_ARTICLE = "Template:Weapon Proficiency Name"
 WEAPON_PROFICIENCY_TABLES_ARTICLE = "Weapon Proficiency Tables"
 
+GENERATION_JOBS = 4
+"""The default number of generation steps that run concurrently."""
+
+CHECKPOINT_BATCH_SIZE = 50
+"""The number of parsed articles of a category committed at a time, along with the category's progress."""
+
 
 class Category:
     """Defines the article groups to be fetched.
@@ -46,62 +57,79 @@ class Category:
     def __init__(
         self,
         name: str | None,
-        parser: type[BaseParser],
+        parser: str,
         *,
         no_images: bool = False,
         extension: str = ".gif",
         include_deprecated: bool = False,
         generate_map: bool = False,
         depends_on: tuple[str, ...] = (),
+        after: tuple[str, ...] = (),
     ) -> None:
         """Create a new instance of the class.
 
         Args:
             name: The name of the TibiaWiki category containing the articles. Doesn't need the `Category:` prefix.
-            parser: The parser class to use.
+            parser: The name of the parser class to use, from [tibiawikisql.parsers][]. It's imported when first used.
             no_images: Indicate that there is no image extraction from this category's items.
             extension: The filename extension for images.
             include_deprecated: Whether to always include deprecated articles from this category.
             generate_map: Whether to generate a mapping of article names to their article instance for later processing.
             depends_on: Category keys required to safely process this category.
+            after: Category keys that must be parsed first if enabled, because their rows are referenced when
+                inserting this category's rows.
 
         """
         self.name = name
-        self.parser = parser
+        self.parser_name = parser
         self.no_images = no_images
         self.extension = extension
         self.include_deprecated = include_deprecated
         self.generate_map = generate_map
         self.depends_on = depends_on
+        self.after = after
+
+    @functools.cached_property
+    def parser(self) -> type[BaseParser]:
+        """The parser class to use."""
+        return getattr(parsers, self.parser_name)
 
 
 CATEGORIES = {
-    "achievements": Category("Achievements", parsers.AchievementParser, no_images=True),
-    "spells": Category("Spells", parsers.SpellParser, generate_map=True),
-    "items": Category("Objects", parsers.ItemParser, generate_map=True),
-    "creatures": Category("Creatures", parsers.CreatureParser, generate_map=True),
-    "books": Category("Book Texts", parsers.BookParser, no_images=True),
-    "keys": Category("Keys", parsers.KeyParser, no_images=True, depends_on=("items",)),
-    "npcs": Category("NPCs", parsers.NpcParser, generate_map=True),
-    "imbuements": Category("Imbuements", parsers.ImbuementParser, extension=".png"),
-    "quests": Category("Quest Overview Pages", parsers.QuestParser, no_images=True),
-    "houses": Category("Player-Ownable Buildings", parsers.HouseParser, no_images=True),
-    "charms": Category("Charms", parsers.CharmParser, extension=".png"),
-    "outfits": Category("Outfits", parsers.OutfitParser, no_images=True),
-    "worlds": Category("Game Worlds", parsers.WorldParser, no_images=True, include_deprecated=True),
-    "mounts": Category("Mounts", parsers.MountParser),
-    "updates": Category("Updates", parsers.UpdateParser, no_images=True),
+    "achievements": Category("Achievements", "AchievementParser", no_images=True),
+    "spells": Category("Spells", "SpellParser", generate_map=True),
+    "items": Category("Objects", "ItemParser", generate_map=True),
+    "creatures": Category("Creatures", "CreatureParser", generate_map=True, after=("items",)),
+    "books": Category("Book Texts", "BookParser", no_images=True, after=("items",)),
+    "keys": Category("Keys", "KeyParser", no_images=True, depends_on=("items",)),
+    "npcs": Category("NPCs", "NpcParser", generate_map=True),
+    "imbuements": Category("Imbuements", "ImbuementParser", extension=".png", after=("items",)),
+    "quests": Category("Quest Overview Pages", "QuestParser", no_images=True, after=("items", "creatures")),
+    "houses": Category("Player-Ownable Buildings", "HouseParser", no_images=True),
+    "charms": Category("Charms", "CharmParser", extension=".png"),
+    "outfits": Category("Outfits", "OutfitParser", no_images=True, after=("quests",)),
+    "worlds": Category("Game Worlds", "WorldParser", no_images=True, include_deprecated=True),
+    "mounts": Category("Mounts", "MountParser"),
+    "updates": Category("Updates", "UpdateParser", no_images=True),
 }
 """The categories to fetch and generate objects for."""
 
 
 @dataclass(frozen=True)
 class PostTask:
-    """Represents a post-processing task and its category dependencies."""
+    """Represents a post-processing task and its category dependencies.
+
+    The task starts as soon as its dependencies are parsed, or after every category if it has no dependencies.
+    Tasks listed in `after` are run first if they are run at all.
+
+    Optional tasks are only run when explicitly requested.
+    """
 
     name: str
     callback: Callable[[sqlite3.Connection, dict[str, Any], set[str]], None]
     dependencies: tuple[str, ...] = ()
+    optional: bool = False
+    after: tuple[str, ...] = ()
 
 
 def img_label(item: Image | None) -> str:
@@ -125,6 +153,32 @@ def constraint(value: str, limit: int) -> str:
     return value[: limit - 1] + "…"
 
 
+class QuietProgressBar(Generic[V]):
+    """A progress bar that only shows its label, used by jobs running concurrently."""
+
+    def __init__(self, iterable: Iterable[V], label: str | None = None) -> None:
+        """Create an instance of the class.
+
+        Args:
+            iterable: The iterable to iterate over.
+            label: The label to show when the iteration starts.
+
+        """
+        self.iterable = iterable
+        self.label = label
+
+    def __enter__(self) -> QuietProgressBar[V]:
+        if self.label:
+            click.echo(f"{self.label}...")
+        return self
+
+    def __exit__(self, *_args: object) -> None:
+        pass
+
+    def __iter__(self) -> Iterator[V]:
+        return iter(self.iterable)
+
+
 def progress_bar(
     iterable: Iterable[V] | None = None,
     length: int | None = None,
@@ -132,8 +186,13 @@ def progress_bar(
     item_show_func: Callable[[V | None], str | None] | None = None,
     info_sep: str = "  ",
     width: int = 36,
-) -> ProgressBar[V]:
-    """Get a progress bar iterator."""
+) -> ProgressBar[V] | QuietProgressBar[V]:
+    """Get a progress bar iterator.
+
+    Outside the main thread, only the label is shown, since several bars would overlap.
+    """
+    if threading.current_thread() is not threading.main_thread():
+        return QuietProgressBar(iterable, label)
     return click.progressbar(
         iterable,
         length,
@@ -164,7 +223,10 @@ def fetch_category_entries(category: str, exclude_titles: set[str] | None = None
     click.echo(f"\t{Fore.GREEN}Found {len(entries):,} articles in {t.elapsed:.2f} seconds.{Style.RESET_ALL}")
     return entries
 
+
 def _run_item_offers(conn: sqlite3.Connection, data_store: dict[str, Any], _enabled_categories: set[str]) -> None:
+    from tibiawikisql.tasks import item_offers as item_offer_tasks  # noqa: PLC0415
+
     item_offer_tasks.generate_item_offers(
         conn,
         data_store,
@@ -176,6 +238,8 @@ def _run_item_offers(conn: sqlite3.Connection, data_store: dict[str, Any], _enab
 
 
 def _run_loot_statistics(conn: sqlite3.Connection, data_store: dict[str, Any], _enabled_categories: set[str]) -> None:
+    from tibiawikisql.tasks import loot_statistics as loot_tasks  # noqa: PLC0415
+
     loot_tasks.generate_loot_statistics(
         conn,
         data_store,
@@ -192,6 +256,8 @@ def _run_item_proficiency_perks(
     data_store: dict[str, Any],
     _enabled_categories: set[str],
 ) -> None:
+    from tibiawikisql.tasks import item_proficiency_perks as proficiency_tasks  # noqa: PLC0415
+
     proficiency_tasks.generate_item_proficiency_perks(
         conn,
         data_store,
@@ -204,6 +270,8 @@ def _run_item_proficiency_perks(
 
 
 def _run_images(conn: sqlite3.Connection, _data_store: dict[str, Any], enabled_categories: set[str]) -> None:
+    from tibiawikisql.tasks import images as image_tasks  # noqa: PLC0415
+
     image_tasks.fetch_images(
         conn,
         categories=CATEGORIES,
@@ -214,18 +282,80 @@ def _run_images(conn: sqlite3.Connection, _data_store: dict[str, Any], enabled_c
         img_label=img_label,
         timed=timed,
         echo=click.echo,
+        cache_max_bytes=_data_store.get("image_cache_max_bytes"),
+    )
+
+
+def _run_search_index(conn: sqlite3.Connection, _data_store: dict[str, Any], enabled_categories: set[str]) -> None:
+    from tibiawikisql.tasks import search_index as search_index_tasks  # noqa: PLC0415
+
+    search_index_tasks.generate_search_index(
+        conn,
+        categories=CATEGORIES,
+        enabled_categories=enabled_categories,
+        timed=timed,
+        echo=click.echo,
     )
 
 
+def _run_fuzzy_index(conn: sqlite3.Connection, _data_store: dict[str, Any], enabled_categories: set[str]) -> None:
+    from tibiawikisql.tasks import fuzzy_index as fuzzy_index_tasks  # noqa: PLC0415
+
+    fuzzy_index_tasks.generate_fuzzy_index(
+        conn,
+        categories=CATEGORIES,
+        enabled_categories=enabled_categories,
+        timed=timed,
+        echo=click.echo,
+    )
+
+
+def _run_documents(conn: sqlite3.Connection, _data_store: dict[str, Any], enabled_categories: set[str]) -> None:
+    from tibiawikisql.tasks import documents as document_tasks  # noqa: PLC0415
+
+    document_tasks.generate_documents(
+        conn,
+        categories=CATEGORIES,
+        enabled_categories=enabled_categories,
+        progress_bar=progress_bar,
+        timed=timed,
+        echo=click.echo,
+    )
+
+
+def _run_summaries(conn: sqlite3.Connection, _data_store: dict[str, Any], _enabled_categories: set[str]) -> None:
+    from tibiawikisql.tasks import summaries as summary_tasks  # noqa: PLC0415
+
+    summary_tasks.generate_summaries(conn, timed=timed, echo=click.echo)
+
+
+def _run_compress_text(conn: sqlite3.Connection, _data_store: dict[str, Any], _enabled_categories: set[str]) -> None:
+    from tibiawikisql.tasks import text_compression as text_compression_tasks  # noqa: PLC0415
+
+    text_compression_tasks.compress_text_columns(conn, timed=timed, echo=click.echo)
+
+
 POST_TASKS = (
     PostTask("item_offers", _run_item_offers, dependencies=("items", "npcs")),
     PostTask("loot_statistics", _run_loot_statistics, dependencies=("items", "creatures")),
     PostTask("item_proficiency_perks", _run_item_proficiency_perks, dependencies=("items",)),
+    PostTask("search_index", _run_search_index, optional=True),
+    PostTask("fuzzy_index", _run_fuzzy_index, optional=True),
+    PostTask("summaries", _run_summaries, optional=True, after=("item_offers", "loot_statistics")),
+    PostTask(
+        "documents",
+        _run_documents,
+        optional=True,
+        after=("item_offers", "loot_statistics", "item_proficiency_perks", "images"),
+    ),
     PostTask("images", _run_images),
+    PostTask("compress_text", _run_compress_text, optional=True, after=("search_index", "documents")),
 )
 
 PARSING_ERROR_SEPARATOR = "-" * 80
 
+parsing_errors_lock = threading.Lock()
+
 
 def write_parsing_error(
     file: TextIO,
@@ -244,46 +374,246 @@ def write_parsing_error(
     file.write("\n")
 
 
-def parse_articles(
+def get_checkpoints(conn: sqlite3.Connection) -> dict[str, tuple[int, bool]]:
+    """Get the progress of the generation steps recorded in a database.
+
+    Returns:
+        A mapping of the names of the steps to the number of articles they parsed and whether they were completed.
+
+    """
+    table = GenerationCheckpointTable.__tablename__
+    try:
+        rows = conn.execute(f"SELECT name, progress, completed FROM {table}").fetchall()  # noqa: S608
+    except sqlite3.OperationalError:
+        return {}
+    return {name: (progress, bool(completed)) for name, progress, completed in rows}
+
+
+def save_checkpoint(conn: sqlite3.Connection, name: str, progress: int = 0, *, completed: bool = False) -> None:
+    """Record the progress of a generation step.
+
+    The checkpoint is not committed, it must be part of the same transaction as the changes it records.
+    """
+    table = GenerationCheckpointTable.__tablename__
+    conn.execute(
+        f"INSERT OR REPLACE INTO {table}(name, progress, completed, timestamp) VALUES(?, ?, ?, ?)",
+        (name, progress, completed, datetime.datetime.now(tz=datetime.timezone.utc).isoformat()),
+    )
+
+
+def insert_batch(
+    conn: sqlite3.Connection,
+    key: str,
+    entries: list[RowModel],
+    progress: int,
+    *,
+    completed: bool = False,
+) -> None:
+    """Insert parsed articles of a category and record the category's progress, in a single transaction."""
+    def insert(real_conn: sqlite3.Connection) -> None:
+        for entry in entries:
+            entry.insert(real_conn)
+        save_checkpoint(real_conn, key, progress, completed=completed)
+
+    run_atomically(conn, insert)
+
+
+def load_stored_articles(conn: sqlite3.Connection, data_store: dict[str, Any], key: str) -> set[int]:
+    """Load the articles of a category that were stored by a previous generation.
+
+    If the category generates a map, the articles are added to it.
+
+    Returns:
+        The article IDs of the stored articles.
+
+    """
+    category = CATEGORIES[key]
+    table = category.parser.table.__tablename__
+    rows = conn.execute(f"SELECT article_id, title FROM {table}").fetchall()  # noqa: S608
+    if category.generate_map:
+        data_store.setdefault(f"{key}_map", {}).update({title.lower(): article_id for article_id, title in rows})
+    return {article_id for article_id, _ in rows}
+
+
+def parse_category(
     conn: sqlite3.Connection,
     data_store: dict[str, Any],
-    enabled_categories: set[str],
+    key: str,
     parsing_errors_log: TextIO | None = None,
+    *,
+    resume: bool = False,
 ) -> int:
-    """Parse category articles into the database."""
-    click.echo("Parsing articles...")
-    parsing_errors_count = 0
-    for key, category in CATEGORIES.items():
-        if key not in enabled_categories:
-            continue
+    """Parse the articles of a category into the database.
+
+    Articles are inserted in batches, each committed along with the category's progress, so the progress recorded
+    always matches the articles stored. When resuming, articles that were already stored are skipped.
 
-        titles = [entry.title for entry in data_store[key]]
-        parser = category.parser
-        if category.generate_map:
-            data_store[f"{key}_map"] = {}
-        unparsed = []
-        generator = wiki_client.get_articles(titles)
-        with (
-            timed() as t,
-            conn,
-            progress_bar(generator, len(titles), f"Parsing {key}", item_show_func=article_label) as bar,
-        ):
-            for article in bar:
-                try:
-                    entry = parser.from_article(article)
-                    entry.insert(conn)
-                    if category.generate_map:
-                        data_store[f"{key}_map"][entry.title.lower()] = entry.article_id
-                except ArticleParsingError as e:
-                    unparsed.append(article.title)
-                    parsing_errors_count += 1
-                    if parsing_errors_log:
+    Returns:
+        The number of articles that could not be parsed.
+
+    """
+    category = CATEGORIES[key]
+    entries = data_store[key]
+    parser = category.parser
+    if category.generate_map:
+        data_store[f"{key}_map"] = {}
+    stored = load_stored_articles(conn, data_store, key) if resume else set()
+    if stored:
+        entries = [entry for entry in entries if entry.article_id not in stored]
+        click.echo(f"\tResuming {key}, {len(stored):,} articles were already parsed.")
+    titles = [entry.title for entry in entries]
+    unparsed = []
+    batch = []
+    parse_time = insert_time = 0.0
+    generator = wiki_client.get_articles(titles)
+    with (
+        timed() as t,
+        progress_bar(generator, len(titles), f"Parsing {key}", item_show_func=article_label) as bar,
+    ):
+        for i, article in enumerate(bar, 1):
+            try:
+                start = time.perf_counter()
+                entry = parser.from_article(article)
+                parse_time += time.perf_counter() - start
+                batch.append(entry)
+                if category.generate_map:
+                    data_store[f"{key}_map"][entry.title.lower()] = entry.article_id
+            except ArticleParsingError as e:
+                unparsed.append(article.title)
+                if parsing_errors_log:
+                    with parsing_errors_lock:
                         write_parsing_error(parsing_errors_log, category=key, article=article, error=e)
-        if unparsed:
-            click.echo(f"{Fore.RED}Could not parse {len(unparsed):,} articles.{Style.RESET_ALL}")
-            click.echo(f"\t-> {Fore.RED}{f'{Style.RESET_ALL},{Fore.RED}'.join(unparsed)}{Style.RESET_ALL}")
-        click.echo(f"\t{Fore.GREEN}Parsed articles in {t.elapsed:.2f} seconds.{Style.RESET_ALL}")
-    return parsing_errors_count
+            if i % CHECKPOINT_BATCH_SIZE == 0:
+                start = time.perf_counter()
+                insert_batch(conn, key, batch, len(stored) + i)
+                insert_time += time.perf_counter() - start
+                batch.clear()
+        start = time.perf_counter()
+        insert_batch(conn, key, batch, len(stored) + len(titles), completed=True)
+        insert_time += time.perf_counter() - start
+    if stage := get_current_stage():
+        stage.articles = len(titles)
+        stage.parse_time = parse_time
+        stage.insert_time = insert_time
+        stage.parse_errors = len(unparsed)
+    if unparsed:
+        click.echo(f"{Fore.RED}Could not parse {len(unparsed):,} {key} articles.{Style.RESET_ALL}")
+        click.echo(f"\t-> {Fore.RED}{f'{Style.RESET_ALL},{Fore.RED}'.join(unparsed)}{Style.RESET_ALL}")
+    click.echo(f"\t{Fore.GREEN}Parsed {key} articles in {t.elapsed:.2f} seconds.{Style.RESET_ALL}")
+    return len(unparsed)
+
+
+def select_post_tasks(
+    enabled_categories: set[str],
+    skip_images: bool,
+    optional_tasks: set[str] | None = None,
+) -> list[PostTask]:
+    """Get the post-processing tasks to run, skipping those whose required categories are disabled."""
+    post_tasks = []
+    for post_task in POST_TASKS:
+        if post_task.name == "images" and skip_images:
+            continue
+        if post_task.optional and post_task.name not in (optional_tasks or ()):
+            continue
+        missing_dependencies = [dep for dep in post_task.dependencies if dep not in enabled_categories]
+        if missing_dependencies:
+            dependencies = ", ".join(sorted(missing_dependencies))
+            click.echo(
+                f"{Fore.YELLOW}Skipping task '{post_task.name}' because required categories are disabled: "
+                f"{dependencies}.{Style.RESET_ALL}",
+            )
+            continue
+        post_tasks.append(post_task)
+    return post_tasks
+
+
+def run_post_task(
+    conn: sqlite3.Connection,
+    post_task: PostTask,
+    data_store: dict[str, Any],
+    enabled_categories: set[str],
+) -> None:
+    """Run a post-processing task, recording its completion once its changes are committed."""
+    post_task.callback(conn, data_store, enabled_categories)
+    run_atomically(conn, lambda real_conn: save_checkpoint(real_conn, post_task.name, completed=True))
+
+
+def measure_stage(
+    report: GenerationReport | None,
+    name: str,
+    kind: str,
+    callback: Callable[[sqlite3.Connection], None],
+    profiler: StageProfiler | None = None,
+) -> Callable[[sqlite3.Connection], None]:
+    """Wrap the callback of a job, measuring it as a stage of the report and profiling it, if set."""
+    if profiler is not None:
+        callback = functools.partial(profiler.run, name, callback)
+    if report is None:
+        return callback
+
+    def run(conn: sqlite3.Connection) -> None:
+        with report.stage(name, kind, conn):
+            callback(conn)
+
+    return run
+
+
+def get_generation_jobs(
+    data_store: dict[str, Any],
+    enabled_categories: set[str],
+    post_tasks: list[PostTask],
+    parsing_errors: list[int],
+    parsing_errors_log: TextIO | None = None,
+    *,
+    checkpoints: dict[str, tuple[int, bool]] | None = None,
+    report: GenerationReport | None = None,
+    profiler: StageProfiler | None = None,
+) -> list[Job]:
+    """Get the jobs parsing every enabled category and running the post-processing tasks.
+
+    Categories are parsed once the categories they depend on or must come after are parsed, and post-processing
+    tasks start as soon as the categories they depend on are parsed.
+    The number of parsing errors of each category is appended to `parsing_errors`.
+
+    If the checkpoints of a previous generation are provided, completed categories are only loaded from the database,
+    the rest of the categories skip the articles already stored, and completed tasks are not run again.
+    If a report is provided, each job is measured as one of its stages, and if a profiler is provided, each job is
+    profiled separately.
+    """
+    resume = checkpoints is not None
+    checkpoints = checkpoints or {}
+    category_keys = [key for key in CATEGORIES if key in enabled_categories]
+    jobs = []
+    for key in category_keys:
+        if checkpoints.get(key, (0, False))[1]:
+            def callback(conn: sqlite3.Connection, key: str = key) -> None:
+                load_stored_articles(conn, data_store, key)
+        else:
+            def callback(conn: sqlite3.Connection, key: str = key) -> None:
+                parsing_errors.append(parse_category(conn, data_store, key, parsing_errors_log, resume=resume))
+        jobs.append(
+            Job(
+                key,
+                measure_stage(report, key, "category", callback, profiler),
+                dependencies=(*CATEGORIES[key].depends_on, *CATEGORIES[key].after),
+            ),
+        )
+    jobs.extend(
+        Job(
+            post_task.name,
+            measure_stage(
+                report,
+                post_task.name,
+                "task",
+                lambda conn, task=post_task: run_post_task(conn, task, data_store, enabled_categories),
+                profiler,
+            ),
+            dependencies=(*(post_task.dependencies or category_keys), *post_task.after),
+        )
+        for post_task in post_tasks
+        if not checkpoints.get(post_task.name, (0, False))[1]
+    )
+    return jobs
 
 
 def resolve_enabled_categories(skip_categories: set[str]) -> tuple[set[str], dict[str, set[str]]]:
@@ -317,51 +647,86 @@ def warn_auto_skipped_categories(auto_skipped_categories: dict[str, set[str]]) -
         )
 
 
-def run_post_tasks(
-    conn: sqlite3.Connection,
-    data_store: dict[str, Any],
-    enabled_categories: set[str],
-    skip_images: bool,
-) -> None:
-    """Run post-processing tasks honoring dependency constraints."""
-    for post_task in POST_TASKS:
-        if post_task.name == "images" and skip_images:
-            continue
-        missing_dependencies = [dep for dep in post_task.dependencies if dep not in enabled_categories]
-        if missing_dependencies:
-            dependencies = ", ".join(sorted(missing_dependencies))
-            click.echo(
-                f"{Fore.YELLOW}Skipping task '{post_task.name}' because required categories are disabled: "
-                f"{dependencies}.{Style.RESET_ALL}",
-            )
-            continue
-        post_task.callback(conn, data_store, enabled_categories)
+def get_optional_task_names() -> list[str]:
+    """Get the names of the post-processing tasks that must be explicitly requested."""
+    return [post_task.name for post_task in POST_TASKS if post_task.optional]
 
 
-def generate(
-    conn: sqlite3.Connection,
+def echo_critical_path(timings: list[JobTiming]) -> None:
+    """Show the chain of generation steps that determined the total generation time."""
+    path = get_critical_path(timings)
+    if not path:
+        return
+    steps = " -> ".join(f"{timing.name} ({timing.elapsed:.2f}s)" for timing in path)
+    click.echo(f"{Fore.CYAN}Critical path ({path[-1].end:.2f} seconds): {steps}{Style.RESET_ALL}")
+
+
+def normalize_names(names: Iterable[str], valid_names: Iterable[str], error: str) -> set[str]:
+    """Normalize names given by the user, making sure they are all valid.
+
+    Args:
+        names: The names to normalize.
+        valid_names: The names that are accepted.
+        error: The message of the error raised for unknown names.
+
+    Returns:
+        The names in lowercase.
+
+    Raises:
+        ValueError: Some names are not valid.
+
+    """
+    normalized = {name.casefold() for name in names}
+    unknown = normalized - set(valid_names)
+    if unknown:
+        msg = f"{error}: {', '.join(sorted(unknown))}."
+        raise ValueError(msg)
+    return normalized
+
+
+def prepare_database(conn: sqlite3.Connection, *, resume: bool = False) -> dict[str, tuple[int, bool]]:
+    """Create the schema of the database, keeping the existing tables if a previous generation is resumed.
+
+    Returns:
+        The checkpoints of the generation being resumed, or an empty dictionary when starting from scratch.
+
+    """
+    from tibiawikisql.models.npc import rashid_positions  # noqa: PLC0415
+
+    checkpoints = get_checkpoints(conn) if resume else {}
+    if checkpoints:
+        completed_steps = sum(completed for _, completed in checkpoints.values())
+        click.echo(f"Resuming generation, {completed_steps:,} steps were already completed...")
+        schema.create_tables(conn, keep_existing=True)
+    else:
+        if resume:
+            click.echo(f"{Fore.YELLOW}No generation to resume, starting from scratch.{Style.RESET_ALL}")
+        click.echo("Creating schema...")
+        schema.create_tables(conn)
+        with conn:
+            for position in rashid_positions:
+                RashidPositionTable.insert(conn, **position.model_dump())
+    conn.execute("PRAGMA synchronous = OFF")
+    return checkpoints
+
+
+def fetch_category_members(
+    enabled_categories: set[str],
+    *,
     skip_images: bool = False,
     skip_deprecated: bool = False,
     include_deprecated_images: bool = False,
-    skip_categories: tuple[str, ...] = (),
-    parsing_errors_file: str | None = None,
-) -> None:
-    """Generate a complete TibiaWiki SQLite database."""
-    normalized_skip_categories = {category.casefold() for category in skip_categories}
-    unknown_categories = normalized_skip_categories - set(CATEGORIES)
-    if unknown_categories:
-        unknown_str = ", ".join(sorted(unknown_categories))
-        msg = f"Unknown categories in skip list: {unknown_str}."
-        raise ValueError(msg)
+) -> dict[str, Any]:
+    """Fetch the entries of every enabled category.
 
-    enabled_categories, auto_skipped_categories = resolve_enabled_categories(normalized_skip_categories)
-    warn_auto_skipped_categories(auto_skipped_categories)
+    When deprecated articles are skipped but their images are included, their titles are kept apart under
+    `deprecated_image_titles`.
 
-    click.echo("Creating schema...")
-    schema.create_tables(conn)
-    conn.execute("PRAGMA synchronous = OFF")
-    data_store: dict[str, Any] = {}
+    Returns:
+        A data store with the entries of every category, by the category's key.
 
+    """
+    data_store: dict[str, Any] = {}
     if skip_deprecated:
         deprecated = {
             entry.title
@@ -388,29 +753,153 @@ def generate(
 
     if deprecated_image_titles:
         data_store["deprecated_image_titles"] = deprecated_image_titles
+    return data_store
+
 
+def run_generation_jobs(
+    conn: sqlite3.Connection,
+    data_store: dict[str, Any],
+    enabled_categories: set[str],
+    post_tasks: list[PostTask],
+    *,
+    jobs: int = GENERATION_JOBS,
+    parsing_errors_file: str | None = None,
+    checkpoints: dict[str, tuple[int, bool]] | None = None,
+    report: GenerationReport | None = None,
+    profiler: StageProfiler | None = None,
+) -> list[JobTiming]:
+    """Parse the enabled categories and run the post-processing tasks, writing the parsing errors to a file, if set.
+
+    When resuming, the errors of the interrupted generation are kept.
+
+    Returns:
+        The timings of the categories and tasks that ran.
+
+    """
+    parsing_errors: list[int] = []
+    click.echo("Parsing articles...")
     parsing_errors_path = Path(parsing_errors_file) if parsing_errors_file else None
-    if parsing_errors_path:
-        with parsing_errors_path.open("w", encoding="utf-8") as parsing_errors_log:
+    with (
+        parsing_errors_path.open("a" if checkpoints else "w", encoding="utf-8")
+        if parsing_errors_path
+        else contextlib.nullcontext()
+    ) as parsing_errors_log:
+        if parsing_errors_log:
             gen_time = datetime.datetime.now(datetime.timezone.utc)
             parsing_errors_log.write(f"TibiaWikiSQL parsing errors - {gen_time.isoformat()}\n\n")
-            parsing_errors_count = parse_articles(conn, data_store, enabled_categories, parsing_errors_log)
+        generation_jobs = get_generation_jobs(
+            data_store,
+            enabled_categories,
+            post_tasks,
+            parsing_errors,
+            parsing_errors_log,
+            checkpoints=checkpoints or None,
+            report=report,
+            profiler=profiler,
+        )
+        timings = run_jobs(conn, generation_jobs, workers=jobs)
+    if parsing_errors_path:
         click.echo(
-            f"{Fore.YELLOW}Wrote {parsing_errors_count:,} parsing errors to "
+            f"{Fore.YELLOW}Wrote {sum(parsing_errors):,} parsing errors to "
             f"{parsing_errors_path}.{Style.RESET_ALL}",
         )
-    else:
-        parse_articles(conn, data_store, enabled_categories)
+    return timings
 
-    for position in rashid_positions:
-        RashidPositionTable.insert(conn, **position.model_dump())
-
-    run_post_tasks(conn, data_store, enabled_categories, skip_images)
 
+def save_database_info(conn: sqlite3.Connection, report: GenerationReport) -> None:
+    """Store the information about the generation in the `database_info` table, including its report."""
     with conn:
+        conn.execute(f"DELETE FROM {schema.DatabaseInfoTable.__tablename__}")  # noqa: S608
         gen_time = datetime.datetime.now(tz=datetime.timezone.utc)
         schema.DatabaseInfoTable.insert(conn, key="timestamp", value=str(gen_time.timestamp()))
         schema.DatabaseInfoTable.insert(conn, key="generate_time", value=gen_time.isoformat())
         schema.DatabaseInfoTable.insert(conn, key="version", value=__version__)
         schema.DatabaseInfoTable.insert(conn, key="python_version", value=platform.python_version())
         schema.DatabaseInfoTable.insert(conn, key="platform", value=platform.platform())
+        report.db_size = get_database_size(conn)
+        schema.DatabaseInfoTable.insert(conn, key="report", value=report.to_json())
+
+
+def generate(
+    conn: sqlite3.Connection,
+    *,
+    skip_images: bool = False,
+    skip_deprecated: bool = False,
+    include_deprecated_images: bool = False,
+    skip_categories: tuple[str, ...] = (),
+    parsing_errors_file: str | None = None,
+    optional_tasks: tuple[str, ...] = (),
+    image_cache_size: int | None = None,
+    jobs: int = GENERATION_JOBS,
+    resume: bool = False,
+    report_file: str | None = None,
+    profile_dir: str | None = None,
+) -> GenerationReport:
+    """Generate a complete TibiaWiki SQLite database.
+
+    Categories and post-processing tasks run as jobs, up to `jobs` at the same time, writing through `conn`.
+    Their progress is recorded in the database, so an interrupted generation can continue where it stopped by
+    setting `resume`.
+
+    The duration and resource usage of every category and task are measured, the resulting report is stored in
+    `database_info` and written as JSON to `report_file`, if set.
+
+    If `profile_dir` is set, every category and task is profiled separately, writing a `.pstats` file and a
+    `.collapsed` stack file for each one to that folder. Profiled jobs run one at a time, so they don't skew each
+    other's profiles.
+
+    Returns:
+        The report of the generation.
+
+    """
+    normalized_skip_categories = normalize_names(skip_categories, CATEGORIES, "Unknown categories in skip list")
+    normalized_optional_tasks = normalize_names(optional_tasks, get_optional_task_names(), "Unknown optional tasks")
+
+    enabled_categories, auto_skipped_categories = resolve_enabled_categories(normalized_skip_categories)
+    warn_auto_skipped_categories(auto_skipped_categories)
+
+    profiler = StageProfiler(profile_dir) if profile_dir else None
+    if profiler is not None and jobs > 1:
+        click.echo(f"{Fore.YELLOW}Profiling, categories and tasks will run one at a time.{Style.RESET_ALL}")
+        jobs = 1
+
+    start = time.perf_counter()
+    checkpoints = prepare_database(conn, resume=resume)
+    report = GenerationReport(__version__, jobs=jobs, resumed=bool(checkpoints))
+
+    with report.stage("category_members", "setup"):
+        data_store = fetch_category_members(
+            enabled_categories,
+            skip_images=skip_images,
+            skip_deprecated=skip_deprecated,
+            include_deprecated_images=include_deprecated_images,
+        )
+    if image_cache_size is not None:
+        data_store["image_cache_max_bytes"] = image_cache_size * 1024 * 1024
+
+    timings = run_generation_jobs(
+        conn,
+        data_store,
+        enabled_categories,
+        select_post_tasks(enabled_categories, skip_images, normalized_optional_tasks),
+        jobs=jobs,
+        parsing_errors_file=parsing_errors_file,
+        checkpoints=checkpoints,
+        report=report,
+        profiler=profiler,
+    )
+    echo_critical_path(timings)
+
+    if "compress_text" in normalized_optional_tasks:
+        # Compressing leaves the replaced pages free, but the file doesn't shrink until it is rebuilt.
+        click.echo("Vacuuming database...")
+        conn.execute("VACUUM")
+
+    report.wall_time = time.perf_counter() - start
+    save_database_info(conn, report)
+    if report_file:
+        Path(report_file).write_text(report.to_json(), encoding="utf-8")
+        click.echo(f"Wrote generation report to {report_file}.")
+    if profiler is not None:
+        click.echo(f"Wrote profiles to {profile_dir}.")
+    return report
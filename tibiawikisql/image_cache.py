@@ -0,0 +1,317 @@
+"""Local cache of the image files fetched from TibiaWiki."""
+from __future__ import annotations
+
+import contextlib
+import datetime
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+IMAGE_CACHE_FOLDER = "images"
+"""The folder where fetched images and the cache index are stored."""
+
+IMAGE_CACHE_INDEX_FILE = "cache.db"
+"""The name of the cache index file, inside the cache's folder."""
+
+LEGACY_CACHE_INFO_FILE = "cache_info.json"
+"""The name of the per-folder files used to track cached images in previous versions."""
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    """The metadata of a cached image file."""
+
+    folder: str
+    """The folder containing the file, inside the cache's folder."""
+    file_name: str
+    """The name of the image file."""
+    size: int
+    """The size of the file in bytes."""
+    content_hash: str | None
+    """The SHA-256 hash of the file's content, if known."""
+    wiki_timestamp: datetime.datetime | None
+    """The upload timestamp of the image in TibiaWiki when it was last fetched or revalidated."""
+    etag: str | None
+    """The entity tag sent by the server when the image was fetched."""
+    last_modified: str | None
+    """The ``Last-Modified`` header sent by the server when the image was fetched."""
+
+
+class ImageCache:
+    """A folder of fetched image files, indexed by a SQLite database.
+
+    The index keeps the metadata needed to skip or revalidate downloads, without loading it all in memory.
+    When a size limit is set, the least recently used files are evicted once it is exceeded.
+    """
+
+    def __init__(self, root: str = IMAGE_CACHE_FOLDER, max_bytes: int | None = None) -> None:
+        """Create an instance of the class.
+
+        Args:
+            root: The folder where the image files and the index are stored.
+            max_bytes: The maximum total size of the cached files, if any.
+
+        """
+        self.root = root
+        self.max_bytes = max_bytes
+        os.makedirs(root, exist_ok=True)
+        self.conn = sqlite3.connect(os.path.join(root, IMAGE_CACHE_INDEX_FILE))
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS image_cache (
+                folder TEXT NOT NULL,
+                file_name TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                content_hash TEXT,
+                wiki_timestamp TEXT,
+                etag TEXT,
+                last_modified TEXT,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (folder, file_name)
+            );
+            CREATE INDEX IF NOT EXISTS image_cache_last_used_idx ON image_cache (last_used);
+            CREATE TABLE IF NOT EXISTS missing_image (
+                title TEXT PRIMARY KEY,
+                checked_at REAL NOT NULL
+            );
+            """,
+        )
+
+    def __enter__(self) -> ImageCache:
+        return self
+
+    def __exit__(self, *_args: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Save the pending changes to the index and close it."""
+        self.conn.commit()
+        self.conn.close()
+
+    def commit(self) -> None:
+        """Save the pending changes to the index."""
+        self.conn.commit()
+
+    def get_folder(self, folder: str) -> str:
+        """Get the path to a folder of the cache, creating it if needed.
+
+        Args:
+            folder: The name of the folder.
+
+        Returns:
+            The path to the folder.
+
+        """
+        path = os.path.join(self.root, folder)
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    def get_path(self, folder: str, file_name: str) -> str:
+        """Get the path where an image file is cached.
+
+        Args:
+            folder: The folder containing the file.
+            file_name: The name of the image file.
+
+        Returns:
+            The path to the file.
+
+        """
+        return os.path.join(self.root, folder, file_name)
+
+    def get(self, folder: str, file_name: str) -> CacheEntry | None:
+        """Get the metadata of a cached image file.
+
+        Args:
+            folder: The folder containing the file.
+            file_name: The name of the image file.
+
+        Returns:
+            The metadata of the file, or [None][] if it is not cached.
+
+        """
+        row = self.conn.execute(
+            "SELECT size, content_hash, wiki_timestamp, etag, last_modified FROM image_cache "
+            "WHERE folder = ? AND file_name = ?",
+            (folder, file_name),
+        ).fetchone()
+        if row is None:
+            return None
+        size, content_hash, wiki_timestamp, etag, last_modified = row
+        return CacheEntry(
+            folder=folder,
+            file_name=file_name,
+            size=size,
+            content_hash=content_hash,
+            wiki_timestamp=datetime.datetime.fromisoformat(wiki_timestamp) if wiki_timestamp else None,
+            etag=etag,
+            last_modified=last_modified,
+        )
+
+    def record(
+        self,
+        folder: str,
+        file_name: str,
+        content: bytes,
+        *,
+        wiki_timestamp: datetime.datetime | None,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> None:
+        """Record the metadata of an image file that was just written to the cache.
+
+        Args:
+            folder: The folder containing the file.
+            file_name: The name of the image file.
+            content: The content of the file.
+            wiki_timestamp: The upload timestamp of the image in TibiaWiki.
+            etag: The entity tag sent by the server, if any.
+            last_modified: The ``Last-Modified`` header sent by the server, if any.
+
+        """
+        self.conn.execute(
+            "INSERT OR REPLACE INTO image_cache(folder, file_name, size, content_hash, wiki_timestamp, etag, "
+            "last_modified, last_used) VALUES(?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                folder,
+                file_name,
+                len(content),
+                hashlib.sha256(content).hexdigest(),
+                wiki_timestamp.isoformat() if wiki_timestamp else None,
+                etag,
+                last_modified,
+                time.time(),
+            ),
+        )
+
+    def touch(self, folder: str, file_name: str, *, wiki_timestamp: datetime.datetime | None = None) -> None:
+        """Mark a cached file as used, optionally updating the timestamp it was revalidated against.
+
+        Args:
+            folder: The folder containing the file.
+            file_name: The name of the image file.
+            wiki_timestamp: The upload timestamp of the image in TibiaWiki, if the file was revalidated.
+
+        """
+        if wiki_timestamp is None:
+            self.conn.execute(
+                "UPDATE image_cache SET last_used = ? WHERE folder = ? AND file_name = ?",
+                (time.time(), folder, file_name),
+            )
+            return
+        self.conn.execute(
+            "UPDATE image_cache SET last_used = ?, wiki_timestamp = ? WHERE folder = ? AND file_name = ?",
+            (time.time(), wiki_timestamp.isoformat(), folder, file_name),
+        )
+
+    def get_missing(self, ttl: float) -> set[str]:
+        """Get the image titles that were recently found to not exist in TibiaWiki.
+
+        Args:
+            ttl: The number of seconds a title is considered missing after it was checked.
+
+        Returns:
+            The titles of the missing images.
+
+        """
+        rows = self.conn.execute("SELECT title FROM missing_image WHERE checked_at >= ?", (time.time() - ttl,))
+        return {row[0] for row in rows}
+
+    def record_missing(self, titles: Iterable[str]) -> None:
+        """Record image titles that were not found in TibiaWiki.
+
+        Args:
+            titles: The titles of the missing images.
+
+        """
+        now = time.time()
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO missing_image(title, checked_at) VALUES(?, ?)",
+            ((title, now) for title in titles),
+        )
+
+    def forget_missing(self, titles: Iterable[str]) -> None:
+        """Remove image titles from the missing images, after they were found in TibiaWiki.
+
+        Args:
+            titles: The titles of the found images.
+
+        """
+        self.conn.executemany("DELETE FROM missing_image WHERE title = ?", ((title,) for title in titles))
+
+    def get_total_size(self) -> int:
+        """Get the total size of the cached files.
+
+        Returns:
+            The total size in bytes.
+
+        """
+        return self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM image_cache").fetchone()[0]
+
+    def evict(self) -> int:
+        """Delete the least recently used files until the cache is within its size limit.
+
+        Returns:
+            The number of files deleted.
+
+        """
+        if self.max_bytes is None:
+            return 0
+        excess = self.get_total_size() - self.max_bytes
+        if excess <= 0:
+            return 0
+        evicted = []
+        for folder, file_name, size in self.conn.execute(
+            "SELECT folder, file_name, size FROM image_cache ORDER BY last_used",
+        ):
+            if excess <= 0:
+                break
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(self.get_path(folder, file_name))
+            evicted.append((folder, file_name))
+            excess -= size
+        self.conn.executemany("DELETE FROM image_cache WHERE folder = ? AND file_name = ?", evicted)
+        self.conn.commit()
+        return len(evicted)
+
+    def import_legacy_info(self, folder: str) -> int:
+        """Import the cache metadata file of a folder written by previous versions, then delete it.
+
+        Only entries whose file still exists are imported.
+
+        Args:
+            folder: The folder containing the metadata file.
+
+        Returns:
+            The number of entries imported.
+
+        """
+        path = self.get_path(folder, LEGACY_CACHE_INFO_FILE)
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return 0
+        rows = []
+        now = time.time()
+        for file_name, timestamp in data.items():
+            try:
+                size = os.path.getsize(self.get_path(folder, file_name))
+            except OSError:
+                continue
+            rows.append((folder, file_name, size, timestamp, now))
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO image_cache(folder, file_name, size, wiki_timestamp, last_used) "
+            "VALUES(?, ?, ?, ?, ?)",
+            rows,
+        )
+        self.conn.commit()
+        os.remove(path)
+        return len(rows)
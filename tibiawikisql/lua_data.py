@@ -0,0 +1,182 @@
+"""Parser for Lua modules that only return data, such as TibiaWiki's data modules.
+
+Only a subset of Lua is supported: a ``return`` statement followed by a table constructor made of strings,
+numbers, booleans, ``nil`` and nested tables. Anything else raises [LuaDataError][tibiawikisql.errors.LuaDataError],
+so callers can fall back to evaluating the chunk with a Lua runtime.
+"""
+from __future__ import annotations
+
+import re
+from typing import Any
+
+from tibiawikisql.errors import LuaDataError
+
+token_pattern = re.compile(
+    r"""
+    (?P<space>\s+|--\[(?P<comment_level>=*)\[.*?\](?P=comment_level)\]|--[^\n]*)
+    |(?P<long_string>\[(?P<string_level>=*)\[.*?\](?P=string_level)\])
+    |(?P<string>"(?:[^"\\\n]|\\.)*"|'(?:[^'\\\n]|\\.)*')
+    |(?P<number>0[xX][0-9a-fA-F]+|(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+    |(?P<name>[A-Za-z_]\w*)
+    |(?P<symbol>[{}\[\]=,;-])
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+escape_pattern = re.compile(r"\\(\d{1,3}|.)", re.DOTALL)
+
+ESCAPES = {
+    "a": "\a",
+    "b": "\b",
+    "f": "\f",
+    "n": "\n",
+    "r": "\r",
+    "t": "\t",
+    "v": "\v",
+    "\\": "\\",
+    '"': '"',
+    "'": "'",
+    "\n": "\n",
+}
+CONSTANTS = {"true": True, "false": False, "nil": None}
+
+
+def _unescape(match: re.Match) -> str:
+    escape = match.group(1)
+    if escape.isdigit() and int(escape) < 128:
+        return chr(int(escape))
+    if escape in ESCAPES:
+        return ESCAPES[escape]
+    msg = f"unsupported escape sequence: \\{escape}"
+    raise LuaDataError(msg)
+
+
+def tokenize(source: str) -> list[tuple[str, str]]:
+    """Split a Lua chunk into tokens, skipping whitespace and comments.
+
+    Args:
+        source: The Lua source code.
+
+    Returns:
+        A list of tuples containing each token's kind and text.
+
+    Raises:
+        LuaDataError: The source contains characters that are not supported.
+
+    """
+    tokens = []
+    position = 0
+    while position < len(source):
+        match = token_pattern.match(source, position)
+        if match is None:
+            msg = f"unexpected character at position {position}: {source[position]!r}"
+            raise LuaDataError(msg)
+        if match.lastgroup != "space":
+            tokens.append((match.lastgroup, match.group()))
+        position = match.end()
+    return tokens
+
+
+class _Parser:
+    def __init__(self, tokens: list[tuple[str, str]]) -> None:
+        self.tokens = tokens
+        self.position = 0
+
+    def peek(self, offset: int = 0) -> tuple[str | None, str | None]:
+        index = self.position + offset
+        return self.tokens[index] if index < len(self.tokens) else (None, None)
+
+    def next(self) -> tuple[str | None, str | None]:
+        token = self.peek()
+        self.position += 1
+        return token
+
+    def expect(self, text: str) -> None:
+        _, value = self.next()
+        if value != text:
+            msg = f"expected {text!r}, got {value!r}"
+            raise LuaDataError(msg)
+
+    def parse_chunk(self) -> Any:
+        self.expect("return")
+        value = self.parse_value()
+        if self.peek()[1] == ";":
+            self.next()
+        if self.peek()[0] is not None:
+            msg = f"unexpected token after return value: {self.peek()[1]!r}"
+            raise LuaDataError(msg)
+        return value
+
+    def parse_value(self) -> Any:
+        kind, value = self.next()
+        if value == "{":
+            return self.parse_table()
+        if kind == "string":
+            return escape_pattern.sub(_unescape, value[1:-1])
+        if kind == "long_string":
+            level = value.index("[", 1) + 1
+            content = value[level:-level]
+            return content.removeprefix("\r\n").removeprefix("\n")
+        if kind == "number":
+            return self.parse_number(value)
+        if value == "-" and self.peek()[0] == "number":
+            return -self.parse_number(self.next()[1])
+        if kind == "name" and value in CONSTANTS:
+            return CONSTANTS[value]
+        msg = f"unsupported expression: {value!r}"
+        raise LuaDataError(msg)
+
+    @staticmethod
+    def parse_number(value: str) -> int | float:
+        if value[:2].lower() == "0x":
+            return int(value, 16)
+        if "." in value or "e" in value.lower():
+            return float(value)
+        return int(value)
+
+    def parse_table(self) -> dict[Any, Any] | list[Any]:
+        table = {}
+        index = 1
+        while self.peek()[1] != "}":
+            kind, value = self.peek()
+            if value == "[":
+                self.next()
+                key = self.parse_value()
+                self.expect("]")
+                self.expect("=")
+            elif kind == "name" and value not in CONSTANTS and self.peek(1)[1] == "=":
+                key = value
+                self.position += 2
+            else:
+                key = index
+                index += 1
+            item = self.parse_value()
+            if item is not None:
+                table[key] = item
+            if self.peek()[1] in {",", ";"}:
+                self.next()
+            elif self.peek()[1] != "}":
+                msg = f"expected ',' or '}}', got {self.peek()[1]!r}"
+                raise LuaDataError(msg)
+        self.next()
+        if list(table) == list(range(1, len(table) + 1)) and table:
+            return list(table.values())
+        return table
+
+
+def parse_lua_data(source: str) -> Any:
+    """Parse a Lua chunk that returns a data table into Python objects.
+
+    Tables whose keys are the consecutive integers starting from 1 are converted to lists, other tables are
+    converted to dictionaries. Fields with ``nil`` values are omitted, like in Lua.
+
+    Args:
+        source: The Lua source code.
+
+    Returns:
+        The returned value, converted to Python objects.
+
+    Raises:
+        LuaDataError: The chunk contains syntax other than a return statement with literal values.
+
+    """
+    return _Parser(tokenize(source)).parse_chunk()
@@ -0,0 +1,267 @@
+"""Lightweight in-process metrics, exposed in the Prometheus text format."""
+from __future__ import annotations
+
+import bisect
+import math
+import threading
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+"""The media type of the rendered metrics."""
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+"""The default upper bounds of histogram buckets, in seconds."""
+
+Sample = tuple[str, tuple[tuple[str, str], ...], float]
+
+
+def escape_label_value(value: str) -> str:
+    """Escape a label value to be used in the text format."""
+    return value.replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n")
+
+
+def format_value(value: float) -> str:
+    """Format a sample value for the text format."""
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def format_sample(name: str, labels: tuple[tuple[str, str], ...], value: float) -> str:
+    """Format a sample as a line of the text format."""
+    if not labels:
+        return f"{name} {format_value(value)}"
+    label_str = ",".join(f'{key}="{escape_label_value(str(label))}"' for key, label in labels)
+    return f"{name}{{{label_str}}} {format_value(value)}"
+
+
+class Metric:
+    """Base class for metrics, identified by their name and the names of their labels."""
+
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> None:
+        """Create an instance of the class.
+
+        Args:
+            name: The name of the metric.
+            documentation: A description of the metric.
+            labelnames: The names of the labels of the metric.
+
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, str]) -> tuple[tuple[str, str], ...]:
+        if set(labels) != set(self.labelnames):
+            msg = f"Metric {self.name} expects labels {self.labelnames}, got {tuple(labels)}."
+            raise ValueError(msg)
+        return tuple((name, str(labels[name])) for name in self.labelnames)
+
+    def samples(self) -> list[Sample]:
+        """Get the current samples of the metric."""
+        raise NotImplementedError
+
+    def render(self) -> str:
+        """Render the metric in the text format."""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        lines.extend(format_sample(name, labels, value) for name, labels, value in self.samples())
+        return "\n".join(lines)
+
+
+class _ValueMetric(Metric):
+    """A metric holding a single value per combination of label values, optionally read from a function."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        function: Callable[[], float | dict[tuple[str, ...], float]] | None = None,
+    ) -> None:
+        """Create an instance of the class.
+
+        Args:
+            name: The name of the metric.
+            documentation: A description of the metric.
+            labelnames: The names of the labels of the metric.
+            function: A function returning the current value, called when the metric is collected, for values kept
+                elsewhere. If the metric has labels, it returns a mapping of tuples of label values to values.
+
+        """
+        super().__init__(name, documentation, labelnames)
+        self.function = function
+        self._values: dict[tuple[tuple[str, str], ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        """Increase the value of the metric.
+
+        Args:
+            amount: The amount to increase the value by.
+            **labels: The values of the labels.
+
+        """
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels: str) -> float:
+        """Get the current value of the metric."""
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> list[Sample]:
+        """Get the current samples of the metric."""
+        if self.function is None:
+            with self._lock:
+                return [(self.name, key, value) for key, value in self._values.items()]
+        value = self.function()
+        if not isinstance(value, dict):
+            return [(self.name, (), value)]
+        return [
+            (self.name, tuple(zip(self.labelnames, map(str, label_values), strict=True)), sample_value)
+            for label_values, sample_value in value.items()
+        ]
+
+
+class Counter(_ValueMetric):
+    """A value that only increases, such as the number of requests served."""
+
+    type = "counter"
+
+
+class Gauge(_ValueMetric):
+    """A value that can go up and down, such as the number of open connections."""
+
+    type = "gauge"
+
+    def set(self, value: float, **labels: str) -> None:
+        """Set the value of the gauge."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def dec(self, amount: float = 1, **labels: str) -> None:
+        """Decrease the value of the gauge."""
+        self.inc(-amount, **labels)
+
+
+class Histogram(Metric):
+    """Counts observed values in buckets, such as the latency of requests."""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        """Create an instance of the class.
+
+        Args:
+            name: The name of the metric.
+            documentation: A description of the metric.
+            labelnames: The names of the labels of the metric.
+            buckets: The upper bounds of the buckets, in increasing order.
+
+        """
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._counts: dict[tuple[tuple[str, str], ...], list[int]] = {}
+        self._sums: dict[tuple[tuple[str, str], ...], float] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        """Record an observed value.
+
+        Args:
+            value: The observed value.
+            **labels: The values of the labels.
+
+        """
+        key = self._key(labels)
+        with self._lock:
+            counts = self._counts.setdefault(key, [0] * (len(self.buckets) + 1))
+            counts[bisect.bisect_left(self.buckets, value)] += 1
+            self._sums[key] = self._sums.get(key, 0) + value
+
+    def samples(self) -> list[Sample]:
+        """Get the current samples of the metric."""
+        samples = []
+        with self._lock:
+            for key, counts in self._counts.items():
+                cumulative = 0
+                for bound, count in zip((*self.buckets, math.inf), counts, strict=True):
+                    cumulative += count
+                    samples.append((f"{self.name}_bucket", (*key, ("le", format_value(bound))), cumulative))
+                samples.append((f"{self.name}_sum", key, self._sums[key]))
+                samples.append((f"{self.name}_count", key, cumulative))
+        return samples
+
+
+class MetricsRegistry:
+    """A collection of metrics, rendered together."""
+
+    def __init__(self) -> None:
+        """Create an instance of the class."""
+        self.metrics: dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        """Add a metric to the registry.
+
+        Raises:
+            ValueError: There is already a metric with the same name.
+
+        """
+        if metric.name in self.metrics:
+            msg = f"Duplicated metric: {metric.name}."
+            raise ValueError(msg)
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        function: Callable[[], float | dict[tuple[str, ...], float]] | None = None,
+    ) -> Counter:
+        """Create and register a counter."""
+        metric = Counter(name, documentation, labelnames, function)
+        self.register(metric)
+        return metric
+
+    def gauge(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        function: Callable[[], float | dict[tuple[str, ...], float]] | None = None,
+    ) -> Gauge:
+        """Create and register a gauge."""
+        metric = Gauge(name, documentation, labelnames, function)
+        self.register(metric)
+        return metric
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """Create and register a histogram."""
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self.register(metric)
+        return metric
+
+    def render(self) -> str:
+        """Render all the metrics in the text format."""
+        return "\n".join(metric.render() for metric in self.metrics.values()) + "\n"
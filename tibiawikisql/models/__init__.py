@@ -3,6 +3,8 @@
 from tibiawikisql.models.achievement import Achievement
 from tibiawikisql.models.charm import Charm
 from tibiawikisql.models.creature import Creature, CreatureAbility, CreatureDrop, CreatureMaxDamage
+from tibiawikisql.models.document import Document
+from tibiawikisql.models.fuzzy import FuzzyMatch
 from tibiawikisql.models.house import House
 from tibiawikisql.models.imbuement import Imbuement, ImbuementMaterial
 from tibiawikisql.models.item import Book, Item, ItemAttribute, ItemProficiencyPerk, ItemStoreOffer, Key
@@ -10,6 +12,66 @@ from tibiawikisql.models.mount import Mount
 from tibiawikisql.models.npc import Npc, NpcDestination, NpcOffer, RashidPosition
 from tibiawikisql.models.outfit import Outfit, OutfitImage, OutfitQuest
 from tibiawikisql.models.quest import Quest, QuestDanger, QuestReward
+from tibiawikisql.models.search import SearchResult
 from tibiawikisql.models.spell import Spell
+from tibiawikisql.models.summary import CreatureLootValue, ItemDropSource, ItemPrice
 from tibiawikisql.models.update import Update
 from tibiawikisql.models.world import World
+
+__all__ = (
+    "ARTICLE_MODELS",
+    "Achievement",
+    "Book",
+    "Charm",
+    "Creature",
+    "CreatureAbility",
+    "CreatureDrop",
+    "CreatureLootValue",
+    "CreatureMaxDamage",
+    "Document",
+    "FuzzyMatch",
+    "House",
+    "Imbuement",
+    "ImbuementMaterial",
+    "Item",
+    "ItemAttribute",
+    "ItemDropSource",
+    "ItemPrice",
+    "ItemProficiencyPerk",
+    "ItemStoreOffer",
+    "Key",
+    "Mount",
+    "Npc",
+    "NpcDestination",
+    "NpcOffer",
+    "Outfit",
+    "OutfitImage",
+    "OutfitQuest",
+    "Quest",
+    "QuestDanger",
+    "QuestReward",
+    "RashidPosition",
+    "SearchResult",
+    "Spell",
+    "Update",
+    "World",
+)
+
+ARTICLE_MODELS = {
+    "achievements": Achievement,
+    "books": Book,
+    "charms": Charm,
+    "creatures": Creature,
+    "houses": House,
+    "imbuements": Imbuement,
+    "items": Item,
+    "keys": Key,
+    "mounts": Mount,
+    "npcs": Npc,
+    "outfits": Outfit,
+    "quests": Quest,
+    "spells": Spell,
+    "updates": Update,
+    "worlds": World,
+}
+"""The models of every type of article, by the name used to refer to them in the API and command line."""
@@ -1,16 +1,166 @@
 """Module with base classes used by models."""
 from __future__ import annotations
 
+import copy
+import datetime
+import functools
+import operator
+import types
+from dataclasses import dataclass
 from sqlite3 import Connection, Cursor, Row
-from typing import Any, ClassVar, TYPE_CHECKING
+from typing import Any, ClassVar, TYPE_CHECKING, TypeVar, Union, get_args, get_origin
 
 from pydantic import BaseModel, Field
+from pydantic_core import PydanticUndefined
 
-from tibiawikisql.database import Table
+from tibiawikisql.database import CompressedText, Table
+from tibiawikisql.models.fuzzy import query_fuzzy_candidates
+from tibiawikisql.schema import ImageTable
 
 if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator, Mapping
+
     from typing_extensions import Self
 
+M = TypeVar("M", bound=BaseModel)
+
+_IMMUTABLE_DEFAULTS = (type(None), bool, int, float, str, bytes, tuple, frozenset)
+
+
+def _parse_datetime(value: Any) -> Any:
+    return datetime.datetime.fromisoformat(value) if isinstance(value, str) else value
+
+
+def _parse_date(value: Any) -> Any:
+    return datetime.date.fromisoformat(value) if isinstance(value, str) else value
+
+
+def _get_row_converter(annotation: Any) -> Callable[[Any], Any] | None:
+    """Get the function converting a value stored in SQLite to the type of a field, if it needs converting."""
+    if get_origin(annotation) in {Union, types.UnionType}:
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        if len(args) != 1:
+            return None
+        annotation = args[0]
+    if annotation is datetime.datetime:
+        return _parse_datetime
+    if annotation is datetime.date:
+        return _parse_date
+    if annotation is bool:
+        return bool
+    if annotation is float:
+        return float
+    return None
+
+
+@functools.cache
+def _get_field_plans(model: type[BaseModel]) -> dict[str, tuple[Callable[[Any], Any] | None, Any, Any]]:
+    """Get the function converting the stored value, the default value and the default factory of every field."""
+    column_map = getattr(getattr(model, "table", None), "column_map", {})
+    plans = {}
+    for name, field in model.model_fields.items():
+        factory = field.default_factory
+        default = field.default
+        if factory is None and default is not PydanticUndefined and not isinstance(default, _IMMUTABLE_DEFAULTS):
+            # Like pydantic, empty collections are copied by creating new ones, which is much cheaper.
+            is_empty_collection = type(default) in {list, dict, set} and not default
+            factory = type(default) if is_empty_collection else functools.partial(copy.deepcopy, default)
+        column = column_map.get(name)
+        if column is not None and isinstance(column.column_type, CompressedText):
+            converter = CompressedText.decompress
+        else:
+            converter = _get_row_converter(field.annotation)
+        plans[name] = (converter, default, factory)
+    return plans
+
+
+@dataclass(frozen=True)
+class _RowPlan:
+    """How rows with the same columns are turned into the fields of a model."""
+
+    converters: tuple[tuple[int, Callable[[Any], Any]], ...]
+    """The positions of the values that need converting, and the function converting them."""
+    defaults: tuple[Any, ...]
+    """The default values of the fields missing from the rows."""
+    factories: tuple[Callable[[], Any], ...]
+    """The default factories of the fields missing from the rows."""
+    names: tuple[str, ...]
+    """The names of the fields, in order."""
+    getter: Callable[[list[Any]], tuple[Any, ...]]
+    """Gets the values of the fields in order, from the row's values followed by the defaults and factories' values."""
+    fields_set: frozenset[str]
+    """The fields present in the rows."""
+
+
+def _get_items(*positions: int) -> Callable[[list[Any]], tuple[Any, ...]]:
+    if len(positions) == 1:
+        position = positions[0]
+        return lambda values: (values[position],)
+    return operator.itemgetter(*positions)
+
+
+@functools.cache
+def _get_row_plan(model: type[BaseModel], columns: tuple[str, ...]) -> _RowPlan:
+    field_plans = _get_field_plans(model)
+    column_positions = {column: position for position, column in enumerate(columns) if column in field_plans}
+    converters = []
+    defaults = []
+    factories = []
+    missing_positions = {}
+    for name, (converter, default, factory) in field_plans.items():
+        if name in column_positions:
+            if converter is not None:
+                converters.append((column_positions[name], converter))
+        elif factory is None and default is not PydanticUndefined:
+            missing_positions[name] = len(columns) + len(defaults)
+            defaults.append(default)
+    for name, (_, _, factory) in field_plans.items():
+        if name not in column_positions and factory is not None:
+            missing_positions[name] = len(columns) + len(defaults) + len(factories)
+            factories.append(factory)
+    positions = {**column_positions, **missing_positions}
+    names = tuple(name for name in field_plans if name in positions)
+    return _RowPlan(
+        converters=tuple(converters),
+        defaults=tuple(defaults),
+        factories=tuple(factories),
+        names=names,
+        getter=_get_items(*(positions[name] for name in names)),
+        fields_set=frozenset(column_positions),
+    )
+
+
+def construct_from_row(model: type[M], row: Row | Mapping[str, Any]) -> M:
+    """Create an instance of a model from a database row, without validating it.
+
+    Rows are validated when they are written, so they are trusted when read back. Only the conversions that SQLite
+    can't do by itself are applied, e.g. ISO 8601 strings to dates and ``0``/``1`` to booleans, and compressed text
+    columns are decompressed. Fields missing from the row take their default values, and columns that aren't fields
+    are ignored.
+
+    Args:
+        model: The class of the model.
+        row: A row or dictionary containing the field values.
+
+    Returns:
+        An instance of the model, equal to the one validating the row would create.
+
+    """
+    if isinstance(row, Row):
+        plan = _get_row_plan(model, tuple(row.keys()))
+        values = list(row)
+    else:
+        plan = _get_row_plan(model, tuple(row))
+        values = list(row.values())
+    for position, converter in plan.converters:
+        value = values[position]
+        if value is not None:
+            values[position] = converter(value)
+    values.extend(plan.defaults)
+    values.extend(factory() for factory in plan.factories)
+    fields = dict(zip(plan.names, plan.getter(values), strict=True)) if plan.names else {}
+    return model.model_construct(_fields_set=set(plan.fields_set), **fields)
+
 
 class WithStatus(BaseModel):
     """Adds the status field to a model."""
@@ -27,10 +177,27 @@ class WithVersion(BaseModel):
 
 
 class WithImage(BaseModel):
-    """Adds the image field to a model."""
+    """Adds the image fields to a model."""
 
+    image_hash: str | None = None
+    """The SHA-256 hash of the image representing this article, used as its key in the `image` table."""
     image: bytes | None = Field(None, exclude=True)
-    """An image representing this article."""
+    """An image representing this article. Not loaded from the database until [load_image][] is called."""
+
+    def load_image(self, conn: Connection | Cursor) -> bytes | None:
+        """Load the image of the article from the database, if not loaded yet.
+
+        Args:
+            conn: A connection or cursor of the database.
+
+        Returns:
+            The image's content, or [None][] if the article has no image.
+
+        """
+        if self.image is None and self.image_hash is not None:
+            row = ImageTable.get_one_by_field(conn, "hash", self.image_hash)
+            self.image = row["content"] if row else None
+        return self.image
 
 
 class RowModel(BaseModel):
@@ -77,6 +244,9 @@ class RowModel(BaseModel):
     def from_row(cls, row: Row | dict[str, Any]) -> Self:
         """Return an instance of the model from a row or dictionary.
 
+        The values are trusted to come from the database, so they are not validated.
+        Use [model_validate][pydantic.BaseModel.model_validate] for untrusted data.
+
         Args:
             row: A dict representing a row or a Row object.
 
@@ -84,9 +254,7 @@ class RowModel(BaseModel):
             An instance of the class, based on the row.
 
         """
-        if isinstance(row, Row):
-            row = dict(row)
-        return cls.model_validate(row)
+        return construct_from_row(cls, row)
 
     @classmethod
     def get_one_by_field(cls, conn: Connection | Cursor, field: str, value: Any, use_like: bool = False) -> Self | None:
@@ -106,7 +274,44 @@ class RowModel(BaseModel):
 
         """
         row = cls.table.get_one_by_field(conn, field, value, use_like)
-        return cls.from_row(row) if row else None
+        if not row:
+            return None
+        entry = cls.from_row(row)
+        cls.load_children(conn, [entry])
+        return entry
+
+    @classmethod
+    def load_children(cls, conn: Connection | Cursor, entries: list[Self]) -> None:
+        """Load the values found in child tables into several entries at once.
+
+        Models with child tables override this, getting the children of every entry with a single query per table.
+
+        Args:
+            conn: A connection or cursor of the database.
+            entries: The entries to load the values into.
+
+        """
+
+    @classmethod
+    def iter_all(cls, conn: Connection, batch_size: int = 500, *, with_children: bool = True) -> Iterator[Self]:
+        """Iterate over every entry of the table, including the values found in child tables.
+
+        Rows are fetched and their children loaded in batches, so memory usage doesn't grow with the table's size.
+
+        Args:
+            conn: A connection to the database.
+            batch_size: The number of entries fetched at once.
+            with_children: Whether to load the values found in child tables.
+
+        Yields:
+            Every entry of the table, in the order they are stored.
+
+        """
+        for rows in cls.table.iter_batches(conn, batch_size):
+            entries = [cls.from_row(row) for row in rows]
+            if with_children:
+                cls.load_children(conn, entries)
+            yield from entries
 
     @classmethod
     def get_list_by_field(
@@ -140,6 +345,29 @@ class RowModel(BaseModel):
         rows = cls.table.get_list_by_field(conn, field, value, use_like, sort_by, ascending)
         return [cls.from_row(r) for r in rows]
 
+    @classmethod
+    def find_closest(cls, conn: Connection | Cursor, name: str, limit: int = 5) -> list[Self]:
+        """Find the entries whose title or name are the closest to a name.
+
+        This uses the trigram index built by the optional `fuzzy_index` task, so it tolerates typos. Without the
+        index, no entries are found.
+
+        Note that this won't get values found in child tables.
+
+        Args:
+            conn: A connection or cursor of the database.
+            name: The name to look for, possibly misspelled.
+            limit: The maximum number of entries to return.
+
+        Returns:
+            The closest entries, from most to least similar.
+
+        """
+        candidates = query_fuzzy_candidates(conn, name, table=cls.table.__tablename__, limit=limit)
+        article_ids = [article_id for _, article_id, *_ in candidates]
+        rows = cls.table.get_list_by_values(conn, "article_id", article_ids)
+        return [cls.from_row(rows[article_id][0]) for article_id in article_ids if article_id in rows]
+
     @classmethod
     def get_by_id(cls, conn: Connection | Cursor, article_id: int) -> Self | None:
         """Get an entry by its article ID.
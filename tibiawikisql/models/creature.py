@@ -1,7 +1,6 @@
 import contextlib
 import sqlite3
 from sqlite3 import Connection, Cursor
-from typing import Any
 
 from pydantic import BaseModel, Field
 from pypika import Parameter, SQLLiteQuery as Query, Table
@@ -13,6 +12,7 @@ from tibiawikisql.models.base import (
     WithImage,
     WithStatus,
     WithVersion,
+    construct_from_row,
 )
 from tibiawikisql.schema import (
     CreatureAbilityTable,
@@ -239,7 +239,7 @@ class Creature(WikiEntry, WithStatus, WithVersion, WithImage, RowModel, table=Cr
     location: str | None
     """The locations where the creature can be found."""
     loot: list[CreatureDrop] = Field([])
-    """The items dropped by this creature."""
+    """The items dropped by this creature, from the highest chance to the lowest."""
 
     @property
     def bestiary_kills(self) -> int | None:
@@ -294,20 +294,17 @@ class Creature(WikiEntry, WithStatus, WithVersion, WithImage, RowModel, table=Cr
             CreatureMaxDamageTable.insert(conn, creature_id=self.article_id, **self.max_damage.model_dump())
 
     @classmethod
-    def get_one_by_field(cls, conn: Connection | Cursor, field: str, value: Any, use_like: bool = False) -> Self | None:
-        creature: Self = super().get_one_by_field(conn, field, value, use_like)
-        if creature is None:
-            return None
-        max_damage = CreatureMaxDamageTable.get_one_by_field(conn, "creature_id", creature.article_id)
-        if max_damage:
-            creature.max_damage = CreatureMaxDamage(**dict(max_damage))
-
-        sounds = CreatureSoundTable.get_list_by_field(conn, "creature_id", creature.article_id)
-        creature.sounds = [r["content"] for r in sounds]
-
-        abilities = CreatureAbilityTable.get_list_by_field(conn, "creature_id", creature.article_id)
-        creature.abilities = [CreatureAbility(**dict(r)) for r in abilities]
-
-        drops = CreatureDropTable.get_by_creature_id(conn, creature.article_id)
-        creature.loot = [CreatureDrop(**dict(r)) for r in drops]
-        return creature
+    def load_children(cls, conn: Connection | Cursor, entries: list[Self]) -> None:
+        article_ids = [creature.article_id for creature in entries]
+        max_damages = CreatureMaxDamageTable.get_list_by_values(conn, "creature_id", article_ids)
+        sounds = CreatureSoundTable.get_list_by_values(conn, "creature_id", article_ids)
+        abilities = CreatureAbilityTable.get_list_by_values(conn, "creature_id", article_ids)
+        drops = CreatureDropTable.get_by_creature_ids(conn, article_ids)
+        for creature in entries:
+            if max_damage := max_damages.get(creature.article_id):
+                creature.max_damage = construct_from_row(CreatureMaxDamage, max_damage[0])
+            creature.sounds = [r["content"] for r in sounds.get(creature.article_id, [])]
+            creature.abilities = [
+                construct_from_row(CreatureAbility, r) for r in abilities.get(creature.article_id, [])
+            ]
+            creature.loot = [construct_from_row(CreatureDrop, r) for r in drops.get(creature.article_id, [])]
@@ -0,0 +1,85 @@
+import gzip
+from sqlite3 import Connection, Cursor
+
+from typing_extensions import Self
+
+from tibiawikisql.models.base import RowModel
+from tibiawikisql.schema import DocumentTable
+
+DOCUMENT_COMPRESSION_THRESHOLD = 1024
+"""Documents whose JSON is bigger than this number of bytes are stored compressed."""
+
+
+class Document(RowModel, table=DocumentTable):
+    """The serialized JSON representation of an article, precomputed when the database is generated.
+
+    The JSON is the same that would be obtained by getting the article's model and serializing it,
+    including the data of its child tables.
+    """
+
+    type: str
+    """The type of the article, e.g. ``items`` or ``creatures``."""
+    article_id: int
+    """The article ID of the article."""
+    title: str
+    """The title of the article."""
+    content: bytes
+    """The JSON document, compressed with gzip if `compressed` is set."""
+    compressed: bool
+    """Whether the content is compressed or not."""
+
+    def get_json(self) -> bytes:
+        """Get the JSON document, decompressing it if needed.
+
+        Returns:
+            The JSON document.
+
+        """
+        return gzip.decompress(self.content) if self.compressed else self.content
+
+    @classmethod
+    def from_model(
+            cls,
+            type_: str,
+            model: RowModel,
+            compression_threshold: int = DOCUMENT_COMPRESSION_THRESHOLD,
+    ) -> Self:
+        """Serialize a model into a document.
+
+        Args:
+            type_: The type of the article.
+            model: The model of the article, with the data of its child tables loaded.
+            compression_threshold: Documents bigger than this number of bytes are compressed.
+
+        Returns:
+            The document of the article.
+
+        """
+        content = model.model_dump_json().encode()
+        compressed = len(content) > compression_threshold
+        if compressed:
+            content = gzip.compress(content, mtime=0)
+        return cls(type=type_, article_id=model.article_id, title=model.title, content=content, compressed=compressed)
+
+    @classmethod
+    def get_by_type_and_title(cls, conn: Connection | Cursor, type_: str, title: str) -> Self | None:
+        """Get the document of an article by its type and title.
+
+        Args:
+            conn: A connection to the database.
+            type_: The type of the article.
+            title: The title of the article.
+
+        Returns:
+            The document of the article, or [None][] if there is no document for it.
+
+        """
+        table = cls.table.__tablename__
+        row = conn.execute(
+            f"SELECT type, article_id, title, content, compressed FROM {table} WHERE type = ? AND title = ?",  # noqa: S608
+            (type_, title),
+        ).fetchone()
+        if row is None:
+            return None
+        type_, article_id, title, content, compressed = row
+        return cls(type=type_, article_id=article_id, title=title, content=content, compressed=compressed)
@@ -0,0 +1,156 @@
+import difflib
+import re
+from sqlite3 import Connection, Cursor
+
+from pydantic import BaseModel
+from typing_extensions import Self
+
+from tibiawikisql.schema import FuzzyNameTable, FuzzyTrigramTable
+
+NON_ALPHANUMERIC_PATTERN = re.compile(r"[^\w]+")
+
+CANDIDATES_PER_RESULT = 10
+"""How many candidates sharing trigrams are ranked for every result requested."""
+
+MIN_CANDIDATES = 50
+"""The minimum number of candidates sharing trigrams that are ranked."""
+
+
+def normalize_name(value: str) -> str:
+    """Normalize a name for fuzzy comparisons.
+
+    Args:
+        value: The name to normalize.
+
+    Returns:
+        The name in lowercase, with punctuation replaced by single spaces.
+
+    """
+    return NON_ALPHANUMERIC_PATTERN.sub(" ", value.casefold()).strip()
+
+
+def get_trigrams(value: str) -> set[str]:
+    """Get the set of trigrams of a name.
+
+    Words are padded with spaces, so matching beginnings and ends of words weigh more.
+
+    Args:
+        value: The name to get the trigrams of.
+
+    Returns:
+        The distinct trigrams of the normalized name.
+
+    """
+    trigrams = set()
+    for word in normalize_name(value).split():
+        padded = f"  {word} "
+        trigrams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return trigrams
+
+
+def similarity(a: str, b: str) -> float:
+    """Get the similarity ratio between two names, from 0 to 1.
+
+    Args:
+        a: The first name.
+        b: The second name.
+
+    Returns:
+        The similarity ratio of the normalized names.
+
+    """
+    return difflib.SequenceMatcher(None, normalize_name(a), normalize_name(b)).ratio()
+
+
+def query_fuzzy_candidates(
+        conn: Connection | Cursor,
+        name: str,
+        *,
+        types: list[str] | None = None,
+        table: str | None = None,
+        limit: int = 5,
+) -> list[tuple[str, int, str, str, float]]:
+    """Find the indexed names closest to a name.
+
+    Candidates are obtained using the trigram index, so only names sharing at least one trigram are considered.
+    The best candidates by trigram similarity are then ranked by their actual similarity.
+
+    Args:
+        conn: A connection to the database.
+        name: The name to look for.
+        types: Only consider articles of these types.
+        table: Only consider articles found in this table.
+        limit: The maximum number of articles to return.
+
+    Returns:
+        A list of tuples containing the type, article ID, title, matched value and similarity score of the
+        closest articles, from most to least similar.
+
+    """
+    trigrams = get_trigrams(name)
+    if not trigrams:
+        return []
+    names = FuzzyNameTable.__tablename__
+    sql = [
+        "SELECT n.type, n.article_id, n.title, n.value,",
+        "COUNT(*) * 1.0 / (n.trigram_count + ? - COUNT(*)) AS jaccard",
+        f"FROM {FuzzyTrigramTable.__tablename__} t JOIN {names} n ON n.id = t.name_id",
+    ]
+    params: list = [len(trigrams)]
+    if table:
+        sql.append(f"JOIN {table} e ON e.article_id = n.article_id")
+    sql.append(f"WHERE t.trigram IN ({', '.join('?' for _ in trigrams)})")
+    params.extend(trigrams)
+    if types:
+        sql.append(f"AND n.type IN ({', '.join('?' for _ in types)})")
+        params.extend(types)
+    sql.append("GROUP BY t.name_id ORDER BY jaccard DESC LIMIT ?")
+    params.append(max(limit * CANDIDATES_PER_RESULT, MIN_CANDIDATES))
+    best: dict[tuple[str, int], tuple[str, int, str, str, float]] = {}
+    for type_, article_id, title, value, _ in conn.execute(" ".join(sql), params):
+        score = similarity(name, value)
+        current = best.get((type_, article_id))
+        if current is None or score > current[4]:
+            best[(type_, article_id)] = (type_, article_id, title, value, score)
+    return sorted(best.values(), key=lambda c: c[4], reverse=True)[:limit]
+
+
+class FuzzyMatch(BaseModel):
+    """An article whose title or name is similar to a looked up name."""
+
+    type: str
+    """The type of the article, e.g. ``items`` or ``creatures``."""
+    article_id: int
+    """The article ID of the matching article."""
+    title: str
+    """The title of the matching article."""
+    matched: str
+    """The title or name that matched the lookup."""
+    score: float
+    """The similarity between the looked up name and the matched value, from 0 to 1."""
+
+    @classmethod
+    def find(
+            cls,
+            conn: Connection | Cursor,
+            name: str,
+            *,
+            types: list[str] | None = None,
+            limit: int = 5,
+    ) -> list[Self]:
+        """Find the articles whose title or name are closest to a name.
+
+        Args:
+            conn: A connection to the database.
+            name: The name to look for, possibly misspelled.
+            types: Only return articles of these types.
+            limit: The maximum number of results to return.
+
+        Returns:
+            The closest articles, from most to least similar.
+
+        """
+        return [
+            cls(type=type_, article_id=article_id, title=title, matched=value, score=score)
+            for type_, article_id, title, value, score in query_fuzzy_candidates(conn, name, types=types, limit=limit)
+        ]
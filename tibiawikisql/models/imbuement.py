@@ -1,13 +1,12 @@
 import contextlib
 from sqlite3 import Connection, Cursor, IntegrityError
-from typing import Any
 
 from pydantic import BaseModel, Field
 from pypika import Parameter, SQLLiteQuery as Query
 from typing_extensions import Self
 
 from tibiawikisql.api import WikiEntry
-from tibiawikisql.models.base import RowModel, WithImage, WithStatus, WithVersion
+from tibiawikisql.models.base import RowModel, WithImage, WithStatus, WithVersion, construct_from_row
 from tibiawikisql.schema import ImbuementMaterialTable, ImbuementTable, ItemTable
 
 class Material(BaseModel):
@@ -83,9 +82,7 @@ class Imbuement(WikiEntry, WithStatus, WithVersion, WithImage, RowModel, table=I
             material.insert(conn, self.article_id)
 
     @classmethod
-    def get_one_by_field(cls, conn: Connection | Cursor, field: str, value: Any, use_like: bool = False) -> Self | None:
-        imbuement: Self = super().get_one_by_field(conn, field, value, use_like)
-        if imbuement is None:
-            return None
-        imbuement.materials = [Material(**dict(r)) for r in ImbuementMaterialTable.get_by_imbuement_id(conn, imbuement.article_id)]
-        return imbuement
+    def load_children(cls, conn: Connection | Cursor, entries: list[Self]) -> None:
+        materials = ImbuementMaterialTable.get_by_imbuement_ids(conn, [imbuement.article_id for imbuement in entries])
+        for imbuement in entries:
+            imbuement.materials = [construct_from_row(Material, r) for r in materials.get(imbuement.article_id, [])]
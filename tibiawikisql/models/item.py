@@ -1,5 +1,4 @@
 from sqlite3 import Connection, Cursor
-from typing import Any
 
 import pydantic
 from pydantic import BaseModel, Field
@@ -9,7 +8,7 @@ from pypika.terms import LiteralValue, ValueWrapper
 from typing_extensions import Self
 
 from tibiawikisql.api import WikiEntry
-from tibiawikisql.models.base import RowModel, WithImage, WithStatus, WithVersion
+from tibiawikisql.models.base import RowModel, WithImage, WithStatus, WithVersion, construct_from_row
 from tibiawikisql.schema import (
     BookTable,
     CreatureDropTable,
@@ -156,7 +155,7 @@ class Item(WikiEntry, WithVersion, WithStatus, WithImage, RowModel, table=ItemTa
     attributes: list[ItemAttribute] = Field(default_factory=list)
     """The item's attributes."""
     dropped_by: list[ItemDrop] = Field(default_factory=list)
-    """List of creatures that drop this item, with the chances."""
+    """List of creatures that drop this item, with the chances, from the highest chance to the lowest."""
     sold_by: list[ItemOffer] = Field(default_factory=list)
     """List of NPCs that sell this item."""
     bought_by: list[ItemOffer] = Field(default_factory=list)
@@ -289,52 +288,27 @@ class Item(WikiEntry, WithVersion, WithStatus, WithImage, RowModel, table=ItemTa
             ItemStoreOfferTable.insert(conn, item_id=self.article_id, **offer.model_dump())
 
     @classmethod
-    def get_one_by_field(cls, conn: Connection | Cursor, field: str, value: Any, use_like: bool = False) -> Self | None:
-        item: Self = super().get_one_by_field(conn, field, value, use_like)
-        if not item:
-            return None
-        attributes = ItemAttributeTable.get_list_by_field(conn, "item_id", item.article_id)
-        item.attributes = [ItemAttribute(**(dict(row))) for row in attributes]
-
-        dropped_by = CreatureDropTable.get_by_item_id(conn, item.article_id)
-        item.dropped_by = [ItemDrop(**dict(r)) for r in dropped_by]
-
-        store_offers = ItemStoreOfferTable.get_list_by_field(conn, "item_id", item.article_id)
-        item.store_offers = [ItemStoreOffer(**dict(r)) for r in store_offers]
-
-        perks = ItemProficiencyPerkTable.get_list_by_field(
-            conn,
-            "item_id",
-            item.article_id,
-            sort_by="proficiency_level",
-        )
-        item.proficiency_perks = [ItemProficiencyPerk(**dict(r)) for r in perks]
-
-        sounds = ItemSoundTable.get_list_by_field(conn, "item_id", item.article_id)
-        item.sounds = [r["content"] for r in sounds]
-
-        item.bought_by = [
-            ItemOffer(
-                npc_id=r["npc_id"],
-                npc_title=r["npc_title"],
-                currency_id=r["currency_id"],
-                currency_title=r["currency_title"],
-                value=r["value"],
-            ) for r in NpcBuyingTable.get_by_item_id(conn, item.article_id)
-        ]
-        item.sold_by = [
-            ItemOffer(
-                npc_id=r["npc_id"],
-                npc_title=r["npc_title"],
-                currency_id=r["currency_id"],
-                currency_title=r["currency_title"],
-                value=r["value"],
-            ) for r in NpcSellingTable.get_by_item_id(conn, item.article_id)
-        ]
-
-        awarded_in = QuestRewardTable.get_list_by_item_id(conn, item.article_id)
-        item.awarded_in = [ItemQuestReward(**(dict(row))) for row in awarded_in]
-        return item
+    def load_children(cls, conn: Connection | Cursor, entries: list[Self]) -> None:
+        article_ids = [item.article_id for item in entries]
+        attributes = ItemAttributeTable.get_list_by_values(conn, "item_id", article_ids)
+        dropped_by = CreatureDropTable.get_by_item_ids(conn, article_ids)
+        store_offers = ItemStoreOfferTable.get_list_by_values(conn, "item_id", article_ids)
+        perks = ItemProficiencyPerkTable.get_list_by_values(conn, "item_id", article_ids, sort_by="proficiency_level")
+        sounds = ItemSoundTable.get_list_by_values(conn, "item_id", article_ids)
+        bought_by = NpcBuyingTable.get_by_item_ids(conn, article_ids)
+        sold_by = NpcSellingTable.get_by_item_ids(conn, article_ids)
+        awarded_in = QuestRewardTable.get_list_by_item_ids(conn, article_ids)
+        for item in entries:
+            item.attributes = [construct_from_row(ItemAttribute, r) for r in attributes.get(item.article_id, [])]
+            item.dropped_by = [construct_from_row(ItemDrop, r) for r in dropped_by.get(item.article_id, [])]
+            item.store_offers = [construct_from_row(ItemStoreOffer, r) for r in store_offers.get(item.article_id, [])]
+            item.proficiency_perks = [
+                construct_from_row(ItemProficiencyPerk, r) for r in perks.get(item.article_id, [])
+            ]
+            item.sounds = [r["content"] for r in sounds.get(item.article_id, [])]
+            item.bought_by = [construct_from_row(ItemOffer, r) for r in bought_by.get(item.article_id, [])]
+            item.sold_by = [construct_from_row(ItemOffer, r) for r in sold_by.get(item.article_id, [])]
+            item.awarded_in = [construct_from_row(ItemQuestReward, r) for r in awarded_in.get(item.article_id, [])]
 
 
 class Book(WikiEntry, WithStatus, WithVersion, RowModel, table=BookTable):
@@ -1,12 +1,11 @@
 import sqlite3
 from sqlite3 import Connection, Cursor
-from typing import Any
 
 from pydantic import BaseModel, Field
 from typing_extensions import Self
 
 from tibiawikisql.api import WikiEntry
-from tibiawikisql.models.base import RowModel, WithImage, WithStatus, WithVersion
+from tibiawikisql.models.base import RowModel, WithImage, WithStatus, WithVersion, construct_from_row
 from tibiawikisql.schema import NpcBuyingTable, NpcDestinationTable, NpcJobTable, NpcRaceTable, NpcSellingTable, \
     NpcTable
 
@@ -112,35 +111,21 @@ class Npc(WikiEntry, WithVersion, WithStatus, WithImage, RowModel, table=NpcTabl
             NpcRaceTable.insert(conn, npc_id=self.article_id, name=race)
 
     @classmethod
-    def get_one_by_field(cls, conn: Connection | Cursor, field: str, value: Any, use_like: bool = False) -> Self | None:
-        npc: Self = super().get_one_by_field(conn, field, value, use_like)
-        if npc is None:
-            return None
-        npc.jobs = [j["name"] for j in NpcJobTable.get_list_by_field(conn, "npc_id", npc.article_id)]
-        npc.races = [j["name"] for j in NpcRaceTable.get_list_by_field(conn, "npc_id", npc.article_id)]
-        npc.sell_offers = [
-            NpcOffer(
-                item_id=r["item_id"],
-                item_title=r["item_title"],
-                currency_id=r["currency_id"],
-                currency_title=r["currency_title"],
-                value=r["value"],
-            ) for r in NpcBuyingTable.get_by_npc_id(conn, npc.article_id)
-        ]
-        npc.buy_offers = [
-            NpcOffer(
-                item_id=r["item_id"],
-                item_title=r["item_title"],
-                currency_id=r["currency_id"],
-                currency_title=r["currency_title"],
-                value=r["value"],
-            ) for r in NpcSellingTable.get_by_npc_id(conn, npc.article_id)
-        ]
-        npc.destinations = [
-            NpcDestination.model_validate(dict(r))
-            for r in NpcDestinationTable.get_list_by_field(conn, "npc_id", npc.article_id)
-        ]
-        return npc
+    def load_children(cls, conn: Connection | Cursor, entries: list[Self]) -> None:
+        article_ids = [npc.article_id for npc in entries]
+        jobs = NpcJobTable.get_list_by_values(conn, "npc_id", article_ids)
+        races = NpcRaceTable.get_list_by_values(conn, "npc_id", article_ids)
+        sell_offers = NpcBuyingTable.get_by_npc_ids(conn, article_ids)
+        buy_offers = NpcSellingTable.get_by_npc_ids(conn, article_ids)
+        destinations = NpcDestinationTable.get_list_by_values(conn, "npc_id", article_ids)
+        for npc in entries:
+            npc.jobs = [j["name"] for j in jobs.get(npc.article_id, [])]
+            npc.races = [j["name"] for j in races.get(npc.article_id, [])]
+            npc.sell_offers = [construct_from_row(NpcOffer, r) for r in sell_offers.get(npc.article_id, [])]
+            npc.buy_offers = [construct_from_row(NpcOffer, r) for r in buy_offers.get(npc.article_id, [])]
+            npc.destinations = [
+                construct_from_row(NpcDestination, r) for r in destinations.get(npc.article_id, [])
+            ]
 
 
 rashid_positions = [
@@ -1,13 +1,12 @@
 import contextlib
 from sqlite3 import Connection, Cursor, IntegrityError
-from typing import Any
 
 from pydantic import BaseModel, Field
 from pypika import Parameter, SQLLiteQuery as Query, Table
 from typing_extensions import Self
 
 from tibiawikisql.api import WikiEntry
-from tibiawikisql.models.base import RowModel, WithImage, WithStatus, WithVersion
+from tibiawikisql.models.base import RowModel, WithImage, WithStatus, WithVersion, construct_from_row
 from tibiawikisql.schema import OutfitImageTable, OutfitQuestTable, OutfitTable, QuestTable
 
 class UnlockQuest(BaseModel):
@@ -102,10 +101,8 @@ class Outfit(WikiEntry, WithStatus, WithVersion, RowModel, table=OutfitTable):
             quest.insert(conn, self.article_id)
 
     @classmethod
-    def get_one_by_field(cls, conn: Connection | Cursor, field: str, value: Any, use_like: bool = False) -> Self | None:
-        outfit: Self = super().get_one_by_field(conn, field, value, use_like)
-        if outfit is None:
-            return None
-        outfit.quests = [UnlockQuest(**dict(r)) for r in OutfitQuestTable.get_list_by_outfit_id(conn, outfit.article_id)]
-        return outfit
+    def load_children(cls, conn: Connection | Cursor, entries: list[Self]) -> None:
+        quests = OutfitQuestTable.get_list_by_outfit_ids(conn, [outfit.article_id for outfit in entries])
+        for outfit in entries:
+            outfit.quests = [construct_from_row(UnlockQuest, r) for r in quests.get(outfit.article_id, [])]
 
@@ -1,14 +1,13 @@
 import contextlib
 import sqlite3
 from sqlite3 import Connection, Cursor
-from typing import Any
 
 from pydantic import BaseModel, Field
 from pypika import Parameter, SQLLiteQuery as Query
 from typing_extensions import Self
 
 from tibiawikisql.api import WikiEntry
-from tibiawikisql.models.base import RowModel, WithStatus, WithVersion
+from tibiawikisql.models.base import RowModel, WithStatus, WithVersion, construct_from_row
 from tibiawikisql.schema import (
     CreatureTable,
     ItemTable,
@@ -199,10 +198,10 @@ class Quest(WikiEntry, WithStatus, WithVersion, RowModel, table=QuestTable):
             danger.insert(conn, self.article_id)
 
     @classmethod
-    def get_one_by_field(cls, conn: Connection | Cursor, field: str, value: Any, use_like: bool = False) -> Self | None:
-        quest: Self = super().get_one_by_field(conn, field, value, use_like)
-        if quest is None:
-            return None
-        quest.rewards = [ItemReward(**dict(r)) for r in QuestRewardTable.get_list_by_quest_id(conn, quest.article_id)]
-        quest.dangers = [QuestCreature(**dict(r)) for r in QuestDangerTable.get_list_by_quest_id(conn, quest.article_id)]
-        return quest
+    def load_children(cls, conn: Connection | Cursor, entries: list[Self]) -> None:
+        article_ids = [quest.article_id for quest in entries]
+        rewards = QuestRewardTable.get_list_by_quest_ids(conn, article_ids)
+        dangers = QuestDangerTable.get_list_by_quest_ids(conn, article_ids)
+        for quest in entries:
+            quest.rewards = [construct_from_row(ItemReward, r) for r in rewards.get(quest.article_id, [])]
+            quest.dangers = [construct_from_row(QuestCreature, r) for r in dangers.get(quest.article_id, [])]
@@ -0,0 +1,88 @@
+import re
+from sqlite3 import Connection, Cursor, Row
+
+from typing_extensions import Self
+
+from tibiawikisql.models.base import RowModel
+from tibiawikisql.schema import SearchIndexTable
+
+SEARCH_TOKEN_PATTERN = re.compile(r"\w+")
+
+SEARCH_COLUMN_WEIGHTS = (10.0, 5.0, 1.0)
+"""The BM25 weights of the ``title``, ``name`` and ``content`` columns, in that order."""
+
+
+def build_match_query(query: str) -> str | None:
+    """Convert free text into a FTS5 ``MATCH`` expression.
+
+    Every word in the query is quoted, so FTS5 operators typed by users are treated as plain text,
+    and is matched as a prefix, so results are returned while a word is still being typed.
+
+    Args:
+        query: The text to search for.
+
+    Returns:
+        The ``MATCH`` expression, or [None][] if the query has no searchable words.
+
+    """
+    tokens = SEARCH_TOKEN_PATTERN.findall(query)
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+class SearchResult(RowModel, table=SearchIndexTable):
+    """An article matching a full-text search."""
+
+    type: str
+    """The type of the article, e.g. ``items`` or ``creatures``."""
+    article_id: int
+    """The article ID of the matching article."""
+    title: str
+    """The title of the matching article."""
+    name: str | None = None
+    """The name of the matching article, if any."""
+    rank: float | None = None
+    """The relevance of the result. Lower values are better matches."""
+
+    @classmethod
+    def search(
+            cls,
+            conn: Connection | Cursor,
+            query: str,
+            *,
+            types: list[str] | None = None,
+            limit: int = 20,
+    ) -> list[Self]:
+        """Search articles using the full-text search index.
+
+        The index is only populated when the ``search_index`` task was included when generating the database.
+
+        Args:
+            conn: A connection to the database.
+            query: The text to search for.
+            types: Only return results of these article types.
+            limit: The maximum number of results to return.
+
+        Returns:
+            The matching articles, from best to worst match.
+
+        """
+        match = build_match_query(query)
+        if match is None:
+            return []
+        table = cls.table.__tablename__
+        weights = ", ".join(str(w) for w in SEARCH_COLUMN_WEIGHTS)
+        sql = (
+            f"SELECT type, article_id, title, name, bm25({table}, {weights}) AS rank "  # noqa: S608
+            f"FROM {table} WHERE {table} MATCH ?"
+        )
+        params: list = [match]
+        if types:
+            sql += f" AND type IN ({', '.join('?' for _ in types)})"
+            params.extend(types)
+        sql += " ORDER BY rank LIMIT ?"
+        params.append(limit)
+        cursor = conn.cursor() if isinstance(conn, Connection) else conn
+        cursor.row_factory = Row
+        return [cls.from_row(row) for row in cursor.execute(sql, params)]
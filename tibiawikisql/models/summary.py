@@ -0,0 +1,182 @@
+from sqlite3 import Connection, Cursor, Row
+
+from typing_extensions import Self
+
+from tibiawikisql.models.base import RowModel
+from tibiawikisql.schema import CreatureLootValueTable, ItemDropSourceTable, ItemPriceTable
+
+
+class ItemPrice(RowModel, table=ItemPriceTable):
+    """The best NPC offers of an item in a currency.
+
+    Only available when the ``summaries`` task was included when generating the database.
+    """
+
+    item_id: int
+    """The article ID of the item."""
+    item_title: str
+    """The title of the item."""
+    currency_id: int
+    """The article ID of the currency used."""
+    currency_title: str
+    """The title of the currency used."""
+    sell_price: int | None = None
+    """The highest price an NPC buys the item for, if any NPC buys it."""
+    sell_npc_id: int | None = None
+    """The article ID of the NPC buying the item for the highest price."""
+    sell_npc_title: str | None = None
+    """The title of the NPC buying the item for the highest price."""
+    buy_price: int | None = None
+    """The lowest price an NPC sells the item for, if any NPC sells it."""
+    buy_npc_id: int | None = None
+    """The article ID of the NPC selling the item for the lowest price."""
+    buy_npc_title: str | None = None
+    """The title of the NPC selling the item for the lowest price."""
+
+    @classmethod
+    def get_by_item_id(cls, conn: Connection | Cursor, item_id: int) -> list[Self]:
+        """Get the best offers of an item, for every currency it is traded with.
+
+        Args:
+            conn: A connection to the database.
+            item_id: The article ID of the item.
+
+        Returns:
+            The best offers of the item, one per currency.
+
+        """
+        return cls.get_list_by_field(conn, "item_id", item_id, sort_by="currency_id")
+
+    @classmethod
+    def get_by_item_title(cls, conn: Connection | Cursor, title: str) -> list[Self]:
+        """Get the best offers of an item by its title, for every currency it is traded with.
+
+        Args:
+            conn: A connection to the database.
+            title: The title of the item.
+
+        Returns:
+            The best offers of the item, one per currency.
+
+        """
+        return cls.get_list_by_field(conn, "item_title", title, sort_by="currency_id")
+
+
+class ItemDropSource(RowModel, table=ItemDropSourceTable):
+    """A creature dropping an item, ranked among the item's other sources by its chance.
+
+    Only available when the ``summaries`` task was included when generating the database.
+    """
+
+    item_id: int
+    """The article ID of the dropped item."""
+    item_title: str
+    """The title of the dropped item."""
+    rank: int
+    """The position of the creature among the sources of the item, starting at 1 for the highest chance."""
+    creature_id: int
+    """The article ID of the creature."""
+    creature_title: str
+    """The title of the creature."""
+    chance: float | None = None
+    """The chance percentage of getting the item dropped by the creature."""
+    min: int
+    """The minimum possible amount of the dropped item."""
+    max: int
+    """The maximum possible amount of the dropped item."""
+
+    @classmethod
+    def get_by_item_id(cls, conn: Connection | Cursor, item_id: int, limit: int | None = None) -> list[Self]:
+        """Get the creatures dropping an item, from the highest chance to the lowest.
+
+        Args:
+            conn: A connection to the database.
+            item_id: The article ID of the item.
+            limit: Only return up to this many creatures.
+
+        Returns:
+            The sources of the item, in order.
+
+        """
+        rows = cls.table.get_list_by_field(conn, "item_id", item_id, sort_by="rank", limit=limit)
+        return [cls.from_row(row) for row in rows]
+
+    @classmethod
+    def get_by_item_title(cls, conn: Connection | Cursor, title: str, limit: int | None = None) -> list[Self]:
+        """Get the creatures dropping an item by its title, from the highest chance to the lowest.
+
+        Args:
+            conn: A connection to the database.
+            title: The title of the item.
+            limit: Only return up to this many creatures.
+
+        Returns:
+            The sources of the item, in order.
+
+        """
+        rows = cls.table.get_list_by_field(conn, "item_title", title, sort_by="rank", limit=limit)
+        return [cls.from_row(row) for row in rows]
+
+
+class CreatureLootValue(RowModel, table=CreatureLootValueTable):
+    """The expected value in gold of the loot of a creature.
+
+    Only available when the ``summaries`` task was included when generating the database.
+    """
+
+    creature_id: int
+    """The article ID of the creature."""
+    creature_title: str
+    """The title of the creature."""
+    loot_value: float
+    """The expected value of the loot of a single kill, in gold."""
+    drop_count: int
+    """The number of different items the creature drops."""
+    priced_drop_count: int
+    """The number of drops whose chance and value are known, the only ones counted in the loot value."""
+
+    @classmethod
+    def get_by_creature_id(cls, conn: Connection | Cursor, creature_id: int) -> Self | None:
+        """Get the loot value of a creature.
+
+        Args:
+            conn: A connection to the database.
+            creature_id: The article ID of the creature.
+
+        Returns:
+            The loot value of the creature, if found.
+
+        """
+        return cls.get_one_by_field(conn, "creature_id", creature_id)
+
+    @classmethod
+    def get_by_creature_title(cls, conn: Connection | Cursor, title: str) -> Self | None:
+        """Get the loot value of a creature by its title.
+
+        Args:
+            conn: A connection to the database.
+            title: The title of the creature.
+
+        Returns:
+            The loot value of the creature, if found.
+
+        """
+        return cls.get_one_by_field(conn, "creature_title", title)
+
+    @classmethod
+    def get_most_valuable(cls, conn: Connection | Cursor, limit: int = 10) -> list[Self]:
+        """Get the creatures with the most valuable loot.
+
+        Args:
+            conn: A connection to the database.
+            limit: The maximum number of creatures to return.
+
+        Returns:
+            The creatures, from the most valuable loot to the least.
+
+        """
+        table = cls.table.__tablename__
+        cursor = conn.cursor() if isinstance(conn, Connection) else conn
+        cursor.row_factory = Row
+        rows = cursor.execute(f"SELECT * FROM {table} ORDER BY loot_value DESC LIMIT ?", (limit,))  # noqa: S608
+        return [cls.from_row(row) for row in rows]
@@ -1,16 +1,81 @@
-from tibiawikisql.parsers.base import BaseParser, AttributeParser
-from tibiawikisql.parsers.achievement import AchievementParser
-from tibiawikisql.parsers.charm import CharmParser
-from tibiawikisql.parsers.spell import SpellParser
-from tibiawikisql.parsers.item import ItemParser
-from tibiawikisql.parsers.creature import CreatureParser
-from tibiawikisql.parsers.book import BookParser
-from tibiawikisql.parsers.key import KeyParser
-from tibiawikisql.parsers.npc import NpcParser
-from tibiawikisql.parsers.imbuement import ImbuementParser
-from tibiawikisql.parsers.quest import QuestParser
-from tibiawikisql.parsers.house import HouseParser
-from tibiawikisql.parsers.outfit import OutfitParser
-from tibiawikisql.parsers.world import WorldParser
-from tibiawikisql.parsers.mount import MountParser
-from tibiawikisql.parsers.update import UpdateParser
+"""Contains the parsers of every type of TibiaWiki article.
+
+Parsers are imported when first accessed, since importing them also imports the wikitext parser and the models.
+"""
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from tibiawikisql.parsers.achievement import AchievementParser
+    from tibiawikisql.parsers.base import AttributeParser, BaseParser
+    from tibiawikisql.parsers.book import BookParser
+    from tibiawikisql.parsers.charm import CharmParser
+    from tibiawikisql.parsers.creature import CreatureParser
+    from tibiawikisql.parsers.house import HouseParser
+    from tibiawikisql.parsers.imbuement import ImbuementParser
+    from tibiawikisql.parsers.item import ItemParser
+    from tibiawikisql.parsers.key import KeyParser
+    from tibiawikisql.parsers.mount import MountParser
+    from tibiawikisql.parsers.npc import NpcParser
+    from tibiawikisql.parsers.outfit import OutfitParser
+    from tibiawikisql.parsers.quest import QuestParser
+    from tibiawikisql.parsers.spell import SpellParser
+    from tibiawikisql.parsers.update import UpdateParser
+    from tibiawikisql.parsers.world import WorldParser
+
+_PARSER_MODULES = {
+    "BaseParser": "base",
+    "AttributeParser": "base",
+    "AchievementParser": "achievement",
+    "CharmParser": "charm",
+    "SpellParser": "spell",
+    "ItemParser": "item",
+    "CreatureParser": "creature",
+    "BookParser": "book",
+    "KeyParser": "key",
+    "NpcParser": "npc",
+    "ImbuementParser": "imbuement",
+    "QuestParser": "quest",
+    "HouseParser": "house",
+    "OutfitParser": "outfit",
+    "WorldParser": "world",
+    "MountParser": "mount",
+    "UpdateParser": "update",
+}
+
+__all__ = (
+    "AchievementParser",
+    "AttributeParser",
+    "BaseParser",
+    "BookParser",
+    "CharmParser",
+    "CreatureParser",
+    "HouseParser",
+    "ImbuementParser",
+    "ItemParser",
+    "KeyParser",
+    "MountParser",
+    "NpcParser",
+    "OutfitParser",
+    "QuestParser",
+    "SpellParser",
+    "UpdateParser",
+    "WorldParser",
+)
+
+
+def __getattr__(name: str) -> type:
+    try:
+        module_name = _PARSER_MODULES[name]
+    except KeyError:
+        msg = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(msg) from None
+    value = getattr(importlib.import_module(f"{__name__}.{module_name}"), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
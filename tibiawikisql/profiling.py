@@ -0,0 +1,180 @@
+"""Profiling of the generation stages, writing a separate profile for each one."""
+from __future__ import annotations
+
+import cProfile
+import os
+import sys
+import threading
+from collections import Counter
+from typing import Any, TYPE_CHECKING, TypeVar
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from types import CodeType, FrameType
+
+T = TypeVar("T")
+
+PROFILE_SAMPLE_INTERVAL = 0.005
+"""The seconds between each sample of the call stack of a profiled stage."""
+
+
+def get_frame_label(frame: FrameType) -> str:
+    """Get the label of the function of a frame in collapsed stacks, e.g. `tibiawikisql.api:WikiClient.get_article`."""
+    code = frame.f_code
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}:{getattr(code, 'co_qualname', code.co_name)}"
+
+
+def collapse_stack(frame: FrameType | None, root: CodeType | None = None) -> str | None:
+    """Get the call stack of a frame as a line of the collapsed stack format used by flame graph tools.
+
+    Args:
+        frame: The innermost frame of the stack.
+        root: The code of the function whose callees start the stack, if only part of the stack is wanted.
+
+    Returns:
+        The labels of the frames, from the outermost to the innermost, separated by semicolons.
+        If a root is given but no frame is running it, [None][] is returned.
+
+    """
+    labels = []
+    while frame is not None:
+        if frame.f_code is root:
+            break
+        labels.append(get_frame_label(frame))
+        frame = frame.f_back
+    else:
+        if root is not None:
+            return None
+    return ";".join(reversed(labels))
+
+
+def _call_stage(function: Callable[..., T], *args: Any) -> T:
+    # Marks where the sampled stacks of a stage start.
+    return function(*args)
+
+
+class StackSampler:
+    """Samples the call stack of a thread at regular intervals, counting how many times each stack was seen."""
+
+    def __init__(
+        self,
+        thread_id: int,
+        root: CodeType | None = None,
+        interval: float = PROFILE_SAMPLE_INTERVAL,
+        *,
+        new_threads: bool = False,
+    ) -> None:
+        """Create an instance of the class.
+
+        Args:
+            thread_id: The identifier of the thread to sample.
+            root: The code of the function whose callees start the stacks. Samples taken while the thread is not
+                running it are discarded.
+            interval: The seconds between each sample.
+            new_threads: Whether to also sample the threads started after sampling starts, e.g. the workers of a
+                thread pool. Their stacks are sampled whole, starting at the thread's entry point.
+
+        """
+        self.thread_id = thread_id
+        self.root = root
+        self.interval = interval
+        self.new_threads = new_threads
+        self.stacks: Counter[str] = Counter()
+        self._existing_threads: set[int] = set()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def start(self) -> None:
+        """Start sampling in a background thread."""
+        self._existing_threads = set(sys._current_frames())  # noqa: SLF001
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling, waiting for the background thread to finish."""
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()  # noqa: SLF001
+            frame = frames.get(self.thread_id)
+            stack = collapse_stack(frame, self.root) if frame is not None else None
+            if stack:
+                self.stacks[stack] += 1
+            if not self.new_threads:
+                continue
+            for thread_id, thread_frame in frames.items():
+                if thread_id not in self._existing_threads and thread_id not in {self.thread_id, self._thread.ident}:
+                    self.stacks[collapse_stack(thread_frame)] += 1
+
+    def write(self, path: str) -> None:
+        """Write the sampled stacks in the collapsed stack format, one stack per line followed by its count.
+
+        Args:
+            path: The path of the file to write.
+
+        """
+        with open(path, "w", encoding="utf-8") as f:
+            f.writelines(f"{stack} {count}\n" for stack, count in sorted(self.stacks.items()))
+
+
+class StageProfiler:
+    """Profiles stages of the generation, writing the profiles of each one to a folder.
+
+    Every stage is profiled deterministically with [cProfile][], written as a `.pstats` file, and its call stack is
+    sampled, written as a `.collapsed` file that can be turned into a flame graph.
+
+    The sampled stacks include the threads started while the stage runs, e.g. the workers loading images, since
+    stages are profiled one at a time. The `.pstats` file only covers the thread running the stage.
+    """
+
+    def __init__(self, folder: str, sample_interval: float = PROFILE_SAMPLE_INTERVAL) -> None:
+        """Create an instance of the class.
+
+        Args:
+            folder: The folder where the profiles are written, created if needed.
+            sample_interval: The seconds between each sample of the call stack.
+
+        """
+        self.folder = folder
+        self.sample_interval = sample_interval
+        os.makedirs(folder, exist_ok=True)
+
+    def get_paths(self, name: str) -> tuple[str, str]:
+        """Get the paths of the profile files of a stage.
+
+        Returns:
+            The paths of the `.pstats` file and the `.collapsed` file.
+
+        """
+        base = os.path.join(self.folder, name)
+        return f"{base}.pstats", f"{base}.collapsed"
+
+    def run(self, name: str, function: Callable[..., T], *args: Any) -> T:
+        """Run a stage, profiling it.
+
+        The current thread is profiled, and its sampled stacks start at the function. The threads started by the
+        stage are sampled too, but not profiled.
+
+        Args:
+            name: The name of the stage, used for the names of the files.
+            function: The function running the stage.
+            *args: The arguments to call the function with.
+
+        Returns:
+            The value returned by the function.
+
+        """
+        sampler = StackSampler(threading.get_ident(), _call_stage.__code__, self.sample_interval, new_threads=True)
+        profile = cProfile.Profile()
+        sampler.start()
+        profile.enable()
+        try:
+            return _call_stage(function, *args)
+        finally:
+            profile.disable()
+            sampler.stop()
+            pstats_path, collapsed_path = self.get_paths(name)
+            profile.dump_stats(pstats_path)
+            sampler.write(collapsed_path)
@@ -0,0 +1,137 @@
+"""Optional timing of the queries made through the table lookups, kept in a ring buffer."""
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any
+
+QUERY_LOG_SIZE = 1000
+"""The number of queries kept by default, older queries are discarded."""
+
+
+@dataclass(frozen=True)
+class QueryRecord:
+    """A query executed by a table lookup."""
+
+    table: str
+    """The name of the table the lookup was made on."""
+    sql: str
+    """The statement executed, with placeholders instead of values, which identifies the shape of the query."""
+    parameters: tuple[Any, ...]
+    """The values bound to the placeholders."""
+    elapsed: float
+    """The seconds spent executing the query and fetching its rows."""
+    rows: int
+    """The number of rows returned."""
+    timestamp: float
+    """When the query finished, in seconds since the epoch."""
+
+
+@dataclass
+class QueryShape:
+    """The aggregated timings of the queries sharing the same statement."""
+
+    table: str
+    """The name of the table the lookups were made on."""
+    sql: str
+    """The statement, with placeholders instead of values."""
+    count: int = 0
+    """The number of queries recorded."""
+    total_time: float = 0.0
+    """The total seconds spent in these queries."""
+    max_time: float = 0.0
+    """The seconds spent in the slowest query."""
+    rows: int = 0
+    """The total number of rows returned."""
+    parameters: tuple[Any, ...] = ()
+    """The values bound in the latest query, to reproduce it."""
+
+    @property
+    def mean_time(self) -> float:
+        """The average seconds spent per query."""
+        return self.total_time / self.count if self.count else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Get the timings as a JSON serializable dictionary."""
+        return {
+            "table": self.table,
+            "sql": self.sql,
+            "count": self.count,
+            "total_time": round(self.total_time, 6),
+            "mean_time": round(self.mean_time, 6),
+            "max_time": round(self.max_time, 6),
+            "rows": self.rows,
+        }
+
+
+class QueryLog:
+    """A ring buffer of the latest queries made through the table lookups.
+
+    Recording is disabled by default, so lookups are not timed unless [enabled][tibiawikisql.query_log.QueryLog.enabled]
+    is set.
+    """
+
+    def __init__(self, size: int = QUERY_LOG_SIZE, *, enabled: bool = False) -> None:
+        """Create an instance of the class.
+
+        Args:
+            size: The maximum number of queries kept.
+            enabled: Whether queries are recorded.
+
+        """
+        self.enabled = enabled
+        self._records: deque[QueryRecord] = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def record(self, table: str, sql: str, parameters: tuple[Any, ...], elapsed: float, rows: int) -> None:
+        """Record an executed query, discarding the oldest one if the log is full.
+
+        Args:
+            table: The name of the table the lookup was made on.
+            sql: The statement executed.
+            parameters: The values bound to the statement.
+            elapsed: The seconds spent executing the query and fetching its rows.
+            rows: The number of rows returned.
+
+        """
+        record = QueryRecord(table, sql, parameters, elapsed, rows, time.time())
+        with self._lock:
+            self._records.append(record)
+
+    def get_records(self) -> list[QueryRecord]:
+        """Get the recorded queries, from oldest to newest."""
+        with self._lock:
+            return list(self._records)
+
+    def get_shapes(self) -> list[QueryShape]:
+        """Get the timings of the recorded queries grouped by statement.
+
+        Returns:
+            The shapes of the queries, from the one with the most time spent to the one with the least.
+
+        """
+        shapes: dict[str, QueryShape] = {}
+        for record in self.get_records():
+            shape = shapes.get(record.sql)
+            if shape is None:
+                shape = shapes[record.sql] = QueryShape(record.table, record.sql)
+            shape.count += 1
+            shape.total_time += record.elapsed
+            shape.max_time = max(shape.max_time, record.elapsed)
+            shape.rows += record.rows
+            shape.parameters = record.parameters
+        return sorted(shapes.values(), key=lambda shape: shape.total_time, reverse=True)
+
+    def clear(self) -> None:
+        """Discard all the recorded queries."""
+        with self._lock:
+            self._records.clear()
+
+
+query_log = QueryLog()
+"""The log of the queries made by [Table][tibiawikisql.database.Table] lookups."""
@@ -0,0 +1,189 @@
+"""Machine-readable report of the duration and resource usage of each generation stage."""
+from __future__ import annotations
+
+import datetime
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, TYPE_CHECKING
+
+try:
+    import resource
+except ImportError:  # Not available on Windows.
+    resource = None
+
+if TYPE_CHECKING:
+    import sqlite3
+    from collections.abc import Generator
+
+    import requests
+
+_current_stage: ContextVar[StageReport | None] = ContextVar("current_stage", default=None)
+
+
+def get_peak_rss() -> int | None:
+    """Get the peak resident set size of the process in bytes, if it can be measured in this platform."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports the size in KiB, macOS in bytes.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def get_database_size(conn: sqlite3.Connection) -> int:
+    """Get the size of a database in bytes."""
+    page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+    page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+    return page_count * page_size
+
+
+def get_current_stage() -> StageReport | None:
+    """Get the report of the stage running in the current context, if any."""
+    return _current_stage.get()
+
+
+def record_response(response: requests.Response, *_args: Any, **_kwargs: Any) -> None:
+    """Count a response towards the stage running in the current context.
+
+    Meant to be registered as a `response` hook of a [requests.Session][].
+    """
+    stage = _current_stage.get()
+    if stage is not None:
+        stage.record_http(len(response.content))
+
+
+@dataclass
+class StageReport:
+    """The measurements of a category or post-processing task of the generation."""
+
+    name: str
+    """The name of the category or task."""
+    kind: str
+    """The kind of stage, either ``category``, ``task`` or ``setup``."""
+    wall_time: float = 0.0
+    """The duration of the stage in seconds."""
+    http_requests: int = 0
+    """The number of HTTP requests made."""
+    http_bytes: int = 0
+    """The size of the HTTP responses' bodies in bytes."""
+    articles: int = 0
+    """The number of articles processed, for categories."""
+    parse_time: float = 0.0
+    """The time spent parsing articles, in seconds."""
+    insert_time: float = 0.0
+    """The time spent inserting parsed articles into the database, in seconds."""
+    parse_errors: int = 0
+    """The number of articles that could not be parsed."""
+    peak_rss: int | None = None
+    """The peak resident set size of the process in bytes when the stage finished, if it can be measured."""
+    db_size: int | None = None
+    """The size of the database in bytes when the stage finished."""
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    @property
+    def articles_per_second(self) -> float | None:
+        """The number of articles processed per second, for categories."""
+        if not self.articles or not self.wall_time:
+            return None
+        return self.articles / self.wall_time
+
+    def record_http(self, size: int) -> None:
+        """Count an HTTP request made by the stage, possibly from another thread.
+
+        Args:
+            size: The size of the response's body in bytes.
+
+        """
+        with self._lock:
+            self.http_requests += 1
+            self.http_bytes += size
+
+    def to_dict(self) -> dict[str, Any]:
+        """Get the measurements as a JSON serializable dictionary."""
+        articles_per_second = self.articles_per_second
+        return {
+            "name": self.name,
+            "kind": self.kind,
+            "wall_time": round(self.wall_time, 3),
+            "http_requests": self.http_requests,
+            "http_bytes": self.http_bytes,
+            "articles": self.articles,
+            "articles_per_second": round(articles_per_second, 2) if articles_per_second is not None else None,
+            "parse_time": round(self.parse_time, 3),
+            "insert_time": round(self.insert_time, 3),
+            "parse_errors": self.parse_errors,
+            "peak_rss": self.peak_rss,
+            "db_size": self.db_size,
+        }
+
+
+@dataclass
+class GenerationReport:
+    """The measurements of a complete generation, broken down by stage."""
+
+    version: str
+    """The version of TibiaWikiSQL used."""
+    jobs: int = 1
+    """The number of stages allowed to run at the same time."""
+    resumed: bool = False
+    """Whether an interrupted generation was resumed."""
+    started_at: datetime.datetime = field(default_factory=lambda: datetime.datetime.now(tz=datetime.timezone.utc))
+    """When the generation started."""
+    wall_time: float = 0.0
+    """The duration of the generation in seconds."""
+    db_size: int | None = None
+    """The size of the database in bytes after the generation."""
+    stages: list[StageReport] = field(default_factory=list)
+    """The measurements of each stage, in the order they finished."""
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    @contextmanager
+    def stage(self, name: str, kind: str, conn: sqlite3.Connection | None = None) -> Generator[StageReport]:
+        """Measure a stage of the generation.
+
+        While the block runs, the stage is the current stage of the context, so HTTP responses and parsed articles are
+        counted towards it.
+
+        Args:
+            name: The name of the stage.
+            kind: The kind of stage.
+            conn: The connection to the database, used to measure its size once the stage finishes.
+
+        Yields:
+            The report of the stage, completed after exiting the block.
+
+        """
+        stage = StageReport(name, kind)
+        token = _current_stage.set(stage)
+        start = time.perf_counter()
+        try:
+            yield stage
+            if conn is not None:
+                stage.db_size = get_database_size(conn)
+        finally:
+            stage.wall_time = time.perf_counter() - start
+            _current_stage.reset(token)
+            stage.peak_rss = get_peak_rss()
+            with self._lock:
+                self.stages.append(stage)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Get the measurements as a JSON serializable dictionary."""
+        return {
+            "version": self.version,
+            "started_at": self.started_at.isoformat(),
+            "jobs": self.jobs,
+            "resumed": self.resumed,
+            "wall_time": round(self.wall_time, 3),
+            "peak_rss": get_peak_rss(),
+            "db_size": self.db_size,
+            "stages": [stage.to_dict() for stage in self.stages],
+        }
+
+    def to_json(self) -> str:
+        """Get the measurements as a JSON string."""
+        return json.dumps(self.to_dict(), indent=2)
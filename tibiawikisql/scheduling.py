@@ -0,0 +1,446 @@
+"""Scheduling of the generation steps, running the independent ones concurrently."""
+from __future__ import annotations
+
+import itertools
+import queue
+import time
+from collections import deque
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, NamedTuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import sqlite3
+    from collections.abc import Callable, Iterable, Iterator
+
+
+@dataclass(frozen=True)
+class Job:
+    """A step of the generation, started once all the jobs it depends on are finished."""
+
+    name: str
+    """The name of the job."""
+    callback: Callable[[Any], None]
+    """The function running the job, receiving the connection to use."""
+    dependencies: tuple[str, ...] = ()
+    """The names of the jobs that must finish first. Names of jobs that are not scheduled are ignored."""
+
+
+@dataclass(frozen=True)
+class JobTiming:
+    """The time a job started and finished, in seconds since the schedule started."""
+
+    name: str
+    """The name of the job."""
+    start: float
+    """The time when the job started."""
+    end: float
+    """The time when the job finished."""
+    dependencies: tuple[str, ...] = ()
+    """The names of the jobs that had to finish first."""
+
+    @property
+    def elapsed(self) -> float:
+        """The duration of the job in seconds."""
+        return self.end - self.start
+
+
+class BufferedCursor:
+    """The result of a statement executed by a [SerializedConnection][tibiawikisql.scheduling.SerializedConnection].
+
+    The rows are fetched by the thread owning the connection, so they can be consumed by any thread.
+    """
+
+    def __init__(self, rows: list[Any], rowcount: int, lastrowid: int | None, description: Any) -> None:
+        """Create an instance of the class.
+
+        Args:
+            rows: The rows returned by the statement.
+            rowcount: The number of modified rows.
+            lastrowid: The row ID of the last inserted row.
+            description: The column names of the rows.
+
+        """
+        self.rowcount = rowcount
+        self.lastrowid = lastrowid
+        self.description = description
+        self._rows = iter(rows)
+
+    def __iter__(self) -> Iterator[Any]:
+        return self._rows
+
+    def fetchone(self) -> Any:
+        """Fetch the next row, or [None][] if there are no more rows."""
+        return next(self._rows, None)
+
+    def fetchmany(self, size: int = 1) -> list[Any]:
+        """Fetch the next rows, up to the given number."""
+        return list(itertools.islice(self._rows, size))
+
+    def fetchall(self) -> list[Any]:
+        """Fetch the remaining rows."""
+        return list(self._rows)
+
+
+class SerializedConnection:
+    """A stand-in for a connection owned by another thread, which executes the statements in its behalf.
+
+    This allows jobs to run in separate threads while all their reads and writes go through a single connection.
+
+    Every job has its own transaction boundaries: while a job is inside a `with conn` block, the owning thread
+    only executes that job's statements, so committing or rolling back only affects that job's changes.
+    Statements executed outside a `with` block are committed right away, so they never become part of the
+    transaction of another job.
+
+    Like a cursor, the rows of the last statement can be fetched from the instance itself.
+    The `row_factory` attribute only applies to the next statement, as if a new cursor was used for each one.
+    """
+
+    def __init__(self, requests: queue.SimpleQueue, job: str) -> None:
+        """Create an instance of the class.
+
+        Args:
+            requests: The queue where statements are sent to the thread owning the connection.
+            job: The name of the job using the connection.
+
+        """
+        self.row_factory: Callable[..., Any] | None = None
+        self._requests = requests
+        self._job = job
+        self._last = BufferedCursor([], -1, None, None)
+
+    def __enter__(self) -> SerializedConnection:
+        self._call(lambda _conn: None, hold=1)
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, *_args: object) -> None:
+        if exc_type is None:
+            self._call(lambda conn: conn.commit(), hold=-1)
+        else:
+            self._call(lambda conn: conn.rollback(), hold=-1)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._last)
+
+    @property
+    def rowcount(self) -> int:
+        """The number of rows modified by the last statement."""
+        return self._last.rowcount
+
+    @property
+    def lastrowid(self) -> int | None:
+        """The row ID of the last inserted row."""
+        return self._last.lastrowid
+
+    @property
+    def description(self) -> Any:
+        """The column names of the rows of the last statement."""
+        return self._last.description
+
+    def _call(self, function: Callable[[sqlite3.Connection], Any], hold: int = 0) -> Any:
+        future: Future = Future()
+        self._requests.put(_Request(self._job, function, future, hold))
+        return future.result()
+
+    def call(self, function: Callable[[sqlite3.Connection], Any]) -> Any:
+        """Call a function with the real connection, in the thread owning it.
+
+        No statements of other jobs are executed while the function runs.
+
+        Args:
+            function: The function to call.
+
+        Returns:
+            The value returned by the function.
+
+        """
+        return self._call(function)
+
+    def _run(self, method: str, *args: Any) -> BufferedCursor:
+        row_factory, self.row_factory = self.row_factory, None
+
+        def run(conn: sqlite3.Connection) -> BufferedCursor:
+            cursor = conn.cursor()
+            cursor.row_factory = row_factory
+            getattr(cursor, method)(*args)
+            return BufferedCursor(cursor.fetchall(), cursor.rowcount, cursor.lastrowid, cursor.description)
+
+        self._last = self._call(run)
+        return self._last
+
+    def cursor(self) -> SerializedConnection:
+        """Get a new cursor for the connection."""
+        return SerializedConnection(self._requests, self._job)
+
+    def execute(self, sql: str, parameters: Any = ()) -> BufferedCursor:
+        """Execute a statement."""
+        return self._run("execute", sql, parameters)
+
+    def executemany(self, sql: str, parameters: Iterable[Any]) -> BufferedCursor:
+        """Execute a statement for every set of parameters."""
+        return self._run("executemany", sql, parameters)
+
+    def executescript(self, script: str) -> BufferedCursor:
+        """Execute a script of several statements."""
+        return self._run("executescript", script)
+
+    def fetchone(self) -> Any:
+        """Fetch the next row of the last statement."""
+        return self._last.fetchone()
+
+    def fetchmany(self, size: int = 1) -> list[Any]:
+        """Fetch the next rows of the last statement."""
+        return self._last.fetchmany(size)
+
+    def fetchall(self) -> list[Any]:
+        """Fetch the remaining rows of the last statement."""
+        return self._last.fetchall()
+
+    def commit(self) -> None:
+        """Commit the job's current transaction."""
+        self._call(lambda conn: conn.commit())
+
+    def rollback(self) -> None:
+        """Roll back the job's current transaction."""
+        self._call(lambda conn: conn.rollback())
+
+
+class _Request(NamedTuple):
+    job: str
+    function: Callable[[sqlite3.Connection], Any]
+    future: Future
+    hold: int = 0
+    """1 when the job enters a transaction block, -1 when it leaves it."""
+
+
+class _Finished(NamedTuple):
+    timing: JobTiming
+    error: BaseException | None
+
+
+def _is_ready(job: Job, finished: set[str], scheduled: set[str]) -> bool:
+    return all(dependency in finished or dependency not in scheduled for dependency in job.dependencies)
+
+
+def _run_sequentially(conn: sqlite3.Connection, pending: dict[str, Job], start: float) -> list[JobTiming]:
+    scheduled = set(pending)
+    finished: set[str] = set()
+    timings = []
+    while job := next((job for job in pending.values() if _is_ready(job, finished, scheduled)), None):
+        del pending[job.name]
+        job_start = time.perf_counter() - start
+        try:
+            job.callback(conn)
+        except BaseException:
+            conn.rollback()
+            raise
+        # Statements left uncommitted by the job are part of its work, not of the next job's transaction.
+        conn.commit()
+        timings.append(JobTiming(job.name, job_start, time.perf_counter() - start, job.dependencies))
+        finished.add(job.name)
+    return timings
+
+
+class _ConnectionOwner:
+    """Executes the requests of the jobs with the real connection, keeping the transactions of each job apart."""
+
+    def __init__(self, conn: sqlite3.Connection) -> None:
+        self.conn = conn
+        self.holder: str | None = None
+        self.depth = 0
+        self.deferred: deque[_Request] = deque()
+
+    def serve(self, request: _Request) -> None:
+        """Execute a request, or defer it while another job is inside a transaction block."""
+        if self.holder is not None and request.job != self.holder:
+            self.deferred.append(request)
+            return
+        try:
+            result = request.function(self.conn)
+        except Exception as e:  # noqa: BLE001
+            error: Exception | None = e
+        else:
+            error = None
+        self.depth = max(self.depth + request.hold, 0)
+        self.holder = request.job if self.depth else None
+        if self.holder is None and self.conn.in_transaction:
+            if error is None:
+                self.conn.commit()
+            else:
+                self.conn.rollback()
+        if error is None:
+            request.future.set_result(result)
+        else:
+            request.future.set_exception(error)
+        if self.holder is None:
+            self.serve_deferred()
+
+    def serve_deferred(self) -> None:
+        """Execute the requests deferred while a job was inside a transaction block."""
+        deferred = list(self.deferred)
+        self.deferred.clear()
+        for request in deferred:
+            self.serve(request)
+
+    def release(self, job: str) -> None:
+        """Roll back the transaction of a job that finished inside a transaction block."""
+        if self.holder != job:
+            return
+        self.conn.rollback()
+        self.holder = None
+        self.depth = 0
+        self.serve_deferred()
+
+    def cancel(self, request: _Request) -> None:
+        """Cancel a request, and the requests deferred."""
+        request.future.set_exception(CancelledError())
+        while self.deferred:
+            self.deferred.popleft().future.set_exception(CancelledError())
+
+
+def _run_concurrently(
+    conn: sqlite3.Connection,
+    pending: dict[str, Job],
+    start: float,
+    workers: int,
+) -> list[JobTiming]:
+    scheduled = set(pending)
+    finished: set[str] = set()
+    timings = []
+    errors: list[BaseException] = []
+    requests: queue.SimpleQueue = queue.SimpleQueue()
+    owner = _ConnectionOwner(conn)
+    running = 0
+
+    def run(job: Job) -> None:
+        job_start = time.perf_counter() - start
+        error = None
+        try:
+            job.callback(SerializedConnection(requests, job.name))
+        except BaseException as e:  # noqa: BLE001
+            error = e
+        timing = JobTiming(job.name, job_start, time.perf_counter() - start, job.dependencies)
+        requests.put(_Finished(timing, error))
+
+    def submit_ready() -> None:
+        nonlocal running
+        for job in [job for job in pending.values() if _is_ready(job, finished, scheduled)]:
+            del pending[job.name]
+            executor.submit(run, job)
+            running += 1
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="job") as executor:
+        try:
+            submit_ready()
+            while running:
+                request = requests.get()
+                if isinstance(request, _Finished):
+                    running -= 1
+                    owner.release(request.timing.name)
+                    timings.append(request.timing)
+                    finished.add(request.timing.name)
+                    if request.error is not None:
+                        errors.append(request.error)
+                        pending.clear()
+                    submit_ready()
+                    continue
+                owner.serve(request)
+        except BaseException:
+            # Unblock the running jobs so the workers can be joined.
+            pending.clear()
+            if conn.in_transaction:
+                conn.rollback()
+            while running:
+                request = requests.get()
+                if isinstance(request, _Finished):
+                    running -= 1
+                else:
+                    owner.cancel(request)
+            raise
+    if errors:
+        raise errors[0]
+    return timings
+
+
+def run_jobs(conn: sqlite3.Connection, jobs: Iterable[Job], *, workers: int = 1) -> list[JobTiming]:
+    """Run jobs as soon as the jobs they depend on are finished.
+
+    With more than one worker, jobs run concurrently in worker threads, receiving a
+    [SerializedConnection][tibiawikisql.scheduling.SerializedConnection] whose statements are executed by the calling
+    thread, so all the reads and writes go through the same connection.
+    Otherwise, jobs run one at a time in the calling thread, in the given order unless a dependency requires otherwise.
+
+    Either way, a job's transactions only contain its own statements. Changes a job leaves uncommitted are committed
+    when it finishes, or rolled back if it fails.
+
+    If a job fails, no more jobs are started, and the error is raised once the running jobs are finished.
+
+    Args:
+        conn: A connection to the database.
+        jobs: The jobs to run.
+        workers: The maximum number of jobs to run at the same time.
+
+    Returns:
+        The timings of the jobs, in the order they finished.
+
+    Raises:
+        ValueError: The dependencies of the jobs are circular.
+
+    """
+    pending = {job.name: job for job in jobs}
+    start = time.perf_counter()
+    if workers <= 1:
+        timings = _run_sequentially(conn, pending, start)
+    else:
+        timings = _run_concurrently(conn, pending, start, workers)
+    if pending:
+        msg = f"Circular dependencies between jobs: {', '.join(sorted(pending))}."
+        raise ValueError(msg)
+    return timings
+
+
+def run_atomically(conn: sqlite3.Connection | SerializedConnection, function: Callable[[Any], Any]) -> Any:
+    """Run a function with a connection in its own transaction, without statements of other jobs running in between.
+
+    The transaction is committed when the function returns, or rolled back if it raises an exception.
+    If the connection is a [SerializedConnection][tibiawikisql.scheduling.SerializedConnection], the function is
+    called with the real connection by the thread owning it, otherwise it is called directly.
+
+    Args:
+        conn: The connection received by the job.
+        function: The function to call with the connection.
+
+    Returns:
+        The value returned by the function.
+
+    """
+    def run(real_conn: sqlite3.Connection) -> Any:
+        with real_conn:
+            return function(real_conn)
+
+    if isinstance(conn, SerializedConnection):
+        return conn.call(run)
+    return run(conn)
+
+
+def get_critical_path(timings: list[JobTiming]) -> list[JobTiming]:
+    """Get the chain of jobs that determined the total duration of a schedule.
+
+    Starting from the last job to finish, the dependency that finished last is followed back to the first job.
+
+    Args:
+        timings: The timings of the jobs.
+
+    Returns:
+        The timings of the jobs in the critical path, in the order they ran.
+
+    """
+    if not timings:
+        return []
+    by_name = {timing.name: timing for timing in timings}
+    current = max(timings, key=lambda timing: timing.end)
+    path = [current]
+    while dependencies := [by_name[name] for name in current.dependencies if name in by_name]:
+        current = max(dependencies, key=lambda timing: timing.end)
+        path.append(current)
+    return path[::-1]
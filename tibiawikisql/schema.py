@@ -1,10 +1,11 @@
 """Defines the SQL schemas to use."""
+from collections.abc import Collection
 from sqlite3 import Connection, Cursor, Row
 from typing import Any, ClassVar
 from pypika import SQLLiteQuery as Query, Table as PTable
 
-from tibiawikisql.database import Blob, Boolean, Column, Date, ForeignKey, Integer, Real, Table, Text, \
-    Timestamp
+from tibiawikisql.database import Blob, Boolean, Column, CompressedText, Date, ForeignKey, Index, Integer, Real, \
+    Table, Text, Timestamp
 
 
 class AchievementTable(Table):
@@ -35,7 +36,7 @@ class CharmTable(Table):
     cost_level_1 = Column(Integer, nullable=False)
     cost_level_2 = Column(Integer, nullable=False)
     cost_level_3 = Column(Integer, nullable=False)
-    image = Column(Blob)
+    image_hash = Column(ForeignKey(Text, "image", "hash"), index=True)
     version = Column(Text, index=True)
     status = Column(Text, default="active", nullable=False)
     timestamp = Column(Timestamp, nullable=False)
@@ -84,9 +85,9 @@ class CreatureTable(Table):
     modifier_healing = Column(Integer)
     walks_through = Column(Text)
     walks_around = Column(Text)
-    location = Column(Text)
+    location = Column(CompressedText)
     version = Column(Text, index=True)
-    image = Column(Blob)
+    image_hash = Column(ForeignKey(Text, "image", "hash"), index=True)
     status = Column(Text, default="active", nullable=False)
     timestamp = Column(Timestamp, nullable=False)
 
@@ -145,7 +146,7 @@ class ItemTable(Table):
     light_radius = Column(Integer)
     version = Column(Text, index=True)
     client_id = Column(Integer)
-    image = Column(Blob)
+    image_hash = Column(ForeignKey(Text, "image", "hash"), index=True)
     status = Column(Text, default="active", nullable=False)
     timestamp = Column(Timestamp, nullable=False)
 
@@ -175,14 +176,31 @@ class ItemProficiencyPerkTable(Table, table_name="item_proficiency_perk"):
 
 class CreatureDropTable(Table, table_name="creature_drop"):
     """Contains the items that a creature can drop."""
-    creature_id = Column(ForeignKey(Integer, table="creature", column="article_id"), index=True, nullable=False)
-    item_id = Column(ForeignKey(Integer, table="item", column="article_id"), index=True, nullable=False)
+    creature_id = Column(ForeignKey(Integer, table="creature", column="article_id"), nullable=False)
+    item_id = Column(ForeignKey(Integer, table="item", column="article_id"), nullable=False)
     chance = Column(Real)
     min = Column(Integer, nullable=False)
     max = Column(Integer, nullable=False)
 
+    creature_id_covering_idx = Index("creature_id", "chance", "item_id", "min", "max")
+    item_id_covering_idx = Index("item_id", "chance", "creature_id", "min", "max")
+
     @classmethod
     def get_by_creature_id(cls, conn: Connection | Cursor, creature_id: int):
+        """Get the drops of a creature, joining item titles, from the highest chance to the lowest."""
+        return cls.get_by_creature_ids(conn, [creature_id]).get(creature_id, [])
+
+    @classmethod
+    def get_by_creature_ids(cls, conn: Connection | Cursor, creature_ids: Collection[int]) -> dict[int, list[Row]]:
+        """Get the drops of several creatures, joining item titles, from the highest chance to the lowest.
+
+        Args:
+            conn: A connection to the database.
+            creature_ids: The article IDs of the creatures.
+
+        Returns:
+            A mapping of the article IDs of the creatures to their drops.
+        """
         this = PTable(cls.__tablename__)
         item = PTable(ItemTable.__tablename__)
         base_query = (
@@ -196,10 +214,31 @@ class CreatureDropTable(Table, table_name="creature_drop"):
             )
             .join(item).on(this.item_id == item.article_id)
         )
-        return cls.get_list_by_field(conn, "creature_id", creature_id, base_query=base_query)
+        return cls.get_list_by_values(
+            conn,
+            "creature_id",
+            creature_ids,
+            sort_by="chance",
+            ascending=False,
+            base_query=base_query,
+        )
 
     @classmethod
     def get_by_item_id(cls, conn: Connection | Cursor, item_id: int):
+        """Get the creatures dropping an item, joining creature titles, from the highest chance to the lowest."""
+        return cls.get_by_item_ids(conn, [item_id]).get(item_id, [])
+
+    @classmethod
+    def get_by_item_ids(cls, conn: Connection | Cursor, item_ids: Collection[int]) -> dict[int, list[Row]]:
+        """Get the creatures dropping several items, joining creature titles, from the highest chance to the lowest.
+
+        Args:
+            conn: A connection to the database.
+            item_ids: The article IDs of the items.
+
+        Returns:
+            A mapping of the article IDs of the items to the creatures dropping them.
+        """
         this = PTable(cls.__tablename__)
         creature = PTable(CreatureTable.__tablename__)
         base_query = (
@@ -213,7 +252,14 @@ class CreatureDropTable(Table, table_name="creature_drop"):
             )
             .join(creature).on(this.creature_id == creature.article_id)
         )
-        return cls.get_list_by_field(conn, "item_id", item_id, base_query=base_query)
+        return cls.get_list_by_values(
+            conn,
+            "item_id",
+            item_ids,
+            sort_by="chance",
+            ascending=False,
+            base_query=base_query,
+        )
 
 
 class ItemAttributeTable(Table, table_name="item_attribute"):
@@ -235,7 +281,7 @@ class BookTable(Table):
     author = Column(Text)
     prev_book = Column(Text)
     next_book = Column(Text)
-    text = Column(Text)
+    text = Column(CompressedText)
     version = Column(Text, index=True)
     status = Column(Text, default="active", nullable=False)
     timestamp = Column(Timestamp, nullable=False)
@@ -247,6 +293,14 @@ class DatabaseInfoTable(Table, table_name="database_info"):
     value = Column(Text)
 
 
+class GenerationCheckpointTable(Table, table_name="generation_checkpoint"):
+    """Contains the progress of the generation steps, used to resume an interrupted generation."""
+    name = Column(Text, primary_key=True)
+    progress = Column(Integer, nullable=False)
+    completed = Column(Boolean, nullable=False)
+    timestamp = Column(Timestamp, nullable=False)
+
+
 class HouseTable(Table):
     """Contains information about houses and guildhalls."""
     article_id = Column(Integer, primary_key=True)
@@ -281,7 +335,7 @@ class ImbuementTable(Table):
     effect = Column(Text)
     slots = Column(Text)
     version = Column(Text, index=True)
-    image = Column(Blob)
+    image_hash = Column(ForeignKey(Text, "image", "hash"), index=True)
     status = Column(Text, default="active", nullable=False)
     timestamp = Column(Timestamp, nullable=False)
 
@@ -294,6 +348,19 @@ class ImbuementMaterialTable(Table, table_name="imbuement_material"):
 
     @classmethod
     def get_by_imbuement_id(cls, conn: Connection | Cursor, imbuement_id: int):
+        return cls.get_by_imbuement_ids(conn, [imbuement_id]).get(imbuement_id, [])
+
+    @classmethod
+    def get_by_imbuement_ids(cls, conn: Connection | Cursor, imbuement_ids: Collection[int]) -> dict[int, list[Row]]:
+        """Get the materials of several imbuements, joining item titles.
+
+        Args:
+            conn: A connection to the database.
+            imbuement_ids: The article IDs of the imbuements.
+
+        Returns:
+            A mapping of the article IDs of the imbuements to their materials.
+        """
         this = cls.__table__
         item = ItemTable.__table__
         base_query = (
@@ -305,7 +372,7 @@ class ImbuementMaterialTable(Table, table_name="imbuement_material"):
             )
             .join(item).on(this.item_id == item.article_id)
         )
-        return cls.get_list_by_field(conn, "imbuement_id", imbuement_id, base_query=base_query)
+        return cls.get_list_by_values(conn, "imbuement_id", imbuement_ids, base_query=base_query)
 
 
 class ItemKeyTable(Table, table_name="item_key"):
@@ -324,6 +391,15 @@ class ItemKeyTable(Table, table_name="item_key"):
     timestamp = Column(Timestamp, nullable=False)
 
 
+class ImageTable(Table):
+    """Contains the images of articles, stored once per distinct content.
+
+    Other tables reference images by their `image_hash` column.
+    """
+    hash = Column(Text, primary_key=True)
+    content = Column(Blob, nullable=False)
+
+
 class MapTable(Table):
     """Contains map images."""
     z = Column(Integer, primary_key=True)
@@ -360,7 +436,7 @@ class SpellTable(Table):
     druid = Column(Boolean, default=False)
     paladin = Column(Boolean, default=False)
     monk = Column(Boolean, default=False)
-    image = Column(Blob)
+    image_hash = Column(ForeignKey(Text, "image", "hash"), index=True)
     version = Column(Text, index=True)
     status = Column(Text, default="active", nullable=False)
     timestamp = Column(Timestamp, nullable=False)
@@ -379,7 +455,7 @@ class NpcTable(Table):
     x = Column(Integer)
     y = Column(Integer)
     z = Column(Integer)
-    image = Column(Blob)
+    image_hash = Column(ForeignKey(Text, "image", "hash"), index=True)
     status = Column(Text, default="active", nullable=False)
     timestamp = Column(Timestamp, nullable=False)
 
@@ -398,13 +474,29 @@ class NpcRaceTable(Table, table_name="npc_race"):
 
 class NpcBuyingTable(Table, table_name="npc_offer_buy"):
     """Table storing the sitems an NPC buys."""
-    npc_id = Column(ForeignKey(Integer, "npc", "article_id"), index=True)
-    item_id = Column(ForeignKey(Integer, "item", "article_id"), nullable=False, index=True)
+    npc_id = Column(ForeignKey(Integer, "npc", "article_id"))
+    item_id = Column(ForeignKey(Integer, "item", "article_id"), nullable=False)
     value = Column(Integer, nullable=False)
     currency_id = Column(ForeignKey(Integer, "item", "article_id"), nullable=False)
 
+    npc_id_covering_idx = Index("npc_id", "item_id", "currency_id", "value")
+    item_id_covering_idx = Index("item_id", "npc_id", "currency_id", "value")
+
     @classmethod
     def get_by_npc_id(cls, conn: Connection | Cursor, npc_id: int):
+        return cls.get_by_npc_ids(conn, [npc_id]).get(npc_id, [])
+
+    @classmethod
+    def get_by_npc_ids(cls, conn: Connection | Cursor, npc_ids: Collection[int]) -> dict[int, list[Row]]:
+        """Get the offers of several NPCs, joining item and currency titles.
+
+        Args:
+            conn: A connection to the database.
+            npc_ids: The article IDs of the NPCs.
+
+        Returns:
+            A mapping of the article IDs of the NPCs to their offers.
+        """
         this = PTable(cls.__tablename__)
         item = PTable(ItemTable.__tablename__)
         currency = item.as_("currency")
@@ -420,10 +512,23 @@ class NpcBuyingTable(Table, table_name="npc_offer_buy"):
             .join(item).on(this.item_id == item.article_id)
             .join(currency).on(this.currency_id == currency.article_id)
         )
-        return cls.get_list_by_field(conn, "npc_id", npc_id, base_query=base_query)
+        return cls.get_list_by_values(conn, "npc_id", npc_ids, base_query=base_query)
 
     @classmethod
     def get_by_item_id(cls, conn: Connection | Cursor, item_id: int):
+        return cls.get_by_item_ids(conn, [item_id]).get(item_id, [])
+
+    @classmethod
+    def get_by_item_ids(cls, conn: Connection | Cursor, item_ids: Collection[int]) -> dict[int, list[Row]]:
+        """Get the offers for several items, joining NPC and currency titles.
+
+        Args:
+            conn: A connection to the database.
+            item_ids: The article IDs of the items.
+
+        Returns:
+            A mapping of the article IDs of the items to their offers.
+        """
         this = PTable(cls.__tablename__)
         npc = PTable(NpcTable.__tablename__)
         currency = PTable(ItemTable.__tablename__).as_("currency")
@@ -439,18 +544,34 @@ class NpcBuyingTable(Table, table_name="npc_offer_buy"):
             .join(npc).on(this.npc_id == npc.article_id)
             .join(currency).on(this.currency_id == currency.article_id)
         )
-        return cls.get_list_by_field(conn, "item_id", item_id, base_query=base_query)
+        return cls.get_list_by_values(conn, "item_id", item_ids, base_query=base_query)
 
 
 class NpcSellingTable(Table, table_name="npc_offer_sell"):
     """Table storing the sitems an NPC sells."""
-    npc_id = Column(ForeignKey(Integer, "npc", "article_id"), index=True)
-    item_id = Column(ForeignKey(Integer, "item", "article_id"), nullable=False, index=True)
+    npc_id = Column(ForeignKey(Integer, "npc", "article_id"))
+    item_id = Column(ForeignKey(Integer, "item", "article_id"), nullable=False)
     value = Column(Integer, nullable=False)
     currency_id = Column(ForeignKey(Integer, "item", "article_id"), nullable=False)
 
+    npc_id_covering_idx = Index("npc_id", "item_id", "currency_id", "value")
+    item_id_covering_idx = Index("item_id", "npc_id", "currency_id", "value")
+
     @classmethod
     def get_by_npc_id(cls, conn: Connection | Cursor, npc_id: int):
+        return cls.get_by_npc_ids(conn, [npc_id]).get(npc_id, [])
+
+    @classmethod
+    def get_by_npc_ids(cls, conn: Connection | Cursor, npc_ids: Collection[int]) -> dict[int, list[Row]]:
+        """Get the offers of several NPCs, joining item and currency titles.
+
+        Args:
+            conn: A connection to the database.
+            npc_ids: The article IDs of the NPCs.
+
+        Returns:
+            A mapping of the article IDs of the NPCs to their offers.
+        """
         this = PTable(cls.__tablename__)
         item = PTable(ItemTable.__tablename__)
         currency = PTable(ItemTable.__tablename__).as_("currency")
@@ -466,10 +587,23 @@ class NpcSellingTable(Table, table_name="npc_offer_sell"):
             .join(item).on(this.item_id == item.article_id)
             .join(currency).on(this.currency_id == currency.article_id)
         )
-        return cls.get_list_by_field(conn, "npc_id", npc_id, base_query=base_query)
+        return cls.get_list_by_values(conn, "npc_id", npc_ids, base_query=base_query)
 
     @classmethod
     def get_by_item_id(cls, conn: Connection | Cursor, item_id: int):
+        return cls.get_by_item_ids(conn, [item_id]).get(item_id, [])
+
+    @classmethod
+    def get_by_item_ids(cls, conn: Connection | Cursor, item_ids: Collection[int]) -> dict[int, list[Row]]:
+        """Get the offers for several items, joining NPC and currency titles.
+
+        Args:
+            conn: A connection to the database.
+            item_ids: The article IDs of the items.
+
+        Returns:
+            A mapping of the article IDs of the items to their offers.
+        """
         this = PTable(cls.__tablename__)
         npc = PTable(NpcTable.__tablename__)
         currency = PTable(ItemTable.__tablename__).as_("currency")
@@ -485,7 +619,7 @@ class NpcSellingTable(Table, table_name="npc_offer_sell"):
             .join(npc).on(this.npc_id == npc.article_id)
             .join(currency).on(this.currency_id == currency.article_id)
         )
-        return cls.get_list_by_field(conn, "item_id", item_id, base_query=base_query)
+        return cls.get_list_by_values(conn, "item_id", item_ids, base_query=base_query)
 
 
 class NpcDestinationTable(Table, table_name="npc_destination"):
@@ -517,7 +651,7 @@ class OutfitImageTable(Table, table_name="outfit_image"):
     outfit_id = Column(ForeignKey(Integer, "outfit", "article_id"), index=True)
     sex = Column(Text)
     addon = Column(Integer)
-    image = Column(Blob)
+    image_hash = Column(ForeignKey(Text, "image", "hash"), index=True)
 
 
 class QuestTable(Table):
@@ -525,7 +659,7 @@ class QuestTable(Table):
     article_id = Column(Integer, primary_key=True)
     title = Column(Text, no_case=True, unique=True)
     name = Column(Text, index=True, no_case=True)
-    location = Column(Text)
+    location = Column(CompressedText)
     is_rookgaard_quest = Column(Boolean, default=False)
     type = Column(Text, default="quest", index=True)
     quest_log = Column(Boolean, default=False)
@@ -557,6 +691,19 @@ class OutfitQuestTable(Table, table_name="outfit_quest"):
         Returns:
             The rows matching the criteria.
         """
+        return cls.get_list_by_outfit_ids(conn, [outfit_id]).get(outfit_id, [])
+
+    @classmethod
+    def get_list_by_outfit_ids(cls, conn: Connection | Cursor, outfit_ids: Collection[int]) -> dict[int, list[Row]]:
+        """Get all entries related to several outfits, joining quest titles.
+
+        Args:
+            conn: A connection to the database.
+            outfit_ids: The article IDs of the outfits.
+
+        Returns:
+            A mapping of the article IDs of the outfits to their rows.
+        """
         quest = QuestTable.__table__
         query = (
             Query.from_(cls.__table__)
@@ -567,7 +714,7 @@ class OutfitQuestTable(Table, table_name="outfit_quest"):
             )
             .join(quest).on(quest.article_id == cls.__table__.quest_id)
         )
-        return cls.get_list_by_field(conn, "outfit_id", outfit_id, base_query=query)
+        return cls.get_list_by_values(conn, "outfit_id", outfit_ids, base_query=query)
 
 
 class QuestDangerTable(Table, table_name="quest_danger"):
@@ -586,6 +733,19 @@ class QuestDangerTable(Table, table_name="quest_danger"):
         Returns:
             The rows matching the criteria.
         """
+        return cls.get_list_by_quest_ids(conn, [quest_id]).get(quest_id, [])
+
+    @classmethod
+    def get_list_by_quest_ids(cls, conn: Connection | Cursor, quest_ids: Collection[int]) -> dict[int, list[Row]]:
+        """Get all entries related to several quests, joining creature titles.
+
+        Args:
+            conn: A connection to the database.
+            quest_ids: The article IDs of the quests.
+
+        Returns:
+            A mapping of the article IDs of the quests to their rows.
+        """
         creature = PTable(CreatureTable.__tablename__)
         query = (
             Query.from_(cls.__table__)
@@ -595,13 +755,16 @@ class QuestDangerTable(Table, table_name="quest_danger"):
             )
             .join(creature).on(creature.article_id == cls.__table__.creature_id)
         )
-        return cls.get_list_by_field(conn, "quest_id", quest_id, base_query=query)
+        return cls.get_list_by_values(conn, "quest_id", quest_ids, base_query=query)
 
 
 class QuestRewardTable(Table, table_name="quest_reward"):
     """Table containing the item rewards for a quest."""
-    quest_id = Column(ForeignKey(Integer, "quest", "article_id"), index=True)
-    item_id = Column(ForeignKey(Integer, "item", "article_id"), nullable=False, index=True)
+    quest_id = Column(ForeignKey(Integer, "quest", "article_id"))
+    item_id = Column(ForeignKey(Integer, "item", "article_id"), nullable=False)
+
+    quest_id_covering_idx = Index("quest_id", "item_id")
+    item_id_covering_idx = Index("item_id", "quest_id")
 
     @classmethod
     def get_list_by_item_id(cls, conn: Connection | Cursor, item_id: int) -> list[Row] | list[dict[str, Any]]:
@@ -614,6 +777,19 @@ class QuestRewardTable(Table, table_name="quest_reward"):
         Returns:
             The rows matching the criteria.
         """
+        return cls.get_list_by_item_ids(conn, [item_id]).get(item_id, [])
+
+    @classmethod
+    def get_list_by_item_ids(cls, conn: Connection | Cursor, item_ids: Collection[int]) -> dict[int, list[Row]]:
+        """Get all entries related to several items, joining quest titles.
+
+        Args:
+            conn: A connection to the database.
+            item_ids: The article IDs of the items.
+
+        Returns:
+            A mapping of the article IDs of the items to their rows.
+        """
         quest = PTable(QuestTable.__tablename__)
         query = (
             Query.from_(cls.__table__)
@@ -623,7 +799,7 @@ class QuestRewardTable(Table, table_name="quest_reward"):
             )
             .join(quest).on(quest.article_id == cls.__table__.quest_id)
         )
-        return cls.get_list_by_field(conn, "item_id", item_id, base_query=query)
+        return cls.get_list_by_values(conn, "item_id", item_ids, base_query=query)
 
     @classmethod
     def get_list_by_quest_id(cls, conn: Connection | Cursor, quest_id: int) -> list[Row] | list[dict[str, Any]]:
@@ -636,6 +812,19 @@ class QuestRewardTable(Table, table_name="quest_reward"):
         Returns:
             The rows matching the criteria.
         """
+        return cls.get_list_by_quest_ids(conn, [quest_id]).get(quest_id, [])
+
+    @classmethod
+    def get_list_by_quest_ids(cls, conn: Connection | Cursor, quest_ids: Collection[int]) -> dict[int, list[Row]]:
+        """Get all entries related to several quests, joining item titles.
+
+        Args:
+            conn: A connection to the database.
+            quest_ids: The article IDs of the quests.
+
+        Returns:
+            A mapping of the article IDs of the quests to their rows.
+        """
         item = PTable(ItemTable.__tablename__)
         query = (
             Query.from_(cls.__table__)
@@ -645,7 +834,7 @@ class QuestRewardTable(Table, table_name="quest_reward"):
             )
             .join(item).on(item.article_id == cls.__table__.item_id)
         )
-        return cls.get_list_by_field(conn, "quest_id", quest_id, base_query=query)
+        return cls.get_list_by_values(conn, "quest_id", quest_ids, base_query=query)
 
 class RashidPositionTable(Table, table_name="rashid_position"):
     """Stores information about the location of the NPC rashid on each day."""
@@ -690,7 +879,7 @@ class MountTable(Table):
     light_color = Column(Integer)
     light_radius = Column(Integer)
     version = Column(Text, index=True)
-    image = Column(Blob)
+    image_hash = Column(ForeignKey(Text, "image", "hash"), index=True)
     status = Column(Text, default="active", nullable=False)
     timestamp = Column(Timestamp, nullable=False)
 
@@ -707,18 +896,110 @@ class UpdateTable(Table, table_name="game_update"):
     previous = Column(Text, index=True)
     next = Column(Text, index=True)
     version = Column(Text, index=True)
-    summary = Column(Text, index=True)
-    changes = Column(Text, index=True)
+    summary = Column(CompressedText)
+    changes = Column(CompressedText)
     timestamp = Column(Timestamp, nullable=False)
 
 
-def create_tables(conn: Connection | Cursor) -> None:
+class SearchIndexTable(
+    Table,
+    table_name="search_index",
+    virtual="fts5",
+    virtual_options=("tokenize='unicode61 remove_diacritics 2'", "prefix='2 3'"),
+):
+    """Full-text search index over the titles, names and texts of articles.
+
+    Only the `title`, `name` and `content` columns are searchable, the rest are stored to identify the article.
+    """
+    title = Column(Text, index=True)
+    name = Column(Text, index=True)
+    content = Column(Text, index=True)
+    type = Column(Text)
+    article_id = Column(Integer)
+
+
+class FuzzyNameTable(Table, table_name="fuzzy_name"):
+    """Contains the article titles and names indexed for typo-tolerant lookups."""
+    id = Column(Integer, primary_key=True)
+    type = Column(Text, nullable=False, index=True)
+    article_id = Column(Integer, nullable=False, index=True)
+    title = Column(Text, nullable=False)
+    value = Column(Text, nullable=False)
+    trigram_count = Column(Integer, nullable=False)
+
+
+class FuzzyTrigramTable(Table, table_name="fuzzy_trigram"):
+    """Contains the trigrams of every indexed article title and name."""
+    trigram = Column(Text, nullable=False)
+    name_id = Column(ForeignKey(Integer, "fuzzy_name", "id"), nullable=False)
+
+    trigram_covering_idx = Index("trigram", "name_id")
+
+
+class DocumentTable(Table, table_name="document"):
+    """Contains the serialized JSON document of every article, including the data of its child tables.
+
+    Documents bigger than a threshold are stored compressed with gzip.
+    """
+    type = Column(Text, primary_key=True)
+    article_id = Column(Integer, primary_key=True)
+    title = Column(Text, no_case=True, nullable=False, index=True)
+    content = Column(Blob, nullable=False)
+    compressed = Column(Boolean, nullable=False)
+
+
+class ItemPriceTable(Table, table_name="item_price"):
+    """Contains the best NPC offers of every item, for each currency the item is traded with.
+
+    The sell offer is the highest price an NPC buys the item for, the buy offer the lowest price an NPC sells it for.
+    """
+    item_id = Column(ForeignKey(Integer, "item", "article_id"), primary_key=True)
+    currency_id = Column(ForeignKey(Integer, "item", "article_id"), primary_key=True)
+    item_title = Column(Text, no_case=True, nullable=False)
+    currency_title = Column(Text, nullable=False)
+    sell_price = Column(Integer)
+    sell_npc_id = Column(ForeignKey(Integer, "npc", "article_id"))
+    sell_npc_title = Column(Text)
+    buy_price = Column(Integer)
+    buy_npc_id = Column(ForeignKey(Integer, "npc", "article_id"))
+    buy_npc_title = Column(Text)
+
+    item_title_idx = Index("item_title", "currency_id")
+
+
+class ItemDropSourceTable(Table, table_name="item_drop_source"):
+    """Contains the creatures that drop every item, ranked from the highest chance to the lowest."""
+    item_id = Column(ForeignKey(Integer, "item", "article_id"), nullable=False)
+    item_title = Column(Text, no_case=True, nullable=False)
+    rank = Column(Integer, nullable=False)
+    creature_id = Column(ForeignKey(Integer, "creature", "article_id"), nullable=False)
+    creature_title = Column(Text, nullable=False)
+    chance = Column(Real)
+    min = Column(Integer, nullable=False)
+    max = Column(Integer, nullable=False)
+
+    item_id_rank_idx = Index("item_id", "rank", unique=True)
+    item_title_rank_idx = Index("item_title", "rank")
+
+
+class CreatureLootValueTable(Table, table_name="creature_loot_value"):
+    """Contains the expected value of the loot of every creature."""
+    creature_id = Column(ForeignKey(Integer, "creature", "article_id"), primary_key=True)
+    creature_title = Column(Text, unique=True, no_case=True, nullable=False)
+    loot_value = Column(Real, nullable=False, index=True)
+    drop_count = Column(Integer, nullable=False)
+    priced_drop_count = Column(Integer, nullable=False)
+
+
+def create_tables(conn: Connection | Cursor, *, keep_existing: bool = False) -> None:
     """Create all the tables in the database.
 
     Args:
         conn: A connection to the database.
+        keep_existing: Whether to keep the tables that already exist and their rows, instead of recreating them.
 
     """
     for table in Table.all_tables():
-        conn.execute(table.get_drop_statement())
+        if not keep_existing:
+            conn.execute(table.get_drop_statement())
         conn.executescript(table.get_create_table_statement())
@@ -2,19 +2,39 @@ from __future__ import annotations
 
 import logging
 import sqlite3
+import time
 from typing import Annotated, TYPE_CHECKING
 
-from fastapi import APIRouter, Depends, FastAPI
+from fastapi import APIRouter, Depends, FastAPI, Query
+from starlette.concurrency import run_in_threadpool
 from starlette.requests import Request
-from starlette.responses import JSONResponse
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Match
 
+from tibiawikisql import parsers
 from tibiawikisql.api import WikiClient
-from tibiawikisql.models import Achievement, Book, Charm, Creature, House, Imbuement, Item, Key, Mount, Npc, Outfit, \
+from tibiawikisql.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, MetricsRegistry
+from tibiawikisql.models import ARTICLE_MODELS, Achievement, Book, Charm, Creature, Document, FuzzyMatch, House, \
+    Imbuement, \
+    Item, \
+    Key, \
+    Mount, \
+    Npc, \
+    Outfit, \
     Quest, \
+    SearchResult, \
     Spell, \
     Update, \
     World
-from tibiawikisql.parsers import AchievementParser
+from tibiawikisql.query_log import query_log
+from tibiawikisql.serving import DatabaseGeneration, InstrumentedConnection, RangeNotSatisfiableError, \
+    ResponseCache, \
+    compute_etag, \
+    etag_matches, \
+    guess_image_type, \
+    iter_blob, \
+    parse_range, \
+    read_blob
 
 if TYPE_CHECKING:
     from collections.abc import Generator
@@ -23,7 +43,77 @@ logging.basicConfig(level=logging.DEBUG)
 
 sql_logger = logging.getLogger("sqlite3")
 
+DATABASE_FILE = "tibiawiki.db"
+RESPONSE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
 wiki_client = WikiClient()
+response_cache = ResponseCache(RESPONSE_CACHE_MAX_BYTES)
+database_generation = DatabaseGeneration(DATABASE_FILE, on_change=response_cache.clear)
+query_log.enabled = True
+
+metrics = MetricsRegistry()
+http_requests = metrics.counter(
+    "tibiawikisql_http_requests_total",
+    "Number of HTTP requests served.",
+    ("method", "route", "status"),
+)
+http_request_duration = metrics.histogram(
+    "tibiawikisql_http_request_duration_seconds",
+    "Time taken to serve HTTP requests.",
+    ("method", "route"),
+)
+db_queries = metrics.histogram(
+    "tibiawikisql_db_queries_per_request",
+    "Number of SQLite statements executed per request.",
+    ("route",),
+    buckets=(0, 1, 2, 5, 10, 25, 50, 100),
+)
+db_query_duration = metrics.histogram(
+    "tibiawikisql_db_query_duration_seconds_per_request",
+    "Time spent executing SQLite statements per request.",
+    ("route",),
+)
+db_connections_opened = metrics.counter(
+    "tibiawikisql_db_connections_opened_total",
+    "Number of database connections opened.",
+)
+db_connections_in_use = metrics.gauge(
+    "tibiawikisql_db_connections_in_use",
+    "Number of database connections currently open.",
+)
+metrics.counter(
+    "tibiawikisql_response_cache_requests_total",
+    "Number of lookups in the response cache, by result.",
+    ("result",),
+    function=lambda: {("hit",): response_cache.hits, ("miss",): response_cache.misses},
+)
+metrics.gauge(
+    "tibiawikisql_response_cache_hit_ratio",
+    "Ratio of response cache lookups that were hits.",
+    function=lambda: response_cache.hits / max(response_cache.hits + response_cache.misses, 1),
+)
+metrics.gauge(
+    "tibiawikisql_response_cache_entries",
+    "Number of responses in the cache.",
+    function=lambda: len(response_cache),
+)
+metrics.gauge(
+    "tibiawikisql_response_cache_bytes",
+    "Total size of the responses in the cache.",
+    function=lambda: response_cache.size,
+)
+metrics.gauge(
+    "tibiawikisql_database_generation_timestamp_seconds",
+    "Unix timestamp of when the served database was generated.",
+    function=lambda: float(database_generation.check() or 0),
+)
+metrics.gauge(
+    "tibiawikisql_database_info",
+    "Version of TibiaWikiSQL that generated the served database.",
+    ("version",),
+    function=lambda: {(database_generation.version,): 1} if database_generation.check() else {},
+)
+
 
 app = FastAPI(
     title="TibiaWikiSQL",
@@ -49,29 +139,148 @@ async def exception_handler(request: Request, exc: Exception):
     )
 
 
-def get_db_connection() -> Generator[sqlite3.Connection]:
-    conn = sqlite3.connect("tibiawiki.db")
+@app.middleware("http")
+async def cache_middleware(request: Request, call_next):
+    if request.method != "GET" or not request.url.path.startswith(db_router.prefix):
+        return await call_next(request)
+    key = request.url.path
+    if request.url.query:
+        key += f"?{request.url.query}"
+    # Checking the generation may read the database, so it must not block the event loop.
+    etag = compute_etag(await run_in_threadpool(database_generation.check), key)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        request.state.cached = True
+        return Response(status_code=304, headers=headers)
+    body = response_cache.get(key)
+    if body is not None:
+        request.state.cached = True
+        return Response(body, media_type="application/json", headers=headers)
+    response = await call_next(request)
+    if response.status_code != 200 or response.headers.get("content-type") != "application/json":
+        return response
+    body = b"".join([chunk async for chunk in response.body_iterator])
+    response_cache.put(key, body)
+    return Response(body, media_type="application/json", headers=headers)
+
+
+def get_route_path(request: Request) -> str:
+    """Get the path template of the route that handled a request, to use as a label without unbounded values."""
+    route = request.scope.get("route")
+    if route is not None:
+        return route.path
+    if getattr(request.state, "cached", False):
+        return "cached"
+    return "unmatched"
+
+
+@app.middleware("http")
+async def metrics_middleware(request: Request, call_next):
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = get_route_path(request)
+        http_requests.inc(method=request.method, route=route, status=str(status))
+        http_request_duration.observe(time.perf_counter() - start, method=request.method, route=route)
+
+
+def get_db_connection(request: Request) -> Generator[sqlite3.Connection]:
+    # The connection may be closed by a different thread of the pool than the one that opened it.
+    conn = sqlite3.connect(DATABASE_FILE, factory=InstrumentedConnection, check_same_thread=False)
     conn.set_trace_callback(sql_logger.info)
+    db_connections_opened.inc()
+    db_connections_in_use.inc()
     try:
         yield conn
     finally:
         conn.close()
+        db_connections_in_use.dec()
+        route = get_route_path(request)
+        db_queries.observe(conn.query_count, route=route)
+        db_query_duration.observe(conn.query_time, route=route)
 
 
 Conn = Annotated[sqlite3.Connection, Depends(get_db_connection)]
 
 
+def get_document_response(conn: sqlite3.Connection, type_: str, title: str) -> Response | None:
+    """Get the precomputed document of an article as a response, if documents were generated."""
+    try:
+        document = Document.get_by_type_and_title(conn, type_, title)
+    except sqlite3.OperationalError:
+        return None
+    if document is None:
+        return None
+    return Response(document.get_json(), media_type="application/json")
+
+
+def get_blob_response(
+        request: Request,
+        conn: sqlite3.Connection,
+        table: str,
+        column: str,
+        rowid: int,
+        size: int,
+        etag: str,
+) -> Response:
+    """Get a response streaming an image BLOB, supporting conditional and range requests."""
+    headers = {"ETag": etag, "Cache-Control": "no-cache", "Accept-Ranges": "bytes"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    media_type = guess_image_type(read_blob(conn, table, column, rowid, offset=0, length=16))
+    byte_range = None
+    if request.headers.get("if-range") in (None, etag):
+        try:
+            byte_range = parse_range(request.headers.get("range"), size)
+        except RangeNotSatisfiableError:
+            return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+    start, end = byte_range or (0, size - 1)
+    if byte_range:
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
+    return StreamingResponse(
+        iter_blob(DATABASE_FILE, table, column, rowid, start=start, end=end),
+        status_code=206 if byte_range else 200,
+        media_type=media_type,
+        headers=headers,
+    )
+
+
+def get_image_response(request: Request, conn: sqlite3.Connection, image_hash: str | None) -> Response:
+    """Get a response streaming an image from the image store, using its hash as entity tag."""
+    if image_hash is None:
+        return Response(status_code=404)
+    row = conn.execute("SELECT rowid, length(content) FROM image WHERE hash = ?", (image_hash,)).fetchone()
+    if row is None:
+        return Response(status_code=404)
+    return get_blob_response(request, conn, "image", "content", *row, f'"{image_hash}"')
+
+
 @app.get("/healthcheck", tags=["General"])
 def healthcheck() -> bool:
     return True
 
 
+@app.get("/metrics", tags=["General"])
+def get_metrics() -> Response:
+    return Response(metrics.render(), media_type=METRICS_CONTENT_TYPE)
+
+
+@app.get("/queries", tags=["General"])
+def get_queries() -> list[dict]:
+    return [shape.to_dict() for shape in query_log.get_shapes()]
+
+
 @db_router.get("/achievements/{title}")
 def get_achievement(
         conn: Conn,
         title: str,
 ) -> Achievement | None:
-    return Achievement.get_by_title(conn, title)
+    return get_document_response(conn, "achievements", title) or Achievement.get_by_title(conn, title)
 
 
 @wiki_router.get("/achievements/{title}")
@@ -81,14 +290,14 @@ def get_wiki_achievement(
     article = wiki_client.get_article(title)
     if not article:
         return None
-    return AchievementParser.from_article(article)
+    return parsers.AchievementParser.from_article(article)
 
 @db_router.get("/books/{title}")
 def get_book(
         conn: Conn,
         title: str,
 ) -> Book | None:
-    return Book.get_by_title(conn, title)
+    return get_document_response(conn, "books", title) or Book.get_by_title(conn, title)
 
 
 
@@ -97,7 +306,7 @@ def get_charm(
         conn: Conn,
         title: str,
 ) -> Charm | None:
-    return Charm.get_by_title(conn, title)
+    return get_document_response(conn, "charms", title) or Charm.get_by_title(conn, title)
 
 
 @db_router.get("/creatures/{title}")
@@ -105,7 +314,7 @@ def get_creature(
         conn: Conn,
         title: str,
 ) -> Creature | None:
-    return Creature.get_by_title(conn, title)
+    return get_document_response(conn, "creatures", title) or Creature.get_by_title(conn, title)
 
 
 @db_router.get("/houses/{title}")
@@ -113,7 +322,7 @@ def get_house(
         conn: Conn,
         title: str,
 ) -> House | None:
-    return House.get_by_title(conn, title)
+    return get_document_response(conn, "houses", title) or House.get_by_title(conn, title)
 
 
 @db_router.get("/imbuements/{title}")
@@ -121,7 +330,7 @@ def get_imbuement(
         conn: Conn,
         title: str,
 ) -> Imbuement | None:
-    return Imbuement.get_by_title(conn, title)
+    return get_document_response(conn, "imbuements", title) or Imbuement.get_by_title(conn, title)
 
 
 @db_router.get("/items/{title}")
@@ -129,7 +338,7 @@ def get_item(
         conn: Conn,
         title: str,
 ) -> Item | None:
-    return Item.get_by_title(conn, title)
+    return get_document_response(conn, "items", title) or Item.get_by_title(conn, title)
 
 
 @db_router.get("/keys/{title}")
@@ -137,7 +346,20 @@ def get_key(
         conn: Conn,
         title: str,
 ) -> Key | None:
-    return Key.get_by_title(conn, title)
+    return get_document_response(conn, "keys", title) or Key.get_by_title(conn, title)
+
+
+@db_router.get("/map/{z}")
+def get_map(
+        conn: Conn,
+        request: Request,
+        z: int,
+) -> Response:
+    row = conn.execute("SELECT rowid, length(image) FROM map WHERE z = ? AND image IS NOT NULL", (z,)).fetchone()
+    if row is None:
+        return Response(status_code=404)
+    etag = compute_etag(database_generation.check(), request.url.path)
+    return get_blob_response(request, conn, "map", "image", *row, etag)
 
 
 @db_router.get("/mounts/{title}")
@@ -145,7 +367,7 @@ def get_mount(
         conn: Conn,
         title: str,
 ) -> Mount | None:
-    return Mount.get_by_title(conn, title)
+    return get_document_response(conn, "mounts", title) or Mount.get_by_title(conn, title)
 
 
 @db_router.get("/npcs/{title}")
@@ -153,7 +375,7 @@ def get_npc(
         conn: Conn,
         title: str,
 ) -> Npc | None:
-    return Npc.get_by_title(conn, title)
+    return get_document_response(conn, "npcs", title) or Npc.get_by_title(conn, title)
 
 
 @db_router.get("/outfits/{title}")
@@ -161,7 +383,23 @@ def get_outfit(
         conn: Conn,
         title: str,
 ) -> Outfit | None:
-    return Outfit.get_by_title(conn, title)
+    return get_document_response(conn, "outfits", title) or Outfit.get_by_title(conn, title)
+
+
+@db_router.get("/outfits/{title}/images/{sex}/{addon}")
+def get_outfit_image(
+        conn: Conn,
+        request: Request,
+        title: str,
+        sex: str,
+        addon: int,
+) -> Response:
+    row = conn.execute(
+        "SELECT i.image_hash FROM outfit_image i JOIN outfit o ON o.article_id = i.outfit_id "
+        "WHERE o.title = ? AND i.sex = ? COLLATE NOCASE AND i.addon = ?",
+        (title, sex, addon),
+    ).fetchone()
+    return get_image_response(request, conn, row[0] if row else None)
 
 
 @db_router.get("/quests/{title}")
@@ -169,7 +407,27 @@ def get_quest(
         conn: Conn,
         title: str,
 ) -> Quest | None:
-    return Quest.get_by_title(conn, title)
+    return get_document_response(conn, "quests", title) or Quest.get_by_title(conn, title)
+
+
+@db_router.get("/closest")
+def find_closest(
+        conn: Conn,
+        name: str,
+        type: Annotated[list[str] | None, Query()] = None,
+        limit: Annotated[int, Query(ge=1, le=50)] = 5,
+) -> list[FuzzyMatch]:
+    return FuzzyMatch.find(conn, name, types=type, limit=limit)
+
+
+@db_router.get("/search")
+def search(
+        conn: Conn,
+        q: str,
+        type: Annotated[list[str] | None, Query()] = None,
+        limit: Annotated[int, Query(ge=1, le=100)] = 20,
+) -> list[SearchResult]:
+    return SearchResult.search(conn, q, types=type, limit=limit)
 
 
 @db_router.get("/spells/{title}")
@@ -177,7 +435,7 @@ def get_spell(
         conn: Conn,
         title: str,
 ) -> Spell | None:
-    return Spell.get_by_title(conn, title)
+    return get_document_response(conn, "spells", title) or Spell.get_by_title(conn, title)
 
 
 @db_router.get("/updates/byVersion/{version}")
@@ -193,7 +451,7 @@ def get_update(
         conn: Conn,
         title: str,
 ) -> Update | None:
-    return Update.get_by_title(conn, title)
+    return get_document_response(conn, "updates", title) or Update.get_by_title(conn, title)
 
 
 @db_router.get("/worlds/{title}")
@@ -201,7 +459,24 @@ def get_world(
         conn: Conn,
         title: str,
 ) -> World | None:
-    return World.get_by_title(conn, title)
+    return get_document_response(conn, "worlds", title) or World.get_by_title(conn, title)
+
+
+@db_router.get("/{type}/{title}/image")
+def get_article_image(
+        conn: Conn,
+        request: Request,
+        type: str,
+        title: str,
+) -> Response:
+    model = ARTICLE_MODELS.get(type)
+    if model is None or "image_hash" not in model.table.column_map:
+        return Response(status_code=404)
+    row = conn.execute(
+        f"SELECT image_hash FROM {model.table.__tablename__} WHERE title = ?",  # noqa: S608
+        (title,),
+    ).fetchone()
+    return get_image_response(request, conn, row[0] if row else None)
 
 
 app.include_router(db_router)
@@ -0,0 +1,403 @@
+"""Utilities used by the HTTP server to avoid recomputing responses."""
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+
+
+class ResponseCache:
+    """A thread-safe LRU cache of serialized responses, bounded by their total size in bytes."""
+
+    def __init__(self, max_bytes: int, max_entries: int | None = None) -> None:
+        """Create an instance of the class.
+
+        Args:
+            max_bytes: The maximum total size of the cached values. Values bigger than this are never cached.
+            max_entries: The maximum number of entries to keep, if any.
+
+        """
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> bytes | None:
+        """Get a cached value, marking it as the most recently used.
+
+        Args:
+            key: The key of the value.
+
+        Returns:
+            The cached value, or [None][] if it is not cached.
+
+        """
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: str, value: bytes) -> None:
+        """Store a value, evicting the least recently used values if the cache is full.
+
+        Args:
+            key: The key of the value.
+            value: The value to store.
+
+        """
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous)
+            self._entries[key] = value
+            self.size += len(value)
+            while self.size > self.max_bytes or (
+                self.max_entries is not None and len(self._entries) > self.max_entries
+            ):
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+
+    def clear(self) -> None:
+        """Remove all the cached values."""
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+
+class DatabaseGeneration:
+    """Tracks the generation of the database file being served.
+
+    The generation is the timestamp stored in `database_info` when the database was generated.
+    The file's metadata is checked on every call, so the generation is updated when the file is replaced.
+    """
+
+    def __init__(self, path: str, on_change: Callable[[], None] | None = None) -> None:
+        """Create an instance of the class.
+
+        Args:
+            path: The path to the database file.
+            on_change: A function called every time a different database file is detected.
+
+        """
+        self.path = path
+        self.on_change = on_change
+        self.timestamp = ""
+        self.version = ""
+        self._file_key: tuple[int, int, int] | None = None
+        self._lock = threading.Lock()
+
+    def check(self) -> str:
+        """Get the current generation of the database, detecting if the file was replaced.
+
+        Returns:
+            The timestamp of the database's generation, or an empty string if unknown.
+
+        """
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return ""
+        file_key = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if file_key == self._file_key:
+            return self.timestamp
+        with self._lock:
+            if file_key != self._file_key:
+                info = read_database_info(self.path)
+                self.timestamp = info.get("timestamp", "")
+                self.version = info.get("version", "")
+                self._file_key = file_key
+                if self.on_change:
+                    self.on_change()
+        return self.timestamp
+
+
+def read_database_info(path: str) -> dict[str, str]:
+    """Read the information stored about a database file when it was generated.
+
+    Args:
+        path: The path to the database file.
+
+    Returns:
+        The keys and values in ``database_info``, or an empty dictionary if they can't be read.
+
+    """
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        rows = conn.execute("SELECT key, value FROM database_info").fetchall()
+    except sqlite3.Error:
+        rows = []
+    finally:
+        conn.close()
+    return dict(rows)
+
+
+def read_database_timestamp(path: str) -> str:
+    """Read the generation timestamp of a database file.
+
+    Args:
+        path: The path to the database file.
+
+    Returns:
+        The value of the ``timestamp`` key in ``database_info``, or an empty string if not found.
+
+    """
+    return read_database_info(path).get("timestamp", "")
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """A cursor that records the statements it executes in its connection."""
+
+    def execute(self, sql: str, parameters: Any = (), /) -> InstrumentedCursor:
+        """Execute a statement."""
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self.connection.record_query(time.perf_counter() - start)
+
+    def executemany(self, sql: str, parameters: Iterable[Any], /) -> InstrumentedCursor:
+        """Execute a statement for every set of parameters."""
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, parameters)
+        finally:
+            self.connection.record_query(time.perf_counter() - start)
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """A connection that counts the statements executed through it, and the time spent executing them.
+
+    Meant to be used as the ``factory`` of [sqlite3.connect][]. The time of a query only includes fetching its first
+    row, the rest of the rows are fetched while iterating the cursor.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """Create an instance of the class, accepting the same arguments as [sqlite3.Connection][]."""
+        super().__init__(*args, **kwargs)
+        self.query_count = 0
+        self.query_time = 0.0
+
+    def record_query(self, elapsed: float) -> None:
+        """Record an executed statement.
+
+        Args:
+            elapsed: The seconds spent executing the statement.
+
+        """
+        self.query_count += 1
+        self.query_time += elapsed
+
+    def cursor(self, factory: type[sqlite3.Cursor] = InstrumentedCursor) -> sqlite3.Cursor:
+        """Create a cursor, which records the statements it executes by default."""
+        return super().cursor(factory)
+
+    def execute(self, sql: str, parameters: Any = (), /) -> sqlite3.Cursor:
+        """Execute a statement with a new cursor."""
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql: str, parameters: Iterable[Any], /) -> sqlite3.Cursor:
+        """Execute a statement for every set of parameters with a new cursor."""
+        return self.cursor().executemany(sql, parameters)
+
+
+def compute_etag(generation: str, path: str) -> str:
+    """Compute the entity tag of a response.
+
+    Responses only change when the database is generated again, so the tag is derived from the database's
+    generation and the requested path.
+
+    Args:
+        generation: The generation timestamp of the database.
+        path: The requested path, including its query string.
+
+    Returns:
+        A quoted strong entity tag.
+
+    """
+    digest = hashlib.sha1(f"{generation}:{path}".encode(), usedforsecurity=False).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Check if an ``If-None-Match`` header matches an entity tag.
+
+    Args:
+        if_none_match: The value of the header, if any.
+        etag: The current entity tag of the resource.
+
+    Returns:
+        Whether the client's cached copy is still valid.
+
+    """
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip().removeprefix("W/")  # noqa: PLW2901
+        if candidate in ("*", etag):
+            return True
+    return False
+
+
+BLOB_CHUNK_SIZE = 64 * 1024
+"""The number of bytes read at a time when streaming a BLOB."""
+
+IMAGE_SIGNATURES = (
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+)
+
+
+class RangeNotSatisfiableError(ValueError):
+    """Raised when the requested byte range is outside the resource."""
+
+
+def parse_range(header: str | None, size: int) -> tuple[int, int] | None:
+    """Parse the value of a ``Range`` header.
+
+    Only single byte ranges are supported, other kinds of ranges are ignored, so the full resource is served.
+
+    Args:
+        header: The value of the header, if any.
+        size: The size of the resource in bytes.
+
+    Returns:
+        The first and last byte positions of the range, both inclusive, or [None][] if the whole resource is requested.
+
+    Raises:
+        RangeNotSatisfiableError: The range does not overlap the resource.
+
+    """
+    if not header or not header.startswith("bytes=") or "," in header or "-" not in header:
+        return None
+    start_str, _, end_str = header.removeprefix("bytes=").strip().partition("-")
+    try:
+        start = int(start_str) if start_str else None
+        end = int(end_str) if end_str else None
+    except ValueError:
+        return None
+    if start is None:
+        if end is None:
+            return None
+        if end == 0 or size == 0:
+            raise RangeNotSatisfiableError(header)
+        return max(size - end, 0), size - 1
+    if end is not None and end < start:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiableError(header)
+    if end is None:
+        end = size - 1
+    return start, min(end, size - 1)
+
+
+def guess_image_type(data: bytes) -> str:
+    """Guess the media type of an image from its first bytes.
+
+    Args:
+        data: The beginning of the image.
+
+    Returns:
+        The media type of the image, or ``application/octet-stream`` if unknown.
+
+    """
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "image/webp"
+    for signature, media_type in IMAGE_SIGNATURES:
+        if data.startswith(signature):
+            return media_type
+    return "application/octet-stream"
+
+
+def read_blob(
+        conn: sqlite3.Connection,
+        table: str,
+        column: str,
+        rowid: int,
+        *,
+        offset: int,
+        length: int,
+) -> bytes:
+    """Read part of a BLOB without loading the whole value.
+
+    Args:
+        conn: A connection to the database.
+        table: The name of the table containing the BLOB.
+        column: The name of the column containing the BLOB.
+        rowid: The rowid of the row containing the BLOB.
+        offset: The position of the first byte to read.
+        length: The number of bytes to read.
+
+    Returns:
+        The bytes read.
+
+    """
+    if hasattr(conn, "blobopen"):
+        with conn.blobopen(table, column, rowid, readonly=True) as blob:
+            blob.seek(offset)
+            return blob.read(length)
+    row = conn.execute(
+        f"SELECT substr({column}, ?, ?) FROM {table} WHERE rowid = ?",  # noqa: S608
+        (offset + 1, length, rowid),
+    ).fetchone()
+    return row[0] if row and row[0] is not None else b""
+
+
+def iter_blob(
+        path: str,
+        table: str,
+        column: str,
+        rowid: int,
+        *,
+        start: int,
+        end: int,
+        chunk_size: int = BLOB_CHUNK_SIZE,
+) -> Iterator[bytes]:
+    """Stream a range of a BLOB in chunks.
+
+    A new read-only connection is used, so the stream does not depend on the lifetime of the request's connection.
+
+    Args:
+        path: The path to the database file.
+        table: The name of the table containing the BLOB.
+        column: The name of the column containing the BLOB.
+        rowid: The rowid of the row containing the BLOB.
+        start: The position of the first byte to read.
+        end: The position of the last byte to read, inclusive.
+        chunk_size: The maximum number of bytes to read at a time.
+
+    Yields:
+        The chunks of the BLOB.
+
+    """
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+    try:
+        position = start
+        while position <= end:
+            chunk = read_blob(conn, table, column, rowid, offset=position, length=min(chunk_size, end - position + 1))
+            if not chunk:
+                break
+            position += len(chunk)
+            yield chunk
+    finally:
+        conn.close()
@@ -0,0 +1,39 @@
+"""Task for precomputing the JSON documents of every article."""
+from __future__ import annotations
+
+from typing import Any, TYPE_CHECKING
+
+from colorama import Fore, Style
+
+from tibiawikisql.models.document import Document
+
+if TYPE_CHECKING:
+    import sqlite3
+
+
+def generate_documents(
+    conn: sqlite3.Connection,
+    *,
+    categories: dict[str, Any],
+    enabled_categories: set[str],
+    progress_bar: Any,
+    timed: Any,
+    echo: Any,
+) -> None:
+    """Serialize every article of the enabled categories into the document table."""
+    documents_table = Document.table.__tablename__
+    count = 0
+    with timed() as t, conn:
+        conn.execute(f"DELETE FROM {documents_table}")  # noqa: S608
+        for key, category in categories.items():
+            if key not in enabled_categories:
+                continue
+            model = category.parser.model
+            table = category.parser.table.__tablename__
+            total = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]  # noqa: S608
+            # Articles are read in batches, loading the child rows of the whole batch at once.
+            with progress_bar(model.iter_all(conn), total, f"Building {key} documents") as bar:
+                for article in bar:
+                    Document.from_model(key, article).insert(conn)
+                    count += 1
+    echo(f"{Fore.GREEN}\tBuilt {count:,} documents in {t.elapsed:.2f} seconds.{Style.RESET_ALL}")
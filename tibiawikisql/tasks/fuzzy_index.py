@@ -0,0 +1,50 @@
+"""Task for building the trigram index used for typo-tolerant lookups."""
+from __future__ import annotations
+
+from typing import Any, TYPE_CHECKING
+
+from colorama import Fore, Style
+
+from tibiawikisql.models.fuzzy import get_trigrams
+from tibiawikisql.schema import FuzzyNameTable, FuzzyTrigramTable
+
+if TYPE_CHECKING:
+    import sqlite3
+
+
+def generate_fuzzy_index(
+    conn: sqlite3.Connection,
+    *,
+    categories: dict[str, Any],
+    enabled_categories: set[str],
+    timed: Any,
+    echo: Any,
+) -> None:
+    """Index the trigrams of the titles and names of the articles in the enabled categories."""
+    names_table = FuzzyNameTable.__tablename__
+    trigrams_table = FuzzyTrigramTable.__tablename__
+    names = []
+    trigrams = []
+    with timed() as t:
+        for key, category in categories.items():
+            if key not in enabled_categories:
+                continue
+            table = category.parser.table.__tablename__
+            for article_id, title, name in conn.execute(f"SELECT article_id, title, name FROM {table}"):  # noqa: S608
+                for value in dict.fromkeys(v for v in (title, name) if v):
+                    value_trigrams = get_trigrams(value)
+                    if not value_trigrams:
+                        continue
+                    name_id = len(names) + 1
+                    names.append((name_id, key, article_id, title, value, len(value_trigrams)))
+                    trigrams.extend((trigram, name_id) for trigram in value_trigrams)
+        with conn:
+            conn.execute(f"DELETE FROM {trigrams_table}")  # noqa: S608
+            conn.execute(f"DELETE FROM {names_table}")  # noqa: S608
+            conn.executemany(
+                f"INSERT INTO {names_table}(id, type, article_id, title, value, trigram_count) "
+                "VALUES(?, ?, ?, ?, ?, ?)",
+                names,
+            )
+            conn.executemany(f"INSERT INTO {trigrams_table}(trigram, name_id) VALUES(?, ?)", trigrams)
+    echo(f"{Fore.GREEN}\tIndexed {len(names):,} names for fuzzy lookups in {t.elapsed:.2f} seconds.{Style.RESET_ALL}")
@@ -1,15 +1,45 @@
 """Task for fetching and storing article images."""
 from __future__ import annotations
 
-import datetime
-import json
+import contextlib
+import contextvars
+import hashlib
 import os
 import sqlite3
-from typing import Any
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from typing import Any, NamedTuple, TYPE_CHECKING
+from urllib.parse import urlsplit
 
 import requests
 from colorama import Fore, Style
 from pypika import Parameter, SQLLiteQuery as Query, Table
+from requests.adapters import HTTPAdapter
+
+from tibiawikisql.image_cache import ImageCache
+from tibiawikisql.report import record_response
+from tibiawikisql.scheduling import run_atomically
+
+if TYPE_CHECKING:
+    from collections.abc import Generator, Iterator
+
+    from tibiawikisql.image_cache import CacheEntry
+
+IMAGE_FETCH_WORKERS = 8
+"""The number of images loaded concurrently."""
+
+IMAGE_WRITE_BATCH_SIZE = 200
+"""The number of images written to the database at a time."""
+
+IMAGE_MISSING_TTL = 7 * 24 * 60 * 60
+"""The number of seconds an image that was not found is not looked up again."""
+
+IMAGE_CACHED = "cached"
+IMAGE_REVALIDATED = "revalidated"
+IMAGE_FETCHED = "fetched"
+IMAGE_FAILED = "failed"
 
 OUTFIT_NAME_TEMPLATES = [
     "Outfit %s Male.gif",
@@ -26,30 +56,309 @@ OUTFIT_ADDON_SEQUENCE = (0, 1, 2, 3) * 2
 OUTFIT_SEX_SEQUENCE = ["Male"] * 4 + ["Female"] * 4
 
 
-def get_cache_info(folder_name: str) -> dict[str, datetime.datetime]:
-    """Get a mapping of stored image names and their last known wiki upload timestamp."""
-    try:
-        with open(f"images/{folder_name}/cache_info.json") as f:
-            data = json.load(f)
-            return {k: datetime.datetime.fromisoformat(v) for k, v in data.items()}
-    except (FileNotFoundError, json.JSONDecodeError):
-        return {}
+class HostLimiter:
+    """Limits the number of concurrent requests made to the same host."""
+
+    def __init__(self, max_per_host: int | None = None) -> None:
+        """Create an instance of the class.
+
+        Args:
+            max_per_host: The maximum number of concurrent requests per host. If unset, requests are not limited.
+
+        """
+        self.max_per_host = max_per_host
+        self._semaphores: dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def limit(self, url: str) -> Iterator[None]:
+        """Wait until a request can be made to the host of a URL, holding the slot while the context is active."""
+        if self.max_per_host is None:
+            yield
+            return
+        host = urlsplit(url).netloc
+        with self._lock:
+            semaphore = self._semaphores.setdefault(host, threading.BoundedSemaphore(self.max_per_host))
+        with semaphore:
+            yield
+
+
+def create_session(workers: int = IMAGE_FETCH_WORKERS) -> requests.Session:
+    """Create a session whose connection pool can be shared by all the download workers.
+
+    The responses received are counted towards the current stage of the generation report.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.hooks["response"].append(record_response)
+    return session
 
 
-def save_cache_info(folder_name: str, cache_info: dict[str, datetime.datetime]) -> None:
-    """Store image cache metadata for a folder."""
-    with open(f"images/{folder_name}/cache_info.json", "w") as f:
-        json.dump({k: v.isoformat() for k, v in cache_info.items()}, f)
+class ImageLoad(NamedTuple):
+    """The result of loading an image's content."""
 
+    image: Any
+    """The information of the image."""
+    status: str
+    """Whether the image was ``cached``, ``revalidated``, ``fetched`` or ``failed``."""
+    content: bytes | None = None
+    """The content of the image, unless it failed."""
+    etag: str | None = None
+    """The entity tag sent by the server, if the image was fetched."""
+    last_modified: str | None = None
+    """The ``Last-Modified`` header sent by the server, if the image was fetched."""
 
-def fetch_image(session: requests.Session, folder: str, image: Any) -> bytes:
-    """Fetch an image from TibiaWiki and persist it to disk."""
-    response = session.get(image.file_url)
+
+@dataclass
+class ImageResults:
+    """Counts of how the images of a group were loaded."""
+
+    fetched: int = 0
+    cached: int = 0
+    revalidated: int = 0
+    failed: list[str] = field(default_factory=list)
+
+
+def read_file(path: str) -> bytes:
+    """Read the content of a cached file."""
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def fetch_image(
+    session: requests.Session,
+    path: str,
+    image: Any,
+    limiter: HostLimiter | None = None,
+    entry: CacheEntry | None = None,
+) -> ImageLoad:
+    """Fetch an image from TibiaWiki and persist it to disk.
+
+    If there is a cache entry with validators, the request is conditional and the cached file is used if unchanged.
+    """
+    headers = {}
+    if entry is not None and entry.etag:
+        headers["If-None-Match"] = entry.etag
+    if entry is not None and entry.last_modified:
+        headers["If-Modified-Since"] = entry.last_modified
+    with (limiter or HostLimiter()).limit(image.file_url):
+        response = session.get(image.file_url, headers=headers)
+    if response.status_code == HTTPStatus.NOT_MODIFIED:
+        return ImageLoad(image, IMAGE_REVALIDATED, read_file(path))
     response.raise_for_status()
     image_bytes = response.content
-    with open(f"images/{folder}/{image.file_name}", "wb") as f:
+    with open(path, "wb") as f:
         f.write(image_bytes)
-    return image_bytes
+    etag = response.headers.get("ETag")
+    return ImageLoad(image, IMAGE_FETCHED, image_bytes, etag, response.headers.get("Last-Modified"))
+
+
+def load_images(
+    session: requests.Session,
+    cache: ImageCache,
+    folder: str,
+    images: list[Any],
+    *,
+    workers: int = IMAGE_FETCH_WORKERS,
+    limiter: HostLimiter | None = None,
+) -> Generator[ImageLoad]:
+    """Load the content of images concurrently, yielding the results as they complete.
+
+    Images are read from the cache if they haven't been uploaded again since they were cached.
+    Otherwise, they are revalidated if the server sent validators for the cached file, or fetched again.
+    The cache's index is only accessed from the calling thread.
+    """
+    cache.get_folder(folder)
+
+    def load(image: Any, entry: CacheEntry | None) -> ImageLoad:
+        path = cache.get_path(folder, image.file_name)
+        if entry is not None:
+            try:
+                if entry.wiki_timestamp is not None and image.timestamp <= entry.wiki_timestamp:
+                    return ImageLoad(image, IMAGE_CACHED, read_file(path))
+                return fetch_image(session, path, image, limiter, entry)
+            except FileNotFoundError:
+                pass
+        return fetch_image(session, path, image, limiter)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        # Each worker runs in a copy of the current context, so its requests are counted towards the current stage.
+        futures = {
+            executor.submit(contextvars.copy_context().run, load, image, cache.get(folder, image.file_name)): image
+            for image in images
+        }
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except requests.RequestException:
+                yield ImageLoad(futures[future], IMAGE_FAILED)
+
+
+def get_image_hash(image_bytes: bytes) -> str:
+    """Get the hash identifying an image's content in the image table."""
+    return hashlib.sha256(image_bytes).hexdigest()
+
+
+class ImageWriter:
+    """Buffers the images to store, writing them to the database in batches.
+
+    Identical images are only stored once, rows referencing an image are written with the given statement,
+    receiving the image's hash as the first parameter. Each batch is committed in its own transaction, so other jobs
+    can keep writing while images are being fetched.
+    """
+
+    def __init__(
+        self,
+        conn: sqlite3.Connection,
+        reference_sql: str,
+        batch_size: int = IMAGE_WRITE_BATCH_SIZE,
+    ) -> None:
+        """Create an instance of the class.
+
+        Args:
+            conn: A connection to the database.
+            reference_sql: The statement used to reference the stored images.
+            batch_size: The number of images to buffer before writing them.
+
+        """
+        self.conn = conn
+        self.reference_sql = reference_sql
+        self.batch_size = batch_size
+        self._images: dict[str, bytes] = {}
+        self._references: list[tuple[Any, ...]] = []
+
+    def add(self, image_bytes: bytes, *params: Any) -> None:
+        """Add an image to store, with the rest of the parameters of its reference statement."""
+        image_hash = get_image_hash(image_bytes)
+        self._images[image_hash] = image_bytes
+        self._references.append((image_hash, *params))
+        if len(self._references) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered images to the database."""
+        if not self._references:
+            return
+        images = list(self._images.items())
+        references = list(self._references)
+
+        def write(conn: sqlite3.Connection) -> None:
+            conn.executemany("INSERT OR IGNORE INTO image(hash, content) VALUES(?, ?)", images)
+            conn.executemany(self.reference_sql, references)
+
+        run_atomically(self.conn, write)
+        self._images.clear()
+        self._references.clear()
+
+
+def write_images(
+    writer: ImageWriter,
+    session: requests.Session,
+    cache: ImageCache,
+    folder: str,
+    images: list[Any],
+    *,
+    get_params: Any,
+    label: str,
+    workers: int,
+    limiter: HostLimiter | None,
+    progress_bar: Any,
+    img_label: Any,
+) -> ImageResults:
+    """Load images concurrently and buffer them in the writer as they complete.
+
+    The parameters used to reference each image are obtained by calling ``get_params`` with the image.
+    If it returns [None][], the image is only cached.
+    """
+    results = ImageResults()
+    loads = load_images(session, cache, folder, images, workers=workers, limiter=limiter)
+    with progress_bar(loads, len(images), label, item_show_func=lambda r: img_label(r.image if r else None)) as bar:
+        for load in bar:
+            image = load.image
+            if load.status == IMAGE_FAILED:
+                results.failed.append(image.file_name)
+                continue
+            if load.status == IMAGE_FETCHED:
+                results.fetched += 1
+                cache.record(
+                    folder,
+                    image.file_name,
+                    load.content,
+                    wiki_timestamp=image.timestamp,
+                    etag=load.etag,
+                    last_modified=load.last_modified,
+                )
+            elif load.status == IMAGE_REVALIDATED:
+                results.revalidated += 1
+                cache.touch(folder, image.file_name, wiki_timestamp=image.timestamp)
+            else:
+                results.cached += 1
+                cache.touch(folder, image.file_name)
+            params = get_params(image)
+            if params is not None:
+                writer.add(load.content, *params)
+    writer.flush()
+    cache.commit()
+    return results
+
+
+def resolve_images(
+    wiki_client: Any,
+    cache: ImageCache,
+    titles: list[str],
+    *,
+    missing_ttl: float = IMAGE_MISSING_TTL,
+) -> dict[str, Any]:
+    """Resolve the information of a list of image titles, looking up each distinct title once.
+
+    Titles that were recently found to be missing are skipped, and newly missing titles are recorded in the cache.
+
+    Returns:
+        A mapping of the titles to the information of the images that exist.
+
+    """
+    known_missing = cache.get_missing(missing_ttl)
+    pending = [title for title in dict.fromkeys(titles) if title not in known_missing]
+    resolved = {}
+    missing = []
+    for title, image in wiki_client.resolve_images(pending):
+        if image is None:
+            missing.append(title)
+        else:
+            resolved[title] = image
+    cache.record_missing(missing)
+    cache.forget_missing(resolved)
+    cache.commit()
+    return resolved
+
+
+def echo_image_results(echo: Any, name: str, elapsed: float, results: ImageResults) -> None:
+    """Show the results of saving a group of images."""
+    if results.failed:
+        failed = results.failed
+        echo(f"{Style.RESET_ALL}\tCould not fetch {len(failed):,} images.{Style.RESET_ALL}")
+        echo(f"\t-> {Style.RESET_ALL}{f'{Style.RESET_ALL},{Style.RESET_ALL}'.join(failed)}{Style.RESET_ALL}")
+    echo(
+        f"{Fore.GREEN}\tSaved {name} images in {elapsed:.2f} seconds."
+        f"\n\t{results.fetched:,} fetched, {results.cached:,} from cache, "
+        f"{results.revalidated:,} revalidated.{Style.RESET_ALL}",
+    )
+
+
+def get_image_titles(
+    conn: sqlite3.Connection | sqlite3.Cursor,
+    category: Any,
+    additional_titles: list[str] | None = None,
+) -> list[str]:
+    """Get the image file titles of the articles of a category."""
+    category_table = Table(category.parser.table.__tablename__)
+    select_query = Query.from_(category_table).select(category_table.title)
+    results = conn.execute(select_query.get_sql())
+    article_titles = [row[0] for row in results]
+    article_titles.extend(additional_titles or ())
+    return [f"{title}{category.extension}" for title in dict.fromkeys(article_titles)]
 
 
 def save_images(
@@ -63,64 +372,50 @@ def save_images(
     img_label: Any,
     timed: Any,
     echo: Any,
+    session: requests.Session | None = None,
+    cache: ImageCache | None = None,
+    resolved: dict[str, Any] | None = None,
+    workers: int = IMAGE_FETCH_WORKERS,
+    limiter: HostLimiter | None = None,
 ) -> None:
-    """Fetch and save article images for a category."""
-    extension = category.extension
+    """Fetch and save article images for a category.
+
+    If the images were already resolved by [resolve_images][tibiawikisql.tasks.images.resolve_images], they are not
+    looked up again.
+    """
     table = category.parser.table.__tablename__
     category_table = Table(table)
-    select_query = Query.from_(category_table).select(category_table.title)
-    results = conn.execute(select_query.get_sql())
-    article_titles = [row[0] for row in results]
-    article_titles.extend(additional_titles or ())
-    titles = [f"{title}{extension}" for title in dict.fromkeys(article_titles)]
-    os.makedirs(f"images/{table}", exist_ok=True)
-    cache_info = get_cache_info(table)
-    cache_count = 0
-    fetch_count = 0
-    failed: list[str] = []
-    generator = wiki_client.get_images_info(titles)
-    session = requests.Session()
-    with (
-        timed() as t,
-        progress_bar(generator, len(titles), f"Fetching {key} images", item_show_func=img_label) as bar,
-    ):
-        for image in bar:
-            if image is None:
-                continue
-            try:
-                last_update = cache_info.get(image.file_name)
-                if last_update is None or image.timestamp > last_update:
-                    image_bytes = fetch_image(session, table, image)
-                    fetch_count += 1
-                    cache_info[image.file_name] = image.timestamp
-                else:
-                    with open(f"images/{table}/{image.file_name}", "rb") as f:
-                        image_bytes = f.read()
-                    cache_count += 1
-            except FileNotFoundError:
-                image_bytes = fetch_image(session, table, image)
-                fetch_count += 1
-                cache_info[image.file_name] = image.timestamp
-            except requests.HTTPError:
-                failed.append(image.file_name)
-                continue
-            update_query = (
-                Query.update(category_table)
-                .set(category_table.image, Parameter("?"))
-                .where(category_table.title == Parameter("?"))
-            )
-            conn.execute(update_query.get_sql(), (image_bytes, image.clean_name))
-        save_cache_info(table, cache_info)
-    if failed:
-        echo(f"{Style.RESET_ALL}\tCould not fetch {len(failed):,} images.{Style.RESET_ALL}")
-        echo(f"\t-> {Style.RESET_ALL}{f'{Style.RESET_ALL},{Style.RESET_ALL}'.join(failed)}{Style.RESET_ALL}")
-    echo(
-        f"{Fore.GREEN}\tSaved {key} images in {t.elapsed:.2f} seconds."
-        f"\n\t{fetch_count:,} fetched, {cache_count:,} from cache.{Style.RESET_ALL}",
+    titles = get_image_titles(conn, category, additional_titles)
+    update_query = (
+        Query.update(category_table)
+        .set(category_table.image_hash, Parameter("?"))
+        .where(category_table.title == Parameter("?"))
     )
+    writer = ImageWriter(conn, update_query.get_sql())
+    with timed() as t, contextlib.ExitStack() as stack:
+        if cache is None:
+            cache = stack.enter_context(ImageCache())
+        cache.import_legacy_info(table)
+        if resolved is None:
+            resolved = resolve_images(wiki_client, cache, titles)
+        images = [resolved[title] for title in titles if title in resolved]
+        results = write_images(
+            writer,
+            session or create_session(workers),
+            cache,
+            table,
+            images,
+            get_params=lambda image: (image.clean_name,),
+            label=f"Fetching {key} images",
+            workers=workers,
+            limiter=limiter,
+            progress_bar=progress_bar,
+            img_label=img_label,
+        )
+    echo_image_results(echo, key, t.elapsed, results)
 
 
-def save_maps(conn: sqlite3.Connection | sqlite3.Cursor) -> None:
+def save_maps(conn: sqlite3.Connection, session: requests.Session | None = None) -> None:
     """Save map floor image files from TibiaMaps."""
     url = "https://tibiamaps.github.io/tibia-map-data/floor-{0:02d}-map.png"
     map_table = Table("map")
@@ -130,20 +425,28 @@ def save_maps(conn: sqlite3.Connection | sqlite3.Cursor) -> None:
         .insert(Parameter("?"), Parameter("?"))
     )
     os.makedirs("images/map", exist_ok=True)
+    floors = []
     for z in range(16):
         try:
             with open(f"images/map/{z}.png", "rb") as f:
                 image = f.read()
         except FileNotFoundError:
             try:
-                response = requests.get(url.format(z))
+                response = (session or requests).get(url.format(z))
                 response.raise_for_status()
             except requests.HTTPError:
                 continue
             image = response.content
             with open(f"images/map/{z}.png", "wb") as f:
                 f.write(image)
-        conn.execute(insert_query.get_sql(), (z, image))
+        floors.append((z, image))
+
+    def write(real_conn: sqlite3.Connection) -> None:
+        # Replace the floors saved by an interrupted generation.
+        real_conn.execute(str(Query.from_(map_table).delete()))
+        real_conn.executemany(insert_query.get_sql(), floors)
+
+    run_atomically(conn, write)
 
 
 def generate_outfit_image_names(
@@ -178,6 +481,20 @@ def add_additional_outfit_names(
     return expanded_rows
 
 
+def get_outfit_image_names(
+    conn: sqlite3.Connection | sqlite3.Cursor,
+    additional_titles: list[str] | None = None,
+) -> tuple[list[str], dict[str, tuple[int | None, int, str]]]:
+    """Get the image file names of the outfits in the database and their tuple metadata."""
+    outfit_table = Table("outfit")
+    try:
+        query = Query.from_(outfit_table).select(outfit_table.article_id, outfit_table.name)
+        results = conn.execute(query.get_sql())
+    except sqlite3.Error:
+        results = []
+    return generate_outfit_image_names(add_additional_outfit_names(list(results), additional_titles))
+
+
 def save_outfit_images(
     conn: sqlite3.Connection | sqlite3.Cursor,
     *,
@@ -187,73 +504,62 @@ def save_outfit_images(
     img_label: Any,
     timed: Any,
     echo: Any,
+    session: requests.Session | None = None,
+    cache: ImageCache | None = None,
+    resolved: dict[str, Any] | None = None,
+    workers: int = IMAGE_FETCH_WORKERS,
+    limiter: HostLimiter | None = None,
 ) -> None:
-    """Save outfit image variants into the database."""
+    """Save outfit image variants into the database.
+
+    If the images were already resolved by [resolve_images][tibiawikisql.tasks.images.resolve_images], they are not
+    looked up again.
+    """
     table = "outfit"
-    outfit_table = Table(table)
     outfit_image_table = Table("outfit_image")
     insert_query = (
         Query.into(outfit_image_table)
         .columns(
+            outfit_image_table.image_hash,
             outfit_image_table.outfit_id,
             outfit_image_table.addon,
             outfit_image_table.sex,
-            outfit_image_table.image,
         )
         .insert(Parameter("?"), Parameter("?"), Parameter("?"), Parameter("?"))
     )
-    os.makedirs(f"images/{table}", exist_ok=True)
-    try:
-        query = Query.from_(outfit_table).select(outfit_table.article_id, outfit_table.name)
-        results = conn.execute(query.get_sql())
-    except sqlite3.Error:
-        results = []
-    results = add_additional_outfit_names(list(results), additional_titles)
-    if not results:
+    # Remove the images saved by an interrupted generation, so they can be saved again.
+    conn.execute(str(Query.from_(outfit_image_table).delete()))
+    titles, image_info = get_outfit_image_names(conn, additional_titles)
+    if not titles:
         return
 
-    cache_info = get_cache_info(table)
-    titles, image_info = generate_outfit_image_names(results)
-    session = requests.Session()
-    generator = wiki_client.get_images_info(titles)
-    cache_count = 0
-    fetch_count = 0
-    failed: list[str] = []
-    with (
-        timed() as t,
-        progress_bar(generator, len(titles), "Fetching outfit images", item_show_func=img_label) as bar,
-    ):
-        for image in bar:
-            if image is None:
-                continue
-            try:
-                last_update = cache_info.get(image.file_name)
-                if last_update is None or image.timestamp > last_update:
-                    image_bytes = fetch_image(session, table, image)
-                    fetch_count += 1
-                    cache_info[image.file_name] = image.timestamp
-                else:
-                    with open(f"images/{table}/{image.file_name}", "rb") as f:
-                        image_bytes = f.read()
-                    cache_count += 1
-            except FileNotFoundError:
-                image_bytes = fetch_image(session, table, image)
-                fetch_count += 1
-                cache_info[image.file_name] = image.timestamp
-            except requests.HTTPError:
-                failed.append(image.file_name)
-                continue
-            article_id, addons, sex = image_info[image.file_name]
-            if article_id is not None:
-                conn.execute(insert_query.get_sql(), (article_id, addons, sex, image_bytes))
-        save_cache_info(table, cache_info)
-    if failed:
-        echo(f"{Style.RESET_ALL}\tCould not fetch {len(failed):,} images.{Style.RESET_ALL}")
-        echo(f"\t-> {Style.RESET_ALL}{f'{Style.RESET_ALL},{Style.RESET_ALL}'.join(failed)}{Style.RESET_ALL}")
-    echo(
-        f"{Fore.GREEN}\tSaved outfit images in {t.elapsed:.2f} seconds."
-        f"\n\t{fetch_count:,} fetched, {cache_count:,} from cache.{Style.RESET_ALL}",
-    )
+    def get_params(image: Any) -> tuple[int, int, str] | None:
+        article_id, addons, sex = image_info[image.file_name]
+        return None if article_id is None else (article_id, addons, sex)
+
+    writer = ImageWriter(conn, insert_query.get_sql())
+    with timed() as t, contextlib.ExitStack() as stack:
+        if cache is None:
+            cache = stack.enter_context(ImageCache())
+        cache.import_legacy_info(table)
+        if resolved is None:
+            resolved = resolve_images(wiki_client, cache, titles)
+        images = [resolved[title] for title in titles if title in resolved]
+        image_info = {resolved[title].file_name: image_info[title] for title in titles if title in resolved}
+        results = write_images(
+            writer,
+            session or create_session(workers),
+            cache,
+            table,
+            images,
+            get_params=get_params,
+            label="Fetching outfit images",
+            workers=workers,
+            limiter=limiter,
+            progress_bar=progress_bar,
+            img_label=img_label,
+        )
+    echo_image_results(echo, "outfit", t.elapsed, results)
 
 
 def fetch_images(
@@ -267,13 +573,38 @@ def fetch_images(
     img_label: Any,
     timed: Any,
     echo: Any,
+    workers: int = IMAGE_FETCH_WORKERS,
+    max_per_host: int | None = None,
+    cache_max_bytes: int | None = None,
 ) -> None:
-    """Fetch all images for enabled categories and always load map floors."""
+    """Fetch all images for enabled categories and always load map floors.
+
+    The image titles of all categories are resolved first in a single pass, so each distinct title is looked up once
+    and titles known to be missing are skipped.
+    Images are loaded by a pool of workers sharing the same session, optionally limiting the concurrent requests
+    made to the same host. If a cache size limit is set, the least recently used images are evicted at the end.
+    """
     additional_titles = additional_titles or {}
-    with conn:
-        for key, category in categories.items():
-            if key not in enabled_categories or category.no_images:
-                continue
+    session = create_session(workers)
+    limiter = HostLimiter(max_per_host)
+    image_categories = {
+        key: category
+        for key, category in categories.items()
+        if key in enabled_categories and not category.no_images
+    }
+    with ImageCache(max_bytes=cache_max_bytes) as cache:
+        with timed() as t:
+            titles = []
+            for key, category in image_categories.items():
+                titles.extend(get_image_titles(conn, category, additional_titles.get(key)))
+            if "outfits" in enabled_categories:
+                titles.extend(get_outfit_image_names(conn, additional_titles.get("outfits"))[0])
+            resolved = resolve_images(wiki_client, cache, titles)
+        echo(
+            f"{Fore.GREEN}\tResolved {len(resolved):,} of {len(set(titles)):,} image titles "
+            f"in {t.elapsed:.2f} seconds.{Style.RESET_ALL}",
+        )
+        for key, category in image_categories.items():
             save_images(
                 conn,
                 key,
@@ -284,6 +615,11 @@ def fetch_images(
                 img_label=img_label,
                 timed=timed,
                 echo=echo,
+                session=session,
+                cache=cache,
+                resolved=resolved,
+                workers=workers,
+                limiter=limiter,
             )
         if "outfits" in enabled_categories:
             save_outfit_images(
@@ -294,5 +630,13 @@ def fetch_images(
                 img_label=img_label,
                 timed=timed,
                 echo=echo,
+                session=session,
+                cache=cache,
+                resolved=resolved,
+                workers=workers,
+                limiter=limiter,
             )
-        save_maps(conn)
+        save_maps(conn, session)
+        evicted = cache.evict()
+        if evicted:
+            echo(f"{Fore.YELLOW}\tEvicted {evicted:,} images from the cache.{Style.RESET_ALL}")
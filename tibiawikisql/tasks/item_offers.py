@@ -1,20 +1,86 @@
 """Task for extracting NPC item offers."""
 from __future__ import annotations
 
+import json
+import os
 import re
 from collections import defaultdict
 from typing import TYPE_CHECKING, Any
 
 from colorama import Fore, Style
-from lupa import LuaRuntime
+
+from tibiawikisql.errors import LuaDataError
+from tibiawikisql.lua_data import parse_lua_data
 
 if TYPE_CHECKING:
     import sqlite3
 
-lua = LuaRuntime()
+    from tibiawikisql.api import Article
+
+ITEM_PRICES_ARTICLE = "Module:ItemPrices/data"
+"""The module containing the items bought and sold by every NPC."""
+
+ITEM_PRICES_CACHE_FILE = os.path.join("cache", "item_prices.json")
+"""The file where the evaluated item prices module is cached, along with the timestamp of its revision."""
+
 link_pattern = re.compile(r"(?P<price>[\d,]+)?\s?\[\[([^]|]+)")
 
 
+def lua_to_python(value: Any) -> Any:
+    """Convert a value returned by the Lua runtime into plain Python objects.
+
+    Tables whose keys are the consecutive integers starting from 1 are converted to lists, other tables are
+    converted to dictionaries.
+    """
+    import lupa  # noqa: PLC0415
+
+    if lupa.lua_type(value) != "table":
+        return value
+    table = {key: lua_to_python(item) for key, item in value.items()}
+    if table and list(table) == list(range(1, len(table) + 1)):
+        return list(table.values())
+    return table
+
+
+def evaluate_item_prices(content: str) -> Any:
+    """Evaluate the content of the item prices module.
+
+    The module is parsed directly if it only contains data, the Lua runtime is only imported and used otherwise.
+    """
+    try:
+        return parse_lua_data(content)
+    except LuaDataError:
+        import lupa  # noqa: PLC0415
+
+        return lua_to_python(lupa.LuaRuntime().execute(content))
+
+
+def load_item_prices(article: Article, cache_file: str = ITEM_PRICES_CACHE_FILE) -> Any:
+    """Get the evaluated item prices module, reusing the cached data if the article's revision hasn't changed.
+
+    Args:
+        article: The article of the item prices module.
+        cache_file: The file where the evaluated module is cached.
+
+    Returns:
+        The data of the module, as plain Python objects.
+
+    """
+    timestamp = article.timestamp.isoformat()
+    try:
+        with open(cache_file) as f:
+            cached = json.load(f)
+        if cached["timestamp"] == timestamp:
+            return cached["data"]
+    except (OSError, ValueError, KeyError):
+        pass
+    data = evaluate_item_prices(article.content)
+    os.makedirs(os.path.dirname(cache_file) or ".", exist_ok=True)
+    with open(cache_file, "w") as f:
+        json.dump({"timestamp": timestamp, "data": data}, f)
+    return data
+
+
 def process_offer_list(
     npc_id: int,
     offers: Any,
@@ -22,9 +88,8 @@ def process_offer_list(
     data_store: dict[str, Any],
     not_found: dict[str, set[str]],
 ) -> None:
-    """Process a list of Lua offers and appends parsed rows."""
-    for lua_item in offers.values():
-        data = dict(lua_item.items())
+    """Process a list of offers from the item prices module and appends parsed rows."""
+    for data in offers.values() if isinstance(offers, dict) else offers:
         price = data["price"]
         currency = data.get("currency", "gold coin")
         if not isinstance(price, int):
@@ -58,12 +123,12 @@ def generate_item_offers(
     if "npcs_map" not in data_store or "items_map" not in data_store:
         return
 
-    article = wiki_client.get_article("Module:ItemPrices/data")
+    article = wiki_client.get_article(ITEM_PRICES_ARTICLE)
     if article is None:
         echo(f"{Fore.RED}Could not fetch item offer module data.{Style.RESET_ALL}")
         return
 
-    data = lua.execute(article.content)
+    data = load_item_prices(article)
     sell_offers: list[tuple[int, int, int, int]] = []
     buy_offers: list[tuple[int, int, int, int]] = []
     not_found_store: dict[str, set[str]] = defaultdict(set)
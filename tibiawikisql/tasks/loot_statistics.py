@@ -21,16 +21,32 @@ def generate_loot_statistics(
     timed: Any,
     echo: Any,
 ) -> None:
-    """Generate creature drop statistics from dedicated loot pages."""
+    """Generate creature drop statistics from dedicated loot pages.
+
+    The parsed statistics are staged in a temporary table, and then replace the matching creature drops at once.
+    """
     if "creatures_map" not in data_store or "items_map" not in data_store:
         return
 
-    cursor = conn.cursor()
+    results = conn.execute("SELECT title FROM creature")
+    titles = [f"Loot Statistics:{row[0]}" for row in results]
+    generator = wiki_client.get_articles(titles)
+    unknown_items: set[str] = set()
+    # Plain statements, since executing a script commits any pending transaction first.
+    conn.execute("DROP TABLE IF EXISTS temp.loot_statistics")
+    conn.execute(
+        """
+        CREATE TEMP TABLE loot_statistics (
+            creature_id INTEGER NOT NULL,
+            item_id INTEGER NOT NULL,
+            chance REAL,
+            min INTEGER NOT NULL,
+            max INTEGER NOT NULL
+        )
+        """,
+    )
+    conn.execute("CREATE INDEX temp.loot_statistics_drop_idx ON loot_statistics (creature_id, item_id)")
     try:
-        results = conn.execute("SELECT title FROM creature")
-        titles = [f"Loot Statistics:{row[0]}" for row in results]
-        generator = wiki_client.get_articles(titles)
-        unknown_items: set[str] = set()
         with (
             timed() as t,
             progress_bar(generator, len(titles), "Fetching loot statistics", item_show_func=article_label) as bar,
@@ -56,18 +72,26 @@ def generate_loot_statistics(
                     percentage = min(int(entry["times"]) / kills * 100, 100)
                     minimum, maximum = parse_min_max(amount)
                     rows.append((creature_id, item_id, percentage, minimum, maximum))
-                    cursor.execute(
-                        "DELETE FROM creature_drop WHERE creature_id = ? AND item_id = ?",
-                        (creature_id, item_id),
-                    )
-                cursor.executemany(
-                    "INSERT INTO creature_drop(creature_id, item_id, chance, min, max) VALUES(?,?,?,?,?)",
+                conn.executemany(
+                    "INSERT INTO temp.loot_statistics(creature_id, item_id, chance, min, max) VALUES(?,?,?,?,?)",
                     rows,
                 )
+            with conn:
+                conn.execute(
+                    """
+                    DELETE FROM creature_drop WHERE EXISTS (
+                        SELECT 1 FROM temp.loot_statistics s
+                        WHERE s.creature_id = creature_drop.creature_id AND s.item_id = creature_drop.item_id
+                    )
+                    """,
+                )
+                conn.execute(
+                    "INSERT INTO creature_drop(creature_id, item_id, chance, min, max) "
+                    "SELECT creature_id, item_id, chance, min, max FROM temp.loot_statistics",
+                )
         if unknown_items:
             echo(f"{Fore.RED}Could not find {len(unknown_items):,} items.{Style.RESET_ALL}")
             echo(f"\t-> {Fore.RED}{f'{Style.RESET_ALL},{Fore.RED}'.join(unknown_items)}{Style.RESET_ALL}")
         echo(f"{Fore.GREEN}\tParsed loot statistics in {t.elapsed:.2f} seconds.{Style.RESET_ALL}")
     finally:
-        conn.commit()
-
+        conn.execute("DROP TABLE IF EXISTS temp.loot_statistics")
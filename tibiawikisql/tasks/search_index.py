@@ -0,0 +1,45 @@
+"""Task for building the full-text search index."""
+from __future__ import annotations
+
+from typing import Any, TYPE_CHECKING
+
+from colorama import Fore, Style
+
+from tibiawikisql.schema import SearchIndexTable
+
+if TYPE_CHECKING:
+    import sqlite3
+
+SEARCH_CONTENT_COLUMNS = {
+    "achievements": "description",
+    "books": "text",
+    "spells": "words",
+}
+"""Additional columns whose text is indexed for each category, besides the title and name."""
+
+
+def generate_search_index(
+    conn: sqlite3.Connection,
+    *,
+    categories: dict[str, Any],
+    enabled_categories: set[str],
+    timed: Any,
+    echo: Any,
+) -> None:
+    """Fill the full-text search index with the articles of the enabled categories."""
+    index_table = SearchIndexTable.__tablename__
+    with timed() as t, conn:
+        conn.execute(f"DELETE FROM {index_table}")  # noqa: S608
+        for key, category in categories.items():
+            if key not in enabled_categories:
+                continue
+            table = category.parser.table.__tablename__
+            content = SEARCH_CONTENT_COLUMNS.get(key, "NULL")
+            conn.execute(
+                f"INSERT INTO {index_table}(type, article_id, title, name, content) "  # noqa: S608
+                f"SELECT ?, article_id, title, name, {content} FROM {table}",
+                (key,),
+            )
+        conn.execute(f"INSERT INTO {index_table}({index_table}) VALUES('optimize')")
+        count = conn.execute(f"SELECT COUNT(*) FROM {index_table}").fetchone()[0]  # noqa: S608
+    echo(f"{Fore.GREEN}\tIndexed {count:,} articles for search in {t.elapsed:.2f} seconds.{Style.RESET_ALL}")
@@ -0,0 +1,152 @@
+"""Task for building the summary tables answering the most common questions about items and creatures."""
+from __future__ import annotations
+
+from typing import Any, TYPE_CHECKING
+
+from colorama import Fore, Style
+
+from tibiawikisql.schema import (
+    CreatureDropTable,
+    CreatureLootValueTable,
+    CreatureTable,
+    ItemDropSourceTable,
+    ItemPriceTable,
+    ItemTable,
+    NpcBuyingTable,
+    NpcSellingTable,
+    NpcTable,
+)
+
+if TYPE_CHECKING:
+    import sqlite3
+
+GOLD_COIN_TITLE = "Gold Coin"
+"""The title of the currency the value of loot is measured in."""
+
+COIN_VALUES = {
+    "Gold Coin": 1,
+    "Platinum Coin": 100,
+    "Crystal Coin": 10_000,
+}
+"""The value in gold of the coins creatures drop, which NPCs don't buy."""
+
+
+def _get_best_offers_query(offers_table: str, order: str) -> str:
+    return (
+        f"SELECT o.item_id, o.currency_id, o.value, o.npc_id, n.title AS npc_title, "  # noqa: S608
+        f"ROW_NUMBER() OVER (PARTITION BY o.item_id, o.currency_id ORDER BY o.value {order}, n.title) AS position "
+        f"FROM {offers_table} o JOIN {NpcTable.__tablename__} n ON n.article_id = o.npc_id"
+    )
+
+
+def build_item_prices(conn: sqlite3.Connection) -> int:
+    """Fill the item price table with the best NPC offers of every item and currency.
+
+    Ties are broken by the title of the NPC.
+
+    Args:
+        conn: A connection to the database.
+
+    Returns:
+        The number of rows inserted.
+
+    """
+    item = ItemTable.__tablename__
+    conn.execute(f"DELETE FROM {ItemPriceTable.__tablename__}")  # noqa: S608
+    cursor = conn.execute(
+        f"INSERT INTO {ItemPriceTable.__tablename__}(item_id, currency_id, item_title, currency_title, "  # noqa: S608
+        "sell_price, sell_npc_id, sell_npc_title, buy_price, buy_npc_id, buy_npc_title) "
+        f"WITH sell AS ({_get_best_offers_query(NpcBuyingTable.__tablename__, 'DESC')}), "
+        f"buy AS ({_get_best_offers_query(NpcSellingTable.__tablename__, 'ASC')}), "
+        "pair AS (SELECT item_id, currency_id FROM sell UNION SELECT item_id, currency_id FROM buy) "
+        "SELECT p.item_id, p.currency_id, i.title, c.title, s.value, s.npc_id, s.npc_title, "
+        "b.value, b.npc_id, b.npc_title "
+        f"FROM pair p JOIN {item} i ON i.article_id = p.item_id JOIN {item} c ON c.article_id = p.currency_id "
+        "LEFT JOIN sell s ON s.item_id = p.item_id AND s.currency_id = p.currency_id AND s.position = 1 "
+        "LEFT JOIN buy b ON b.item_id = p.item_id AND b.currency_id = p.currency_id AND b.position = 1",
+    )
+    return cursor.rowcount
+
+
+def build_item_drop_sources(conn: sqlite3.Connection) -> int:
+    """Fill the item drop source table with the creatures dropping every item, ranked by chance.
+
+    Drops with an unknown chance are ranked last, and ties are broken by the title of the creature.
+
+    Args:
+        conn: A connection to the database.
+
+    Returns:
+        The number of rows inserted.
+
+    """
+    conn.execute(f"DELETE FROM {ItemDropSourceTable.__tablename__}")  # noqa: S608
+    cursor = conn.execute(
+        f"INSERT INTO {ItemDropSourceTable.__tablename__}(item_id, item_title, rank, creature_id, "  # noqa: S608
+        "creature_title, chance, min, max) "
+        "SELECT d.item_id, i.title, "
+        "ROW_NUMBER() OVER (PARTITION BY d.item_id ORDER BY d.chance DESC NULLS LAST, c.title), "
+        "d.creature_id, c.title, d.chance, d.min, d.max "
+        f"FROM {CreatureDropTable.__tablename__} d "
+        f"JOIN {ItemTable.__tablename__} i ON i.article_id = d.item_id "
+        f"JOIN {CreatureTable.__tablename__} c ON c.article_id = d.creature_id",
+    )
+    return cursor.rowcount
+
+
+def build_creature_loot_values(conn: sqlite3.Connection) -> int:
+    """Fill the creature loot value table with the expected value of the loot of every creature.
+
+    Every drop is worth its chance, times its average amount, times the value of the item. Items are valued at the
+    highest price an NPC buys them for in gold, or their listed NPC value if no NPC offer is known. Coins are
+    valued at their worth in gold. Drops with an unknown chance or value are not counted.
+
+    The item price table must be filled first.
+
+    Args:
+        conn: A connection to the database.
+
+    Returns:
+        The number of rows inserted.
+
+    """
+    item = ItemTable.__tablename__
+    coins = ", ".join("(?, ?)" for _ in COIN_VALUES)
+    parameters = [value for coin in COIN_VALUES.items() for value in coin]
+    conn.execute(f"DELETE FROM {CreatureLootValueTable.__tablename__}")  # noqa: S608
+    cursor = conn.execute(
+        f"INSERT INTO {CreatureLootValueTable.__tablename__}(creature_id, creature_title, loot_value, "  # noqa: S608
+        "drop_count, priced_drop_count) "
+        f"WITH coin(title, value) AS (VALUES {coins}), "
+        "unit AS ("
+        "SELECT i.article_id AS item_id, COALESCE(coin.value, p.sell_price, i.value_sell) AS value "
+        f"FROM {item} i LEFT JOIN coin ON i.title = coin.title "
+        f"LEFT JOIN {ItemPriceTable.__tablename__} p ON p.item_id = i.article_id "
+        f"AND p.currency_id = (SELECT article_id FROM {item} WHERE title = ?)) "
+        "SELECT c.article_id, c.title, "
+        "COALESCE(SUM(d.chance / 100.0 * (d.min + d.max) / 2.0 * u.value), 0), "
+        "COUNT(d.item_id), COUNT(d.chance * u.value) "
+        f"FROM {CreatureTable.__tablename__} c "
+        f"LEFT JOIN {CreatureDropTable.__tablename__} d ON d.creature_id = c.article_id "
+        "LEFT JOIN unit u ON u.item_id = d.item_id "
+        "GROUP BY c.article_id",
+        (*parameters, GOLD_COIN_TITLE),
+    )
+    return cursor.rowcount
+
+
+def generate_summaries(
+    conn: sqlite3.Connection,
+    *,
+    timed: Any,
+    echo: Any,
+) -> None:
+    """Build the item price, item drop source and creature loot value tables."""
+    with timed() as t, conn:
+        prices = build_item_prices(conn)
+        sources = build_item_drop_sources(conn)
+        creatures = build_creature_loot_values(conn)
+    echo(
+        f"{Fore.GREEN}\tSummarized {prices:,} item prices, {sources:,} drop sources and {creatures:,} creature loot "
+        f"values in {t.elapsed:.2f} seconds.{Style.RESET_ALL}",
+    )
@@ -0,0 +1,67 @@
+"""Task for compressing the long values of the compressed text columns."""
+from __future__ import annotations
+
+from typing import Any, TYPE_CHECKING
+
+from colorama import Fore, Style
+
+from tibiawikisql.database import CompressedText, Table
+
+if TYPE_CHECKING:
+    import sqlite3
+
+    from tibiawikisql.database import Column
+
+TEXT_COMPRESSION_THRESHOLD = 256
+"""Text values bigger than this number of bytes are compressed."""
+
+
+def get_compressed_text_columns() -> list[tuple[type[Table], Column]]:
+    """Get the columns of every table whose values may be stored compressed.
+
+    Returns:
+        The tables and their columns of type [CompressedText][tibiawikisql.database.CompressedText].
+
+    """
+    return [
+        (table, column)
+        for table in Table.all_tables()
+        for column in table.columns
+        if isinstance(column.column_type, CompressedText)
+    ]
+
+
+def compress_text_columns(
+    conn: sqlite3.Connection,
+    *,
+    threshold: int = TEXT_COMPRESSION_THRESHOLD,
+    timed: Any,
+    echo: Any,
+) -> None:
+    """Compress the values of the compressed text columns that are bigger than a threshold.
+
+    Values that are already compressed, or that wouldn't get smaller, are left as they are.
+    """
+    count = 0
+    saved = 0
+    with timed() as t, conn:
+        for table, column in get_compressed_text_columns():
+            table_name = table.__tablename__
+            rows = conn.execute(
+                f"SELECT rowid, {column.name} FROM {table_name} "  # noqa: S608
+                f"WHERE typeof({column.name}) = 'text' AND length(CAST({column.name} AS BLOB)) > ?",
+                (threshold,),
+            ).fetchall()
+            updates = []
+            for rowid, value in rows:
+                size = len(value.encode())
+                compressed = CompressedText.compress(value)
+                if len(compressed) < size:
+                    updates.append((compressed, rowid))
+                    saved += size - len(compressed)
+            conn.executemany(f"UPDATE {table_name} SET {column.name} = ? WHERE rowid = ?", updates)  # noqa: S608
+            count += len(updates)
+    echo(
+        f"{Fore.GREEN}\tCompressed {count:,} text values, saving {saved / 1024:,.1f} KiB, "
+        f"in {t.elapsed:.2f} seconds.{Style.RESET_ALL}",
+    )